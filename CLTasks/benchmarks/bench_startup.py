@@ -0,0 +1,146 @@
+"""
+Cold-start benchmark for `cltasks list` and the no-arguments entry point.
+
+Runs `cltasks list` in fresh interpreters under ``python -X importtime``
+and records the total import time and wall-clock time. It also times
+``main.py`` with no arguments, both piped (no splash) and on a pseudo-
+terminal in a new session (splash shown). The best runs are compared
+against ``startup_budget.json``. Exits non-zero if any number regresses
+past the budget, or if importing the CLI eagerly pulls in Rich or any
+command module.
+
+Usage:
+    python benchmarks/bench_startup.py            # check against the budget
+    python benchmarks/bench_startup.py --update   # record a new budget
+"""
+
+import argparse
+import json
+import os
+import pty
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+# Modules that must not be imported just to build the CLI
+EAGER_IMPORT_CHECK = (
+    "import sys, cl_tasks.cli; "
+    "print('\\n'.join(m for m in sys.modules "
+    "if m == 'rich' or m.startswith(('rich.', 'cl_tasks.commands.'))))"
+)
+
+
+def run(args, home, env_extra=None, check=True):
+    env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+    env.update(env_extra or {})
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=check
+    )
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run_on_tty(args, home):
+    """Run with stdout on a pseudo-terminal in a fresh session, so the splash shows."""
+    env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+    leader, follower = pty.openpty()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *args], env=env, stdin=subprocess.DEVNULL,
+        stdout=follower, stderr=follower, start_new_session=True,
+    )
+    os.close(follower)
+    # Drain the terminal so the child never blocks on a full buffer
+    while True:
+        try:
+            if not os.read(leader, 65536):
+                break
+        except OSError:
+            break
+    process.wait()
+    os.close(leader)
+    return (time.perf_counter() - started) * 1000
+
+
+def total_import_us(stderr):
+    """Sum the self-time column of ``-X importtime`` output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        total += int(line.split("|")[0].split(":")[1])
+    return total
+
+
+def measure(runs, home):
+    import_times, wall_times = [], []
+    for _ in range(runs):
+        result, wall_ms = run(["-X", "importtime", "-m", "cl_tasks", "list"], home)
+        import_times.append(total_import_us(result.stderr))
+        wall_times.append(wall_ms)
+    main_py = os.path.join(ROOT, "main.py")
+    noargs_times = [run([main_py], home, check=False)[1] for _ in range(runs)]
+    splash_times = [run_on_tty([main_py], home) for _ in range(runs)]
+    return {
+        "list_import_us": min(import_times),
+        "list_wall_ms": round(min(wall_times), 1),
+        "noargs_wall_ms": round(min(noargs_times), 1),
+        "noargs_tty_wall_ms": round(min(splash_times), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown over the budget (0.25 = 25%%)")
+    parser.add_argument("--update", action="store_true", help="Write the measured numbers as the new budget")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, ".taskcli_tasks.json"), "w") as f:
+            json.dump({"next_id": 2, "tasks": [{"id": 1, "title": "Benchmark", "completed": False}]}, f)
+
+        eager, _ = run(["-c", EAGER_IMPORT_CHECK], home)
+        eager_modules = eager.stdout.split()
+        # Warm the bytecode cache so every measured run is comparable
+        run(["-m", "cl_tasks", "list"], home)
+        measured = measure(args.runs, home)
+
+    print(f"cltasks list: imports {measured['list_import_us'] / 1000:.1f} ms, "
+          f"wall {measured['list_wall_ms']:.1f} ms (best of {args.runs})")
+    print(f"main.py (no args): piped {measured['noargs_wall_ms']:.1f} ms, "
+          f"terminal with splash {measured['noargs_tty_wall_ms']:.1f} ms")
+
+    if eager_modules:
+        print(f"FAIL: importing cl_tasks.cli loads {', '.join(eager_modules)}")
+        sys.exit(1)
+
+    if args.update:
+        with open(BUDGET_PATH, "w") as f:
+            json.dump(measured, f, indent=2)
+            f.write("\n")
+        print(f"Budget written to {BUDGET_PATH}")
+        return
+
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+    failed = False
+    for key, limit in budget.items():
+        if key not in measured:
+            continue
+        allowed = limit * (1 + args.tolerance)
+        if measured[key] > allowed:
+            print(f"FAIL: {key} = {measured[key]} exceeds budget {limit} (+{args.tolerance:.0%})")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print("OK: within the startup budget")
+
+
+if __name__ == "__main__":
+    main()
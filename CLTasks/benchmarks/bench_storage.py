@@ -0,0 +1,296 @@
+"""
+Latency and memory benchmark for the task store backends.
+
+Seeds each backend with a synthetic task list of each size, then times
+every store operation against it: add, add at a position, start, pause,
+complete, delete, reorder and list (the first page of open tasks). Each
+sample opens a fresh store, as one ``cltasks`` command would, unless
+``--warm`` is given. The report shows the 50th, 90th and 99th percentile
+latencies and the peak memory allocated while one call ran (measured
+separately with ``tracemalloc``, which would slow the timed runs).
+
+Results are compared against ``storage_baseline.json``. Exits non-zero if
+any median latency or peak memory regresses past the baseline by more
+than the tolerance. Entries missing from the baseline are skipped.
+
+The Cosmos store runs on the in-process ``FakeContainer`` with no simulated
+latency. The fake scans its items in Python for every query, so above
+:data:`MAX_SIZE` it would measure the fake rather than the store; those
+sizes are skipped unless ``--no-caps`` is given.
+
+Usage:
+    python benchmarks/bench_storage.py                         # check against the baseline
+    python benchmarks/bench_storage.py --sizes 1000 100000     # quicker run
+    python benchmarks/bench_storage.py --stores file sqlite --samples 50
+    python benchmarks/bench_storage.py --update                # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Default paths (sidecar, interval log, ...) must land in the scratch
+# directory, so point HOME there before importing the stores
+SCRATCH = tempfile.mkdtemp(prefix="cltasks-bench-")
+os.environ["HOME"] = SCRATCH
+for variable in ("CLTASKS_CURRENT_FILE", "CLTASKS_INTERVALS_FILE", "CLTASKS_SOCKET"):
+    os.environ.pop(variable, None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cl_tasks.storage.binary_format import encode_doc  # noqa: E402
+from cl_tasks.storage.binary_store import BinaryTaskStore  # noqa: E402
+from cl_tasks.storage.cosmos_fake import FakeContainer  # noqa: E402
+from cl_tasks.storage.cosmos_store import CosmosTaskStore, META_ID, RANK_GAP  # noqa: E402
+from cl_tasks.storage.file_store import FileTaskStore  # noqa: E402
+from cl_tasks.storage.journal_store import JournalTaskStore  # noqa: E402
+from cl_tasks.storage.locking import atomic_write_bytes, atomic_write_json  # noqa: E402
+from cl_tasks.storage.ops import new_doc  # noqa: E402
+from cl_tasks.storage.sqlite_store import SQLiteTaskStore  # noqa: E402
+from cl_tasks.storage.stats import format_duration  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "storage_baseline.json")
+
+SIZES = (1_000, 100_000, 1_000_000)
+STORES = ("file", "journal", "binary", "sqlite", "cosmos")
+OPERATIONS = ("add", "add_at", "start", "pause", "complete", "delete", "reorder", "list")
+
+# Largest dataset each store is benchmarked at unless --no-caps is given
+MAX_SIZE = {"cosmos": 100_000}
+
+# Share of the synthetic tasks in each state
+COMPLETED_SHARE = 0.3
+PAUSED_SHARE = 0.05
+
+# Latencies below this many milliseconds are too noisy to compare
+NOISE_FLOOR_MS = 0.5
+
+# Words the synthetic task titles are made of
+WORDS = ("report", "review", "email", "invoice", "deploy", "meeting", "notes", "budget", "design", "fix")
+
+
+def default_samples(size: int) -> int:
+    """Calls to time per operation; fewer where one call takes seconds."""
+    return 51 if size <= 10_000 else 11 if size <= 100_000 else 5
+
+
+def synthetic_tasks(count: int, seed: int = 0) -> list:
+    """``count`` tasks in a realistic mix of states, oldest first."""
+    rng = random.Random(seed)
+    now = time.time()
+    tasks = []
+    for task_id in range(1, count + 1):
+        task = {"id": task_id, "title": f"Task {task_id} {rng.choice(WORDS)} {rng.choice(WORDS)}", "completed": False}
+        roll = rng.random()
+        if roll < COMPLETED_SHARE:
+            start = now - rng.uniform(86400, 86400 * 365)
+            end = start + rng.uniform(60, 14400)
+            task.update(completed=True, start_time=start, end_time=end, duration=format_duration(end - start))
+        elif roll < COMPLETED_SHARE + PAUSED_SHARE:
+            task["paused_duration"] = rng.uniform(60, 7200)
+        tasks.append(task)
+    return tasks
+
+
+class Backend:
+    """How to seed one kind of store and open it again for each sample."""
+
+    def __init__(self, name, directory):
+        self.name = name
+        self.directory = directory
+        self.container = None
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def seed(self, tasks):
+        # Each file in the layout its store writes
+        if self.name == "file":
+            atomic_write_json(self.path("file.json"), new_doc(tasks), indent=2)
+        elif self.name == "journal":
+            atomic_write_json(self.path("journal.json"), dict(new_doc(tasks), seq=0), separators=(",", ":"))
+        elif self.name == "binary":
+            atomic_write_bytes(self.path("tasks.bin"), encode_doc(new_doc(tasks)))
+        elif self.name == "sqlite":
+            store = SQLiteTaskStore(self.path("tasks.db"))
+            store.import_tasks(tasks)
+            store.conn.close()
+        else:
+            self.container = FakeContainer(latency_ms=0)
+            store = self.open()
+            meta = store._read_meta()
+            for i, task in enumerate(tasks):
+                self.container.upsert_item(dict(
+                    task, id=str(task["id"]), taskId=task["id"], userId="bench", type="task", rank=i * RANK_GAP,
+                ))
+            doc = new_doc(tasks)
+            self.container.replace_item(META_ID, dict(meta, next_id=doc["next_id"], stats=doc["stats"]))
+
+    def open(self):
+        if self.name == "file":
+            return FileTaskStore(self.path("file.json"))
+        if self.name == "journal":
+            return JournalTaskStore(self.path("journal.json"), self.path("journal.log"), legacy_path=None)
+        if self.name == "binary":
+            return BinaryTaskStore(self.path("tasks.bin"), legacy_path=self.path("none.json"))
+        if self.name == "sqlite":
+            return SQLiteTaskStore(self.path("tasks.db"))
+        return CosmosTaskStore(container=self.container, user="bench")
+
+    def close(self, store):
+        if self.name == "sqlite":
+            store.conn.close()
+
+
+def operation_calls(tasks, samples, rng):
+    """Build ``samples`` calls for each operation, on distinct open tasks.
+
+    Start, pause and complete use the same tasks in that order, so every
+    pause finds a running task. Deletes use other tasks.
+    """
+    open_ids = [task["id"] for task in tasks if not task["completed"]]
+    picked = rng.sample(open_ids, min(len(open_ids), samples * 2))
+    worked, deleted = picked[:samples], picked[samples:]
+    size = len(tasks)
+    return {
+        "add": [lambda s, i=i: s.add_task(f"Benchmark task {i}") for i in range(samples)],
+        "add_at": [lambda s, i=i: s.add_task(f"Benchmark task {i}", rng.randint(1, size)) for i in range(samples)],
+        "start": [lambda s, t=t: s.start_task(t) for t in worked],
+        "pause": [lambda s, t=t: s.pause_task(t) for t in worked],
+        "complete": [lambda s, t=t: s.complete_task(t) for t in worked],
+        "delete": [lambda s, t=t: s.delete_task(t) for t in deleted],
+        "reorder": [lambda s, t=t: s.reorder_task(t, rng.randint(1, size)) for t in worked],
+        "list": [lambda s: s.list_tasks("open", "status", 50) for _ in range(samples)],
+    }
+
+
+def percentile(values, share):
+    """Nearest-rank percentile of ``values`` (``share`` between 0 and 1)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(share * len(ordered)) - 1))]
+
+
+def measure(backend, tasks, samples, warm, seed):
+    """Time every operation on ``backend``; return a result entry per operation."""
+    rng = random.Random(seed)
+    calls = operation_calls(tasks, samples, rng)
+    results = {}
+    store = backend.open() if warm else None
+    for name in OPERATIONS:
+        # Peak memory of one call, on its own so tracing doesn't skew the timings
+        probe, timed = calls[name][0], calls[name][1:]
+        target = store or backend.open()
+        tracemalloc.start()
+        probe(target)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if not warm:
+            backend.close(target)
+
+        latencies = []
+        for call in timed:
+            started = time.perf_counter()
+            target = store or backend.open()
+            call(target)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not warm:
+                backend.close(target)
+        results[name] = {
+            "p50_ms": round(percentile(latencies, 0.5), 3),
+            "p90_ms": round(percentile(latencies, 0.9), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "peak_kib": round(peak / 1024),
+        }
+    if warm:
+        backend.close(store)
+    return results
+
+
+def compare(measured, baseline, tolerance):
+    """Return a message for each entry that regressed past ``baseline``."""
+    failures = []
+    for key, entries in measured.items():
+        for name, entry in entries.items():
+            reference = baseline.get(key, {}).get(name)
+            if reference is None:
+                continue
+            if entry["p50_ms"] > max(reference["p50_ms"], NOISE_FLOOR_MS) * (1 + tolerance):
+                failures.append(f"{key} {name}: p50 {entry['p50_ms']} ms vs baseline {reference['p50_ms']} ms")
+            if entry["peak_kib"] > max(reference["peak_kib"], 64) * (1 + tolerance):
+                failures.append(f"{key} {name}: peak {entry['peak_kib']} KiB vs baseline {reference['peak_kib']} KiB")
+    return failures
+
+
+def print_table(key, entries):
+    print(f"\n{key}")
+    print(f"  {'operation':<10} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'peak KiB':>10}")
+    for name, entry in entries.items():
+        print(f"  {name:<10} {entry['p50_ms']:>10.3f} {entry['p90_ms']:>10.3f} "
+              f"{entry['p99_ms']:>10.3f} {entry['peak_kib']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--stores", nargs="+", choices=STORES, default=list(STORES))
+    parser.add_argument("--samples", type=int, help="Calls timed per operation (default: fewer for bigger sizes)")
+    parser.add_argument("--warm", action="store_true", help="Reuse one open store instead of opening one per call")
+    parser.add_argument("--no-caps", action="store_true", help="Run Cosmos at every size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed regression over the baseline (0.5 = 50%%)")
+    parser.add_argument("--update", action="store_true", help="Merge the results into the baseline file")
+    args = parser.parse_args()
+
+    measured = {}
+    try:
+        for size in args.sizes:
+            tasks = synthetic_tasks(size, args.seed)
+            for name in args.stores:
+                key = f"{name}/{size}" + ("/warm" if args.warm else "")
+                if size > MAX_SIZE.get(name, size) and not args.no_caps:
+                    print(f"\n{key}: skipped (above {MAX_SIZE[name]} tasks; see --no-caps)")
+                    continue
+                directory = tempfile.mkdtemp(dir=SCRATCH)
+                backend = Backend(name, directory)
+                started = time.perf_counter()
+                backend.seed([dict(task) for task in tasks])
+                seeded = time.perf_counter() - started
+                samples = args.samples or default_samples(size)
+                # One extra call per operation measures the peak memory
+                measured[key] = measure(backend, tasks, samples + 1, args.warm, args.seed)
+                print_table(f"{key} (seeded in {seeded:.1f} s)", measured[key])
+                backend.container = None
+                shutil.rmtree(directory)
+    finally:
+        shutil.rmtree(SCRATCH, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    if args.update:
+        baseline.update(measured)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return
+
+    failures = compare(measured, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("\nOK: within the baseline" if baseline else "\nNo baseline yet; run with --update to record one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Safety checks for ``cltasks migrate``.
+
+Checks that a migration from a JSON task file that doesn't exist stops
+with an error instead of wiping the database, and that a migration that
+fails partway leaves the database's tasks in place.
+
+Usage:
+    python benchmarks/check_migrate.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typer.testing import CliRunner  # noqa: E402
+
+from cl_tasks.cli import app  # noqa: E402
+from cl_tasks.storage.sqlite_store import SQLiteTaskStore  # noqa: E402
+
+
+def titles(path):
+    return [task["title"] for task in SQLiteTaskStore(path).list_tasks()]
+
+
+def missing_source(directory):
+    """--from naming a file that doesn't exist changes nothing, even with --force."""
+    target = os.path.join(directory, "tasks.db")
+    SQLiteTaskStore(target).add_task("keep me")
+    source = os.path.join(directory, "typo.json")
+    result = CliRunner().invoke(app, ["migrate", "--from", source, "--to", target, "--force"])
+    if result.exit_code != 1:
+        return f"expected exit code 1, got {result.exit_code}"
+    if os.path.exists(source):
+        return "the missing task file was created"
+    if titles(target) != ["keep me"]:
+        return f"expected ['keep me'] in the database, found {titles(target)}"
+    return None
+
+
+def failed_import(directory):
+    """A migration that fails partway keeps the tasks it was replacing."""
+    target = os.path.join(directory, "tasks.db")
+    SQLiteTaskStore(target).add_task("keep me")
+    source = os.path.join(directory, "tasks.json")
+    # Two tasks with one id can't both go into the database
+    with open(source, "w") as f:
+        json.dump({"next_id": 2, "tasks": [
+            {"id": 1, "title": "a", "completed": False},
+            {"id": 1, "title": "b", "completed": False},
+        ]}, f)
+    result = CliRunner().invoke(app, ["migrate", "--from", source, "--to", target, "--force"])
+    if result.exit_code == 0:
+        return "the migration of clashing ids succeeded"
+    if titles(target) != ["keep me"]:
+        return f"expected ['keep me'] in the database, found {titles(target)}"
+    return None
+
+
+CHECKS = [missing_source, failed_import]
+
+
+def main():
+    failed = False
+    for check in CHECKS:
+        with tempfile.TemporaryDirectory() as directory:
+            problem = check(directory)
+        if problem:
+            print(f"FAIL: {check.__name__}: {problem}")
+            failed = True
+        else:
+            print(f"OK: {check.__name__}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
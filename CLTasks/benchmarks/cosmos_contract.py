@@ -0,0 +1,116 @@
+"""
+Offline contract check for the Cosmos task store.
+
+Runs the same random sequence of operations against the JSON file store
+and against ``CosmosTaskStore`` on the in-process ``FakeContainer``, then
+checks that both hold the same tasks in the same order, with the same
+statistics and listing results. Also prints the requests, estimated
+request units and simulated latency each kind of operation cost.
+
+Usage:
+    python benchmarks/cosmos_contract.py [--ops 300] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cl_tasks.storage.cosmos_fake import FakeContainer  # noqa: E402
+from cl_tasks.storage.cosmos_store import CosmosTaskStore  # noqa: E402
+from cl_tasks.storage.file_store import FileTaskStore  # noqa: E402
+
+# Timestamps differ between the two runs; compare everything else
+COMPARED_FIELDS = ("id", "title", "completed", "position", "tags", "project")
+TAGS = ("home", "work", "urgent")
+PROJECTS = (None, "alpha", "beta")
+
+
+def comparable(tasks):
+    return [{name: task.get(name) for name in COMPARED_FIELDS} for task in tasks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    container = FakeContainer()
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = FileTaskStore(os.path.join(tmp, "tasks.json"))
+        cosmos = CosmosTaskStore(container=container, user="contract")
+        costs = defaultdict(lambda: defaultdict(float))
+        rng = random.Random(args.seed)
+
+        for i in range(args.ops):
+            tasks = reference.list_tasks()
+            roll = rng.random()
+            if roll < 0.3 or not tasks:
+                name, call = "add", ("add_task", f"task {i}", rng.choice([None, rng.randint(1, len(tasks) + 1)]))
+            else:
+                task = rng.choice(tasks)
+                if roll < 0.45:
+                    name, call = "start", ("start_task", task["id"])
+                elif roll < 0.53:
+                    name, call = "pause", ("pause_task", task["id"])
+                elif roll < 0.63:
+                    name, call = "complete", ("complete_task", task["id"])
+                elif roll < 0.73:
+                    # Often a tag the task already has, or one it lacks, which changes nothing
+                    name, call = "tag", ("tag_task", task["id"], [rng.choice(TAGS)], [rng.choice(TAGS)])
+                elif roll < 0.8:
+                    # Often the project the task is already in
+                    name, call = "project", ("set_project", task["id"], rng.choice(PROJECTS))
+                elif roll < 0.9:
+                    name, call = "delete", ("delete_task", task["id"])
+                else:
+                    name, call = "reorder", ("reorder_task", task["id"], rng.randint(1, len(tasks) + 2))
+
+            expected = getattr(reference, call[0])(*call[1:])
+            before = dict(container.metrics)
+            got = getattr(cosmos, call[0])(*call[1:])
+            for key, value in container.metrics.items():
+                costs[name][key] += value - before[key]
+            costs[name]["count"] += 1
+
+            if bool(expected) != bool(got) or (expected and comparable([expected]) != comparable([got])):
+                print(f"FAIL: {call} returned {got!r}, expected {expected!r}")
+                sys.exit(1)
+
+        checks = {
+            "list": lambda s: comparable(s.list_tasks()),
+            "open by status": lambda s: comparable(s.list_tasks("open", "status", 5, 2)),
+            "all by status": lambda s: comparable(s.list_tasks(None, "status")),
+            "page": lambda s: comparable(s.list_tasks(limit=7, offset=3)),
+            "by tag": lambda s: comparable(s.list_tasks(tag="work")),
+            "by project": lambda s: comparable(s.list_tasks("open", project="alpha")),
+            "count": lambda s: [s.count_tasks(), s.count_tasks("open"), s.count_tasks("completed")],
+            "task_at": lambda s: comparable(filter(None, [s.task_at(1), s.task_at(3)])),
+        }
+        failed = False
+        for label, check in checks.items():
+            if check(reference) != check(cosmos):
+                print(f"FAIL: {label} differs")
+                failed = True
+        ref_stats, cosmos_stats = reference.get_stats(), cosmos.get_stats()
+        if (ref_stats["total"], ref_stats["completed"]) != (cosmos_stats["total"], cosmos_stats["completed"]):
+            print("FAIL: statistics differ")
+            failed = True
+
+    print(f"{'operation':<10} {'count':>6} {'requests':>9} {'RU/op':>8} {'latency/op':>11}")
+    for name, cost in sorted(costs.items()):
+        count = cost["count"]
+        print(f"{name:<10} {int(count):>6} {cost['requests'] / count:>9.1f} "
+              f"{cost['request_charge'] / count:>8.1f} {cost['latency_ms'] / count:>9.1f}ms")
+    if failed:
+        sys.exit(1)
+    print(f"OK: {args.ops} operations behave the same on the Cosmos store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Crash recovery checks for the task stores.
+
+Each check leaves a store the way a crash at an awkward moment would,
+then carries on with it and checks that no acknowledged change was lost
+or applied twice.
+
+Usage:
+    python benchmarks/crash_recovery.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cl_tasks.storage.cached_store import CachedTaskStore  # noqa: E402
+from cl_tasks.storage.cosmos_fake import FakeContainer  # noqa: E402
+from cl_tasks.storage.cosmos_store import CosmosTaskStore  # noqa: E402
+from cl_tasks.storage.file_store import FileTaskStore  # noqa: E402
+from cl_tasks.storage.journal_store import JournalTaskStore  # noqa: E402
+
+
+def open_journal(directory):
+    return JournalTaskStore(
+        snapshot_path=os.path.join(directory, "tasks.snapshot.json"),
+        journal_path=os.path.join(directory, "tasks.journal"),
+        legacy_path=None,
+    )
+
+
+def titles(store):
+    return [task["title"] for task in store.list_tasks()]
+
+
+def torn_journal_tail(directory):
+    """A journal record cut off mid-write doesn't swallow the next one."""
+    open_journal(directory).add_task("a")
+    with open(os.path.join(directory, "tasks.journal"), "a") as f:
+        f.write('{"op":"add","title":"lo')
+    store = open_journal(directory)
+    store.add_task("b")
+    store.add_task("c")
+    found = titles(open_journal(directory))
+    if found != ["a", "b", "c"]:
+        return f"expected ['a', 'b', 'c'] after a reload, found {found}"
+    return None
+
+
+class Crash(Exception):
+    pass
+
+
+def archive_before_unlink(directory):
+    """An archive run cut off after its append doesn't archive the tasks twice."""
+    store = FileTaskStore(os.path.join(directory, "tasks.json"))
+    for title in ("a", "b", "open"):
+        store.add_task(title)
+    store.complete_task(1)
+    store.complete_task(2)
+    archive = store.get_archive()
+    unlink = os.unlink
+
+    def crash_on_pending(path):
+        if path == archive.pending_path:
+            raise Crash()
+        unlink(path)
+
+    os.unlink = crash_on_pending
+    try:
+        store.archive_tasks(time.time() + 60)
+    except Crash:
+        pass
+    finally:
+        os.unlink = unlink
+    # The next run finishes the interrupted one first
+    store.archive_tasks(time.time() + 60)
+    archived = sorted(task["title"] for task in archive.iter_tasks())
+    if archived != ["a", "b"]:
+        return f"expected ['a', 'b'] in the archive, found {archived}"
+    if archive.get_stats()["total"] != 2:
+        return f"archive statistics count {archive.get_stats()['total']} tasks, expected 2"
+    if titles(store) != ["open"]:
+        return f"expected ['open'] left in the store, found {titles(store)}"
+    return None
+
+
+class LostReply(Exception):
+    pass
+
+
+def lost_push_reply(directory):
+    """An add whose reply was lost on the way back is not pushed twice."""
+    remote = CosmosTaskStore(container=FakeContainer(), user="crash")
+
+    def open_cached():
+        store = CachedTaskStore(
+            lambda: remote,
+            path=os.path.join(directory, "tasks.cache.json"),
+            outbox_path=os.path.join(directory, "tasks.outbox"),
+        )
+        store._start_sync = lambda: None  # Sync only when the check says so
+        return store
+
+    store = open_cached()
+    store.add_task("once")
+    apply_batch = remote.apply_batch
+
+    def apply_then_fail(ops):
+        apply_batch(ops)
+        raise LostReply()
+
+    remote.apply_batch = apply_then_fail
+    try:
+        store.sync()
+    except LostReply:
+        pass
+    remote.apply_batch = apply_batch
+    store = open_cached()
+    store.sync()
+    if titles(remote) != ["once"]:
+        return f"expected ['once'] on the remote, found {titles(remote)}"
+    if [task["id"] for task in store.list_tasks()] != [task["id"] for task in remote.list_tasks()]:
+        return "the replica doesn't hold the remote task ids"
+    return None
+
+
+CHECKS = [torn_journal_tail, lost_push_reply, archive_before_unlink]
+
+
+def main():
+    failed = False
+    for check in CHECKS:
+        with tempfile.TemporaryDirectory() as directory:
+            problem = check(directory)
+        if problem:
+            print(f"FAIL: {check.__name__}: {problem}")
+            failed = True
+        else:
+            print(f"OK: {check.__name__}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Search contract check across the task stores.
+
+Adds the same tasks to every store, then checks that each one returns the
+same search results: the file stores through their title index, the
+others by matching every title.
+
+Usage:
+    python benchmarks/search_contract.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cl_tasks.storage.binary_store import BinaryTaskStore  # noqa: E402
+from cl_tasks.storage.cosmos_fake import FakeContainer  # noqa: E402
+from cl_tasks.storage.cosmos_store import CosmosTaskStore  # noqa: E402
+from cl_tasks.storage.file_store import FileTaskStore  # noqa: E402
+from cl_tasks.storage.journal_store import JournalTaskStore  # noqa: E402
+from cl_tasks.storage.sqlite_store import SQLiteTaskStore  # noqa: E402
+
+TITLES = ["Write report", "Review the report draft", "Call Ana", "write tests", "Buy milk!", "Déjà vu"]
+
+QUERIES = ["rep", "rep wri", "REPORT", "call ana", "write", "milk!", "déjà", "nothing", "", "!!", "   "]
+
+
+def open_stores(directory):
+    path = os.path.join(directory, "tasks")
+    return {
+        "file": FileTaskStore(f"{path}.json"),
+        "journal": JournalTaskStore(f"{path}.snapshot.json", f"{path}.journal", legacy_path=None),
+        "binary": BinaryTaskStore(f"{path}.bin", legacy_path=None),
+        "sqlite": SQLiteTaskStore(f"{path}.db"),
+        "cosmos": CosmosTaskStore(container=FakeContainer(), user="search"),
+    }
+
+
+def main():
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        stores = open_stores(directory)
+        for store in stores.values():
+            for title in TITLES:
+                store.add_task(title)
+        for query in QUERIES:
+            results = {
+                name: [task["title"] for task in store.search_tasks(query)]
+                for name, store in stores.items()
+            }
+            expected = results.pop("file")
+            for name, found in results.items():
+                if found != expected:
+                    print(f"FAIL: {name} finds {found} for {query!r}, the file store {expected}")
+                    failed = True
+            # Limits cut the same list short
+            if [task["title"] for task in stores["sqlite"].search_tasks(query, 1)] != expected[:1]:
+                print(f"FAIL: limit differs for {query!r}")
+                failed = True
+    if failed:
+        sys.exit(1)
+    print(f"OK: {len(QUERIES)} queries find the same tasks in {len(stores)} stores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Concurrency stress check for the file-based task stores.
+
+Spawns several worker processes that hammer one task file with a mix of
+``add_task`` and ``complete_task`` calls, then checks that every add and
+every completion made it to disk.
+
+Usage:
+    python benchmarks/stress_locking.py --store file --workers 8 --ops 50
+    python benchmarks/stress_locking.py --store journal
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cl_tasks.storage.file_store import FileTaskStore
+from cl_tasks.storage.journal_store import JournalTaskStore
+
+
+def open_store(kind, directory):
+    if kind == "journal":
+        return JournalTaskStore(
+            snapshot_path=os.path.join(directory, "tasks.snapshot.json"),
+            journal_path=os.path.join(directory, "tasks.journal"),
+            legacy_path=None,
+            # Small threshold so compaction races with the writers too
+            compact_threshold=4096,
+        )
+    return FileTaskStore(os.path.join(directory, "tasks.json"))
+
+
+def worker(kind, directory, worker_id, ops):
+    store = open_store(kind, directory)
+    for i in range(ops):
+        task = store.add_task(f"worker-{worker_id}-task-{i}")
+        # Complete every other task we added
+        if i % 2 == 0:
+            assert store.complete_task(task["id"]), f"lost task {task['id']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--store", choices=("file", "journal"), default="file")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50, help="Adds per worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        open_store(args.store, directory)
+        started = time.perf_counter()
+        processes = [
+            multiprocessing.Process(target=worker, args=(args.store, directory, n, args.ops))
+            for n in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        failed = [p.exitcode for p in processes if p.exitcode != 0]
+        tasks = open_store(args.store, directory).list_tasks()
+
+    expected_titles = {
+        f"worker-{n}-task-{i}" for n in range(args.workers) for i in range(args.ops)
+    }
+    expected_completed = {
+        f"worker-{n}-task-{i}" for n in range(args.workers) for i in range(0, args.ops, 2)
+    }
+    titles = [task["title"] for task in tasks]
+    completed = {task["title"] for task in tasks if task["completed"]}
+    ids = [task["id"] for task in tasks]
+
+    problems = []
+    if failed:
+        problems.append(f"{len(failed)} worker(s) exited with an error")
+    if set(titles) != expected_titles or len(titles) != len(expected_titles):
+        problems.append(f"expected {len(expected_titles)} tasks, found {len(titles)}")
+    if completed != expected_completed:
+        problems.append(f"expected {len(expected_completed)} completed, found {len(completed)}")
+    if len(set(ids)) != len(ids):
+        problems.append("duplicate task ids")
+
+    total_ops = len(expected_titles) + len(expected_completed)
+    print(f"{args.store}: {total_ops} operations from {args.workers} processes in {elapsed:.2f}s")
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        sys.exit(1)
+    print("OK: no operations lost")
+
+
+if __name__ == "__main__":
+    main()
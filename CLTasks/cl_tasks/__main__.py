@@ -0,0 +1,4 @@
+# cl_tasks/__main__.py
+from cl_tasks.cli import app
+
+app()
@@ -1,44 +1,138 @@
 # cl_tasks/cli.py
-import typer
+from cl_tasks import trace
+import importlib
+import os
 from typing import Optional
-from rich import print as rprint
-from rich.panel import Panel
-from rich.columns import Columns
-from cl_tasks.commands import add, list, complete, delete, show, reorder, start, pause  # Import the pause command
-from cl_tasks.utils import console
-from cl_tasks.theme import ICONS
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+trace.startup_span("import typer", trace.STARTED)
+
+# Commands are registered by name and only imported when they run, so a
+# one-shot call like `cltasks list` doesn't pay for every command's imports.
+# Each entry maps the command name to its module in cl_tasks.commands and
+# its help text.
+LAZY_COMMANDS = {
+    "add": ("add", "Add a new task"),
+    "start": ("start", "Start a task"),
+    "list": ("list", "List all tasks"),
+    "complete": ("complete", "Mark a task as complete"),
+    "delete": ("delete", "Delete a task"),
+    "show": ("show", "Show details for a task"),
+    "reorder": ("reorder", "Reorder a task to change its priority"),
+    "pause": ("pause", "Pause a running task"),
+    "batch": ("batch", "Apply many operations from a file or stdin"),
+    "migrate": ("migrate", "Import the JSON task file into the SQLite store"),
+    "archive": ("archive", "Move old completed tasks into the archive"),
+    "convert": ("convert", "Convert a task file between JSON and the binary format"),
+    "sync": ("sync", "Sync the local cache with the remote task store"),
+    "tag": ("tag", "Tag a task or change its project"),
+    "report": ("report", "Report time worked per day, week or task"),
+    "lists": ("lists", "Show your task lists"),
+    "import": ("importer", "Add tasks in bulk from a CSV or NDJSON file"),
+    "export": ("exporter", "Write all tasks to a CSV or NDJSON file"),
+    "search": ("search", "Find tasks by words in their title"),
+    "current": ("current", "Show the running tasks"),
+    "daemon": ("daemon", "Start, stop or check the background task daemon"),
+}
+
+
+class LazyCommand(TyperCommand):
+    """Placeholder for a command whose module hasn't been imported yet.
+
+    It carries just the name and help text, which is all `--help` needs.
+    When the command actually runs, its module is imported and the real
+    command takes over parsing and invocation.
+    """
+
+    def __init__(self, name, module_name, help_text):
+        super().__init__(name=name, help=help_text, short_help=help_text)
+        self.module_name = module_name
+        self._command = None
+
+    def load(self):
+        if self._command is None:
+            with trace.phase(f"import cl_tasks.commands.{self.module_name}"):
+                module = importlib.import_module(f"cl_tasks.commands.{self.module_name}")
+            single = typer.Typer(add_completion=False, rich_markup_mode="rich")
+            single.command(self.name, help=self.help)(module.main)
+            self._command = typer.main.get_command(single)
+            self._command.name = self.name
+        return self._command
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+
+class LazyCommandGroup(TyperGroup):
+    """Typer group whose commands import their module only when they run."""
+
+    def list_commands(self, ctx):
+        return [*LAZY_COMMANDS, *super().list_commands(ctx)]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in LAZY_COMMANDS:
+            return super().get_command(ctx, cmd_name)
+        module_name, help_text = LAZY_COMMANDS[cmd_name]
+        return LazyCommand(cmd_name, module_name, help_text)
 
 
 app = typer.Typer(
+    cls=LazyCommandGroup,
     help="✨ CLTasks - A friendly task management CLI ✨",
     add_completion=False,
+    no_args_is_help=True,
     rich_markup_mode="rich"
 )
 
 
 @app.callback()
-def callback():
+def callback(
+    ctx: typer.Context,
+    list_name: Optional[str] = typer.Option(
+        None, "--list", "-l", metavar="NAME", envvar="CLTASKS_LIST",
+        help="Work on this task list instead of the default one"
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Print how long each phase of the command took"),
+    trace_file: Optional[str] = typer.Option(
+        None, "--trace", metavar="FILE", help="Write a Chrome trace of the command to FILE"
+    ),
+    cprofile_file: Optional[str] = typer.Option(
+        None, "--cprofile", metavar="FILE", help="Run the command under cProfile and save the stats to FILE"
+    )
+):
     """
     ✨ CLTasks - Manage your tasks with style! ✨
     
     A simple yet powerful CLI task manager.
     """
-    pass
-
-
-app.command("add", help="Add a new task")(add.main)
-app.command("start", help="Start a task")(start.main)  # Alias for start
-app.command("list", help="List all tasks")(list.main)
-app.command("complete", help="Mark a task as complete")(complete.main)
-app.command("delete", help="Delete a task")(delete.main)
-app.command("show", help="Show details for a task")(show.main)
-app.command("reorder", help="Reorder a task to change its priority")(reorder.main)
-app.command("pause", help="Pause a running task")(pause.main)  # Add pause command
+    if list_name:
+        from cl_tasks.storage.lists import check_name
+        try:
+            check_name(list_name)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--list")
+        # get_store reads the list from the environment
+        os.environ["CLTASKS_LIST"] = list_name
+    # CLTASKS_TRACE turns tracing on without changing the command line
+    env_breakdown, env_trace = trace.settings_from_env()
+    finish = trace.begin(
+        ctx.invoked_subcommand or "",
+        breakdown=profile or env_breakdown,
+        trace_path=trace_file or env_trace,
+        cprofile_path=cprofile_file,
+    )
+    if finish is not None:
+        ctx.call_on_close(finish)
 
 
 @app.command("help")
 def help_cmd():
     """Show help information with command examples"""
+    from rich.panel import Panel
+    from rich.columns import Columns
+    from cl_tasks.utils import console
+
     console.print("[bold blue underline]CLTasks Help[/]")
     console.print("\nAvailable commands:")
     
@@ -52,7 +146,7 @@ def help_cmd():
             border_style="green"
         ),
         Panel(
-            "[bold]start [cyan]<id>[/cyan][/]\n"
+            "[bold]start [cyan]<position>[/cyan][/]\n"
             "Start a task\n"
             "[dim]Example: cltasks start 1[/]",
             title="Start Task",
@@ -67,21 +161,21 @@ def help_cmd():
             border_style="blue" 
         ),
         Panel(
-            "[bold]show [cyan]<id>[/cyan][/]\n"
+            "[bold]show [cyan]<position>[/cyan][/]\n"
             "Show details for a task\n"
             "[dim]Example: cltasks show 1[/]",
             title="Show Task",
             border_style="cyan"
         ),
         Panel(
-            "[bold]complete [cyan]<id>[/cyan][/]\n"
+            "[bold]complete [cyan]<position>[/cyan][/]\n"
             "Mark a task as complete\n"
             "[dim]Example: cltasks complete 1[/]",
             title="Complete Task",
             border_style="green"
         ),
         Panel(
-            "[bold]delete [cyan]<id>[/cyan] [yellow]--force[/yellow][/]\n"
+            "[bold]delete [cyan]<position>[/cyan] [yellow]--force[/yellow][/]\n"
             "Delete a task\n"
             "[dim]Example: cltasks delete 2[/]\n"
             "[dim]Example: cltasks delete 3 --force[/]",
@@ -89,18 +183,25 @@ def help_cmd():
             border_style="red"
         ),
         Panel(
-            "[bold]reorder [cyan]<id> <position>[/cyan][/]\n"
+            "[bold]reorder [cyan]<position> <new-position>[/cyan][/]\n"
             "Change task priority\n"
             "[dim]Example: cltasks reorder 3 1[/]",
             title="Reorder Task",
             border_style="magenta"
         ),
         Panel(
-            "[bold]pause [cyan]<id>[/cyan][/]\n"
+            "[bold]pause [cyan]<position>[/cyan][/]\n"
             "Pause a running task\n"
             "[dim]Example: cltasks pause 1[/]",
             title="Pause Task",
             border_style="yellow"
+        ),
+        Panel(
+            "[bold]batch [cyan]<file>[/cyan] [yellow]--ids[/yellow][/]\n"
+            "Apply one operation per line\n"
+            "[dim]Example: printf 'complete 1\\ncomplete 2\\n' | cltasks batch[/]",
+            title="Batch",
+            border_style="blue"
         )
     ]
     
@@ -109,6 +210,8 @@ def help_cmd():
 
 def show_app_info():
     """Show application info and version."""
+    from cl_tasks.utils import console
+
     console.print("[bold blue]CLTasks[/bold blue] [dim]v0.1.0[/dim]")
     console.print("✨ [italic]Your friendly task manager[/italic] ✨")
 
@@ -1,4 +1,5 @@
 import typer
+from typing import List, Optional
 from rich.panel import Panel
 from rich.console import Console
 from rich.text import Text
@@ -7,13 +8,17 @@ from cl_tasks.theme import ICONS
 
 def main(
     title: str = typer.Argument(..., help="Title of the task to add"),
-    position: int = typer.Option(None, "--position", "-p", help="Position to insert task at (1-based)")
+    position: int = typer.Option(None, "--position", "-p", help="Position to insert task at (1-based)"),
+    tag: Optional[List[str]] = typer.Option(None, "--tag", "-t", help="Tag the task (repeat for several tags)"),
+    project: Optional[str] = typer.Option(None, "--project", help="Project the task belongs to")
 ):
     """Add a new task to your list.
     
     Args:
         title: The title of the task to add
         position: Optional position to insert the task at (1-based)
+        tag: Tags to give the task
+        project: Project to file the task under
     """
     console = Console()
     store = get_store()
@@ -24,11 +29,15 @@ def main(
         raise typer.Exit(1)
     
     position_msg = f" at position {position}" if position else ""
-    with console.status(f"[bold green]Adding task{position_msg}...[/]"):
-        task = store.add_task(title, position)
+    try:
+        with console.status(f"[bold green]Adding task{position_msg}...[/]"):
+            task = store.add_task(title, position, tag or None, project)
+    except ValueError as e:
+        console.print(f"[bold red]{e}[/]")
+        raise typer.Exit(1)
     
     # Create a nicely formatted success message
-    task_id_text = Text(f"#{task['id']}", style="bold cyan")
+    task_id_text = Text(f"#{task['position']}", style="bold cyan")
     title_text = Text(f" {task['title']}", style="bold white")
     message = Text.assemble(
         "✅ Added task: ", 
@@ -0,0 +1,50 @@
+# cl_tasks/commands/archive.py
+
+import time
+import typer
+from rich.text import Text
+from cl_tasks.storage import get_store
+from cl_tasks.storage.archive import parse_age
+from cl_tasks.utils import console, show_error, show_success
+from cl_tasks.theme import ICONS
+
+def main(
+    older_than: str = typer.Option(
+        "30d", "--older-than",
+        help="Archive tasks completed longer ago than this (e.g. 30d, 12h, 2w)"
+    )
+):
+    """Move old completed tasks out of your active list into the archive.
+
+    Archived tasks are still shown by 'list --all' and counted by
+    'list --stats', but everyday commands no longer load them.
+
+    Args:
+        older_than: Minimum age since completion of the tasks to archive
+    """
+    try:
+        cutoff = time.time() - parse_age(older_than)
+    except ValueError as e:
+        show_error(str(e), title=f"[bold red]{ICONS['error']} Invalid Age[/]")
+        raise typer.Exit(1)
+
+    store = get_store()
+    try:
+        with console.status("[bold blue]Archiving completed tasks...[/]"):
+            count = store.archive_tasks(cutoff)
+    except NotImplementedError as e:
+        show_error(str(e), title=f"[bold red]{ICONS['error']} Archive Unavailable[/]")
+        raise typer.Exit(1)
+
+    if count == 0:
+        console.print(f"{ICONS['info']} [dim]No tasks completed more than {older_than} ago.[/dim]")
+        return
+
+    show_success(
+        Text.assemble(
+            f"{ICONS['success']} Archived ",
+            Text(str(count), style="bold cyan"),
+            f" tasks completed more than {older_than} ago"
+        ),
+        title="[bold green]Tasks Archived[/]"
+    )
@@ -0,0 +1,143 @@
+# cl_tasks/commands/batch.py
+
+import json
+import shlex
+import sys
+import typer
+from rich.text import Text
+from cl_tasks.storage import get_store
+from cl_tasks.utils import console, show_error, show_success, show_warning
+from cl_tasks.theme import ICONS
+
+# Operations that act on an existing task, and how many numbers they take
+TASK_OPS = {"start": 1, "pause": 1, "complete": 1, "delete": 1, "reorder": 2}
+
+
+def parse_line(line: str) -> dict:
+    """Parse one batch line into an operation dict.
+
+    Lines look like the matching ``cltasks`` commands, for example
+    ``add "Buy milk" --position 1``, ``complete 3``, ``reorder 3 1`` or
+    ``tag 3 work urgent``.
+    A JSON object such as ``{"op": "complete", "id": 3}`` is also accepted.
+
+    Raises:
+        ValueError: If the line cannot be parsed
+    """
+    if line.startswith("{"):
+        return json.loads(line)
+
+    words = shlex.split(line)
+    name, args = words[0], words[1:]
+
+    if name == "add":
+        op = {"op": "add"}
+        if len(args) == 3 and args[1] in ("--position", "-p"):
+            op["position"] = int(args[2])
+        elif len(args) != 1:
+            raise ValueError('expected: add "<title>" [--position <pos>]')
+        op["title"] = args[0]
+        return op
+
+    if name == "tag":
+        if len(args) < 2:
+            raise ValueError("expected: tag <task> <tag>...")
+        return {"op": "tag", "task": int(args[0]), "add": args[1:]}
+
+    if name not in TASK_OPS:
+        raise ValueError(f"unknown operation '{name}'")
+    if len(args) != TASK_OPS[name]:
+        raise ValueError(f"'{name}' takes {TASK_OPS[name]} number(s)")
+    numbers = [int(arg) for arg in args]
+    op = {"op": name, "task": numbers[0]}
+    if name == "reorder":
+        op["position"] = numbers[1]
+    return op
+
+
+def main(
+    file: str = typer.Argument("-", help="File of operations, one per line ('-' for stdin)"),
+    ids: bool = typer.Option(
+        False, "--ids",
+        help="Refer to tasks by their permanent id instead of their list position"
+    )
+):
+    """Apply many operations at once, reading them one per line.
+
+    All operations are loaded, checked and then applied in one go, so the
+    task list is read and written only once. Blank lines and lines starting
+    with '#' are ignored.
+
+    Args:
+        file: Path to read operations from, or '-' for stdin
+        ids: Whether task numbers are permanent ids rather than positions
+    """
+    stream = sys.stdin if file == "-" else open(file)
+    ops = []
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                ops.append(parse_line(line))
+            except ValueError as e:
+                show_error(
+                    f"Line {line_number}: {e}",
+                    title=f"[bold red]{ICONS['error']} Invalid Batch[/]"
+                )
+                raise typer.Exit(1)
+    finally:
+        # Only close a file opened here, never stdin
+        if stream is not sys.stdin:
+            stream.close()
+
+    if not ops:
+        console.print("[dim]No operations to apply.[/dim]")
+        return
+
+    store = get_store()
+
+    # Positions refer to the list as it was before the batch started
+    tasks = None if ids else store.list_tasks()
+    unknown = []
+    for op in ops:
+        if "task" not in op:
+            continue
+        number = op.pop("task")
+        if ids:
+            op["id"] = number
+        elif 1 <= number <= len(tasks):
+            op["id"] = tasks[number - 1]["id"]
+        else:
+            unknown.append(number)
+
+    if unknown:
+        show_error(
+            f"No task at position(s): {', '.join(f'#{n}' for n in unknown)}",
+            title=f"[bold red]{ICONS['error']} Invalid Batch[/]"
+        )
+        raise typer.Exit(1)
+
+    with console.status(f"[bold blue]Applying {len(ops)} operations...[/]"):
+        try:
+            results = store.apply_batch(ops)
+        except ValueError as e:
+            show_error(str(e), title=f"[bold red]{ICONS['error']} Invalid Batch[/]")
+            raise typer.Exit(1)
+
+    failed = [op for op, result in zip(ops, results) if not result]
+    applied = len(ops) - len(failed)
+    show_success(
+        Text.assemble(
+            f"{ICONS['success']} Applied ",
+            Text(str(applied), style="bold cyan"),
+            f" of {len(ops)} operations"
+        ),
+        title="[bold green]Batch Complete[/]"
+    )
+    if failed:
+        show_warning(
+            "\n".join(f"{op['op']} (task id {op['id']})" for op in failed),
+            title=f"[bold yellow]{ICONS['warning']} {len(failed)} Operations Had No Effect[/]"
+        )
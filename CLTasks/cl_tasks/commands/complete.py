@@ -6,23 +6,24 @@ from rich.console import Console
 from rich.text import Text
 from cl_tasks.storage import get_store
 
-def main(task_id: int):
+def main(position: int = typer.Argument(..., help="Position of the task to complete, as shown by 'list'")):
     """Mark a task as complete.
     
     Args:
-        task_id: The ID of the task to mark as complete
+        position: The position of the task to mark as complete
     """
     console = Console()
     store = get_store()
     
-    with console.status(f"[bold blue]Marking task #{task_id} as complete...[/]"):
-        success = store.complete_task(task_id)
+    with console.status(f"[bold blue]Marking task #{position} as complete...[/]"):
+        task = store.task_at(position)
+        success = task is not None and store.complete_task(task["id"])
 
     if success:
         # Create a nicely formatted success message
         message = Text.assemble(
             "🎉 Task ", 
-            Text(f"#{task_id}", style="bold cyan"),
+            Text(f"#{position}", style="bold cyan"),
             " marked as ",
             Text("complete", style="bold green"),
             "!"
@@ -37,7 +38,7 @@ def main(task_id: int):
         console.print(panel)
     else:
         # Error message in a different colored panel
-        message = Text(f"⚠️ Task with ID #{task_id} not found.", style="yellow")
+        message = Text(f"⚠️ Task #{position} not found.", style="yellow")
         panel = Panel(
             message,
             title="[bold yellow]Task Not Found[/]",
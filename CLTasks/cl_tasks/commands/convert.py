@@ -0,0 +1,62 @@
+# cl_tasks/commands/convert.py
+
+import json
+import os
+import typer
+from rich.text import Text
+from cl_tasks.storage.binary_format import encode_doc, read_doc, is_snapshot
+from cl_tasks.storage.locking import atomic_write_bytes, atomic_write_json
+from cl_tasks.storage.ops import load_doc
+from cl_tasks.utils import console, show_error, show_success
+from cl_tasks.theme import ICONS
+
+def main(
+    source: str = typer.Argument(..., help="Task file to read, JSON or binary"),
+    target: str = typer.Argument(..., help="File to write; a .bin name gets the binary format, anything else JSON"),
+    force: bool = typer.Option(
+        False, "--force", "-f",
+        help="Overwrite the target if it exists"
+    )
+):
+    """Convert a task file between the JSON and binary formats.
+
+    The source format is detected from the file's contents. Converting a
+    binary store back to JSON gives a file the JSON store reads as-is.
+
+    Args:
+        source: Path of the file to read
+        target: Path of the file to write
+        force: Whether to overwrite an existing target
+    """
+    if not os.path.exists(source):
+        show_error(f"{source} does not exist.", title=f"[bold red]{ICONS['error']} Conversion Failed[/]")
+        raise typer.Exit(1)
+    if os.path.exists(target) and not force:
+        show_error(
+            f"{target} already exists. Use --force to overwrite it.",
+            title=f"[bold red]{ICONS['error']} Conversion Aborted[/]"
+        )
+        raise typer.Exit(1)
+
+    with console.status("[bold blue]Converting tasks...[/]"):
+        if is_snapshot(source):
+            doc = read_doc(source)
+        else:
+            with open(source) as f:
+                doc = load_doc(json.load(f))
+
+        if target.endswith(".bin"):
+            atomic_write_bytes(target, encode_doc(doc))
+            target_format = "binary"
+        else:
+            atomic_write_json(target, doc, indent=2)
+            target_format = "JSON"
+
+    show_success(
+        Text.assemble(
+            f"{ICONS['success']} Wrote ",
+            Text(str(len(doc["tasks"])), style="bold cyan"),
+            f" tasks to {target} ({target_format})"
+        ),
+        title="[bold green]Conversion Complete[/]"
+    )
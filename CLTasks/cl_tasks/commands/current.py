@@ -0,0 +1,29 @@
+# cl_tasks/commands/current.py
+
+from rich.text import Text
+from cl_tasks import current
+from cl_tasks.storage import get_store
+from cl_tasks.utils import console
+from cl_tasks.theme import ICONS
+
+def main():
+    """Show the running tasks and refresh the file shell prompts read.
+
+    Prompts should call the lighter 'cltasks-current' script, which only
+    reads that file. Running this command fixes the file if it ever falls
+    out of step with your tasks.
+    """
+    store = get_store()
+    running = current.rebuild(store.iter_tasks("running"), list_name=store.list_name)
+
+    if not running:
+        console.print(f"{ICONS['info']} [dim]No task is running.[/dim]")
+        return
+
+    for entry in reversed(running):
+        console.print(Text.assemble(
+            f"{ICONS['start']} ",
+            Text(current.entry_title(entry), style="bold white"),
+            " ",
+            Text(current.format_elapsed(current.elapsed_seconds(entry)), style="bold cyan"),
+        ))
@@ -0,0 +1,82 @@
+# cl_tasks/commands/daemon.py
+
+import os
+import subprocess
+import sys
+import time
+import typer
+from rich.text import Text
+from cl_tasks.storage.daemon import SOCKET_PATH, connect
+from cl_tasks.utils import console, show_error, show_success
+from cl_tasks.theme import ICONS
+
+# How long 'start' and 'stop' wait for the daemon to come up or go away
+WAIT_SECONDS = 5
+
+def _wait_for(condition):
+    deadline = time.time() + WAIT_SECONDS
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def main(
+    action: str = typer.Argument("status", help="One of: start, stop, status")
+):
+    """Start, stop or check the background task daemon.
+
+    The daemon keeps your tasks loaded and answers other commands over a
+    local socket, so they don't read the task files themselves. It serves
+    the journaled store, so commands use it when USE_JOURNAL=true.
+
+    Args:
+        action: What to do with the daemon
+    """
+    client = connect()
+
+    if action == "status":
+        if client is None:
+            console.print(f"{ICONS['info']} [dim]No task daemon is running.[/dim]")
+            return
+        console.print(
+            f"{ICONS['success']} Task daemon running as PID [bold cyan]{client.pid}[/] on {SOCKET_PATH}"
+        )
+
+    elif action == "start":
+        if client is not None:
+            console.print(f"{ICONS['info']} [dim]Task daemon already running as PID {client.pid}.[/dim]")
+            return
+        subprocess.Popen(
+            [sys.executable, "-m", "cl_tasks.storage.daemon"],
+            start_new_session=True,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        if not _wait_for(lambda: connect() is not None):
+            show_error(
+                f"The task daemon did not start listening on {SOCKET_PATH}.",
+                title=f"[bold red]{ICONS['error']} Daemon Not Started[/]"
+            )
+            raise typer.Exit(1)
+        message = Text.assemble(f"{ICONS['success']} Task daemon listening on ", Text(SOCKET_PATH, style="bold cyan"))
+        if os.getenv("USE_JOURNAL", "false").lower() != "true":
+            message.append("\nSet USE_JOURNAL=true for commands to use it.", style="yellow")
+        show_success(message, title="[bold green]Daemon Started[/]")
+
+    elif action == "stop":
+        if client is None:
+            console.print(f"{ICONS['info']} [dim]No task daemon is running.[/dim]")
+            return
+        client.shutdown()
+        client.close()
+        if not _wait_for(lambda: not os.path.exists(SOCKET_PATH)):
+            show_error("The task daemon did not shut down.", title=f"[bold red]{ICONS['error']} Daemon Still Running[/]")
+            raise typer.Exit(1)
+        show_success(f"{ICONS['success']} Task daemon stopped", title="[bold green]Daemon Stopped[/]")
+
+    else:
+        show_error(
+            f"Unknown action '{action}'. Use start, stop or status.",
+            title=f"[bold red]{ICONS['error']} Invalid Action[/]"
+        )
+        raise typer.Exit(1)
@@ -5,7 +5,7 @@ from cl_tasks.storage import get_store
 from cl_tasks.utils import console, show_warning, show_success, show_error
 
 def main(
-    task_id: int = typer.Argument(..., help="ID of the task to delete"),
+    position: int = typer.Argument(..., help="Position of the task to delete, as shown by 'list'"),
     force: bool = typer.Option(
         False, "--force", "-f", 
         help="Skip confirmation prompt"
@@ -14,28 +14,27 @@ def main(
     """Delete a task from your list.
     
     Args:
-        task_id: The ID of the task to delete
+        position: The position of the task to delete
     """
     store = get_store()
     
     # First confirm we have the task
-    tasks = store.list_tasks()
-    task_exists = any(task["id"] == task_id for task in tasks)
+    task = store.task_at(position)
     
-    if not task_exists:
+    if task is None:
         show_error(
-            f"Task with ID #{task_id} not found.", 
+            f"Task #{position} not found.", 
             title="[bold red]Task Not Found[/]"
         )
         raise typer.Exit(1)
     
     # Get the task title for better UX
-    task_title = next(task["title"] for task in tasks if task["id"] == task_id)
+    task_title = task["title"]
     
     # Add confirmation unless force flag is used
     if not force:
         confirmed = typer.confirm(
-            f"Are you sure you want to delete task #{task_id}: '{task_title}'?",
+            f"Are you sure you want to delete task #{position}: '{task_title}'?",
             default=False
         )
         if not confirmed:
@@ -43,14 +42,14 @@ def main(
             raise typer.Exit()
     
     # Proceed with deletion
-    with console.status(f"[bold red]Deleting task #{task_id}...[/]"):
-        success = store.delete_task(task_id)
+    with console.status(f"[bold red]Deleting task #{position}...[/]"):
+        success = store.delete_task(task["id"])
 
     if success:
         show_success(
             Text.assemble(
                 "🗑️  Task ", 
-                Text(f"#{task_id}", style="bold cyan"),
+                Text(f"#{position}", style="bold cyan"),
                 Text(" has been deleted", style="bold")
             ),
             title="[bold red]Task Deleted[/]"
@@ -58,6 +57,6 @@ def main(
     else:
         # This should never happen given our earlier check, but just in case
         show_error(
-            f"Task with ID #{task_id} not found.", 
+            f"Task #{position} not found.", 
             title="[bold red]Task Not Found[/]"
         )
\ No newline at end of file
@@ -0,0 +1,69 @@
+# cl_tasks/commands/exporter.py
+
+import sys
+import typer
+from typing import Optional
+from cl_tasks.storage import get_store
+from cl_tasks.storage.archive import merged_tasks
+from cl_tasks.output import OutputFormat, close_broken_pipe, write_tasks
+from cl_tasks.transfer import TransferFormat, guess_format, write_csv
+
+def main(
+    file: str = typer.Argument("-", help="File to write the tasks to ('-' for stdout)"),
+    format: Optional[TransferFormat] = typer.Option(
+        None, "--format",
+        help="Format to write; guessed from the file name, NDJSON for stdout"
+    ),
+    status: Optional[str] = typer.Option(
+        None, "--status", help="Only export open, running or completed tasks"
+    ),
+    tag: Optional[str] = typer.Option(None, "--tag", "-t", help="Only export tasks with this tag"),
+    project: Optional[str] = typer.Option(None, "--project", help="Only export tasks in this project")
+):
+    """Write every task to a CSV or NDJSON file, archived ones included.
+
+    Tasks are streamed from the store as they are written, so exports of
+    any size run in bounded memory. The file can be read back with
+    'cltasks import'.
+
+    Args:
+        file: Path to write to, or '-' for stdout
+        format: Whether to write CSV or NDJSON
+        status: Which tasks to export
+        tag: Tag the exported tasks must have
+        project: Project the exported tasks must be in
+    """
+    if status is not None and status not in ("open", "running", "completed"):
+        print("--status must be open, running or completed.", file=sys.stderr)
+        raise typer.Exit(1)
+    if format is None:
+        format = TransferFormat.ndjson if file == "-" else guess_format(file)
+        if format is None:
+            print("Can't tell the format from the file name; pass --format csv or ndjson.", file=sys.stderr)
+            raise typer.Exit(1)
+
+    store = get_store()
+    tasks = merged_tasks(store, status, tag=tag.lstrip("#").lower() if tag else None, project=project)
+    try:
+        out = sys.stdout if file == "-" else open(file, "w", newline="")
+    except OSError as e:
+        print(f"Can't write {file}: {e}", file=sys.stderr)
+        raise typer.Exit(1)
+    try:
+        if format == TransferFormat.csv:
+            count = write_csv(tasks, out)
+        else:
+            count = write_tasks(tasks, OutputFormat.ndjson, out)
+        out.flush()
+    except BrokenPipeError:
+        close_broken_pipe()
+        return
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if file != "-":
+        from cl_tasks.utils import show_success
+        from cl_tasks.theme import ICONS
+
+        show_success(f"{ICONS['success']} Exported {count} tasks to {file}", title="[bold green]Export Complete[/]")
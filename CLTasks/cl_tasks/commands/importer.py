@@ -0,0 +1,85 @@
+# cl_tasks/commands/importer.py
+
+import sys
+import typer
+from typing import Optional
+from rich.text import Text
+from cl_tasks.storage import get_store
+from cl_tasks.transfer import (
+    CHUNK_SIZE, RowError, SkippedRows, TransferFormat, guess_format, import_ops, parse_ops, read_rows,
+)
+from cl_tasks.utils import console, show_error, show_success, show_warning
+from cl_tasks.theme import ICONS
+
+def main(
+    file: str = typer.Argument("-", help="CSV or NDJSON file to import ('-' for stdin)"),
+    format: Optional[TransferFormat] = typer.Option(
+        None, "--format",
+        help="Format of the file; guessed from its extension, NDJSON for stdin"
+    ),
+    chunk_size: int = typer.Option(CHUNK_SIZE, "--chunk-size", help="Tasks saved per write"),
+    skip_invalid: bool = typer.Option(False, "--skip-invalid", help="Leave out invalid rows instead of stopping"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only check the file; don't add any tasks")
+):
+    """Add tasks in bulk from a CSV or NDJSON file.
+
+    Rows are read and checked one at a time and saved in chunks, so files
+    of any size import in bounded memory. Each row needs a title and may
+    set completed, start_time, end_time, paused_duration (seconds), project
+    and tags, the columns 'cltasks export' writes. Tasks get new ids and
+    are added at the end of the list.
+
+    Args:
+        file: Path to read tasks from, or '-' for stdin
+        format: Whether the file is CSV or NDJSON
+        chunk_size: How many tasks each write to the store adds
+        skip_invalid: Whether to skip invalid rows rather than stop at the first
+        dry_run: Whether to only check the rows
+    """
+    if chunk_size < 1:
+        print("--chunk-size must be 1 or greater.", file=sys.stderr)
+        raise typer.Exit(1)
+    if format is None:
+        format = TransferFormat.ndjson if file == "-" else guess_format(file)
+        if format is None:
+            print("Can't tell the file's format from its name; pass --format csv or ndjson.", file=sys.stderr)
+            raise typer.Exit(1)
+
+    try:
+        stream = sys.stdin if file == "-" else open(file, newline="")
+    except OSError as e:
+        show_error(str(e), title=f"[bold red]{ICONS['error']} Import Failed[/]")
+        raise typer.Exit(1)
+
+    skipped = SkippedRows() if skip_invalid else None
+    imported = 0
+    ops = parse_ops(read_rows(stream, format, skipped), skipped)
+    try:
+        with console.status("[bold blue]Importing tasks...[/]") as status:
+            if dry_run:
+                imported = sum(1 for _ in ops)
+            else:
+                store = get_store()
+                for added in import_ops(store, ops, chunk_size):
+                    imported += added
+                    status.update(f"[bold blue]Imported {imported} tasks...[/]")
+    except RowError as e:
+        saved = f"\n{imported} tasks before it were already imported." if imported else ""
+        show_error(f"{e}{saved}", title=f"[bold red]{ICONS['error']} Invalid Row[/]")
+        raise typer.Exit(1)
+    finally:
+        # Only close a file opened here, never stdin
+        if stream is not sys.stdin:
+            stream.close()
+
+    verb = "Checked" if dry_run else "Imported"
+    show_success(
+        Text.assemble(f"{ICONS['success']} {verb} ", Text(str(imported), style="bold cyan"), " tasks"),
+        title=f"[bold green]{'Check' if dry_run else 'Import'} Complete[/]"
+    )
+    if skipped is not None and skipped.count:
+        more = skipped.count - len(skipped.errors)
+        show_warning(
+            "\n".join(str(error) for error in skipped.errors) + (f"\n...and {more} more" if more else ""),
+            title=f"[bold yellow]{ICONS['warning']} Skipped {skipped.count} Invalid Rows[/]"
+        )
@@ -1,52 +1,85 @@
 # cl_tasks/commands/list.py
 
+import sys
 import typer
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich.box import Box, ROUNDED
+from typing import Optional
 from cl_tasks.storage import get_store
-from cl_tasks.utils import console, format_task_row, display_task_stats
-from cl_tasks.theme import ICONS
+from cl_tasks.storage.archive import merged_count, merged_stats, merged_tasks
+from cl_tasks.output import OutputFormat, write_tasks, close_broken_pipe
+from cl_tasks import trace
 
 def main(
     all: bool = typer.Option(False, "--all", "-a", help="Show completed tasks too"),
-    stats: bool = typer.Option(False, "--stats", "-s", help="Show task statistics")
+    stats: bool = typer.Option(False, "--stats", "-s", help="Show task statistics"),
+    format: OutputFormat = typer.Option(
+        OutputFormat.table, "--format",
+        help="Output format; plain, json and ndjson are meant for piping"
+    ),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", help="Show at most this many tasks"),
+    offset: int = typer.Option(0, "--offset", help="Skip this many tasks first"),
+    page: bool = typer.Option(False, "--page", "-p", help="Page through the tasks interactively"),
+    tag: Optional[str] = typer.Option(None, "--tag", "-t", help="Only show tasks with this tag"),
+    project: Optional[str] = typer.Option(None, "--project", help="Only show tasks in this project"),
+    status: Optional[str] = typer.Option(
+        None, "--status",
+        help="Only show open, running or completed tasks (overrides --all)"
+    ),
+    all_lists: bool = typer.Option(False, "--all-lists", help="Show the tasks of every task list")
 ):
     """List all your tasks.
     
-    By default, shows only uncompleted tasks.
+    By default, shows only uncompleted tasks. Open tasks come first, then
+    completed ones.
     """
-    store = get_store()
-    
-    with console.status(f"[bold blue]{ICONS['list']} Loading tasks...[/]"):
-        tasks = store.list_tasks()
-    
-    # Keep the original list for stats
-    all_tasks = tasks.copy()
-    
-    # Filter tasks based on the 'all' flag
-    if not all:
-        tasks = [task for task in tasks if not task["completed"]]
-    
-    # Sort tasks: incomplete first, then by ID
-    tasks = sorted(tasks, key=lambda x: (x["completed"], x["id"]))
-    
-    if not tasks:
-        console.print(Panel(
-            f"[italic]No tasks found. Add some tasks with '{ICONS['add']} add' command![/italic]",
-            title=f"[bold blue]{ICONS['list']} Tasks[/]",
-            border_style="blue"
-        ))
+    if (limit is not None and limit < 1) or offset < 0:
+        print("--limit must be 1 or greater and --offset 0 or greater.", file=sys.stderr)
+        raise typer.Exit(1)
+    if status is not None and status not in ("open", "running", "completed"):
+        print("--status must be open, running or completed.", file=sys.stderr)
+        raise typer.Exit(1)
+
+    if all_lists:
+        # Reads each list's shard only once the listing reaches it
+        from cl_tasks.storage.lists import AllLists
+        store = AllLists()
+    else:
+        store = get_store()
+    # Filtering, ordering and paging all happen in the store; with --all,
+    # archived tasks follow the store's own
+    if status is None:
+        status = None if all else "open"
+    filters = {"tag": tag.lstrip("#").lower() if tag else None, "project": project}
+
+    if format != OutputFormat.table:
+        try:
+            # Tasks stream straight from the store, so this covers the query too
+            with trace.phase("output"):
+                write_tasks(merged_tasks(store, status, "status", limit, offset, **filters), format)
+                sys.stdout.flush()
+        except BrokenPipeError:
+            close_broken_pipe()
         return
-    
-    # Count completed and total tasks
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for task in tasks if task["completed"])
-    
+
+    if page:
+        page_tasks(store, status, limit, offset, filters)
+    else:
+        print_table(store, status, limit, offset, filters)
+
+    if stats:
+        from cl_tasks.utils import display_task_stats
+        display_task_stats(merged_stats(store))
+
+    print_tip(status != "open")
+
+def build_table(tasks, title):
+    """Build the Rich table for one page of tasks."""
+    from rich.table import Table
+    from rich.box import ROUNDED
+    from cl_tasks.utils import format_task_row
+
     # Create a beautiful table with rounded corners
     table = Table(
-        title=f"{ICONS['list']} Your Tasks ({completed_tasks}/{total_tasks} completed)",
+        title=title,
         box=ROUNDED,
         highlight=True,
         show_header=True,
@@ -54,12 +87,15 @@ def main(
     )
     
     # Add columns with better styling
+    show_lists = any("list" in task for task in tasks)
+    if show_lists:
+        table.add_column("List", style="secondary")
     table.add_column("#", style="secondary", justify="center")
     table.add_column("Task", style="task.title", no_wrap=False)
     table.add_column("Status", style="task.completed", justify="center")
     table.add_column("Duration", style="task.duration", justify="center")
 
-      # Add rows with different styles for completed/incomplete tasks
+    # Add rows with different styles for completed/incomplete tasks
     for i, task in enumerate(tasks):
         task_row = format_task_row(task)
         # Use different styles for odd/even rows but respect completion status
@@ -67,17 +103,104 @@ def main(
             row_style = "dim"
         else:
             row_style = "table.row.even" if i % 2 == 0 else "table.row.odd"
-        table.add_row(task_row[0], task_row[1], task_row[2], task_row[3], style=row_style)
+        cells = task_row[:4]
+        if show_lists:
+            cells.insert(0, task["list"])
+        table.add_row(*cells, style=row_style)
+    return table
+
+def table_title(store, status, shown: str = "", filters=None) -> str:
+    """Title with completed/total counts for the tasks being listed."""
+    from cl_tasks.theme import ICONS
+
+    filters = filters or {}
+    total_tasks = merged_count(store, status, **filters)
+    if status is None:
+        completed_tasks = merged_count(store, "completed", **filters)
+    else:
+        completed_tasks = total_tasks if status == "completed" else 0
+    labels = "".join(
+        f" {prefix}{filters[name]}" for name, prefix in (("project", "@"), ("tag", "#")) if filters.get(name)
+    )
+    if getattr(store, "names", None) is not None:
+        labels = f" in all lists{labels}"
+    elif store.list_name is not None:
+        labels = f" in {store.list_name}{labels}"
+    return f"{ICONS['list']} Your Tasks{labels} ({completed_tasks}/{total_tasks} completed){shown}"
+
+def print_empty():
+    from rich.panel import Panel
+    from cl_tasks.utils import console
+    from cl_tasks.theme import ICONS
+
+    console.print(Panel(
+        f"[italic]No tasks found. Add some tasks with '{ICONS['add']} add' command![/italic]",
+        title=f"[bold blue]{ICONS['list']} Tasks[/]",
+        border_style="blue"
+    ))
+
+def print_table(store, status, limit: Optional[int], offset: int, filters=None):
+    """Fetch one slice of tasks from the store and print it as a table."""
+    from cl_tasks.utils import console
+    from cl_tasks.theme import ICONS
+
+    filters = filters or {}
+    with console.status(f"[bold blue]{ICONS['list']} Loading tasks...[/]"), trace.phase("query"):
+        tasks = list(merged_tasks(store, status, "status", limit, offset, **filters))
+
+    if not tasks:
+        print_empty()
+        return
+
+    shown = ""
+    if limit is not None or offset:
+        shown = f" · showing {offset + 1}-{offset + len(tasks)}"
+    with trace.phase("query"):
+        title = table_title(store, status, shown, filters)
+    with trace.phase("render"):
+        console.print(build_table(tasks, title))
+
+def page_tasks(store, status, page_size: Optional[int], offset: int, filters=None):
+    """Interactive pager that only fetches and renders the visible page."""
+    import shutil
+    from cl_tasks.utils import console
+
+    filters = filters or {}
+    total = merged_count(store, status, **filters)
+    if total == 0:
+        print_empty()
+        return
+    if page_size is None:
+        # Leave room for the title, borders and the key hint
+        page_size = max(5, shutil.get_terminal_size().lines - 9)
+
+    interactive = sys.stdin.isatty()
+    while True:
+        tasks = list(merged_tasks(store, status, "status", page_size, offset, **filters))
+        page_number = offset // page_size + 1
+        page_count = (total + page_size - 1) // page_size
+        if interactive:
+            console.clear()
+        console.print(build_table(tasks, table_title(store, status, f" · page {page_number}/{page_count}", filters)))
+
+        if not interactive:
+            return
+        console.print("[dim]n/space: next · p: previous · q: quit[/dim]")
+        key = typer.getchar()
+        if key in ("n", " ", "j") and offset + page_size < total:
+            offset += page_size
+        elif key in ("p", "k") and offset > 0:
+            offset = max(0, offset - page_size)
+        elif key in ("q", "Q", "\x1b", "\x03"):
+            return
+
+def print_tip(all: bool):
+    from cl_tasks.utils import console
+    from cl_tasks.theme import ICONS
 
-    console.print(table)
-    
-    # Show statistics if requested
-    if stats:
-        display_task_stats(all_tasks)
-    
     # Add helpful tips footer
     if all:
-        tip_text = f"{ICONS['info']} [dim]Tip: Use '{ICONS['complete']} complete <id>' to mark a task as done[/dim]"
+        tip_text = f"{ICONS['info']} [dim]Tip: Use '{ICONS['complete']} complete <position>' to mark a task as done[/dim]"
     else:
         tip_text = f"{ICONS['info']} [dim]Tip: Use '--all' to show completed tasks too[/dim]"
     
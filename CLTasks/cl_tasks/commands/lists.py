@@ -0,0 +1,62 @@
+# cl_tasks/commands/lists.py
+
+import json
+import sys
+import typer
+from cl_tasks.storage.lists import AllLists, selected_list
+from cl_tasks.output import OutputFormat, close_broken_pipe
+
+def main(
+    format: OutputFormat = typer.Option(
+        OutputFormat.table, "--format",
+        help="Output format; plain, json and ndjson are meant for piping"
+    )
+):
+    """Show your task lists with how many tasks each one holds.
+
+    Pick a list for any command with 'cltasks --list <name> ...'; a list
+    is created the first time it is used. Counts include archived tasks.
+
+    Args:
+        format: How to print the lists
+    """
+    from cl_tasks.storage.archive import merged_stats
+
+    lists = AllLists()
+    active = selected_list()
+    rows = []
+    for name in lists.names:
+        stats = merged_stats(lists.store(name))
+        rows.append({
+            "list": name,
+            "open": stats["total"] - stats["completed"],
+            "completed": stats["completed"],
+            "current": name == active,
+        })
+
+    if format != OutputFormat.table:
+        try:
+            if format == OutputFormat.json:
+                print(json.dumps(rows, indent=2))
+            elif format == OutputFormat.ndjson:
+                sys.stdout.write("".join(json.dumps(row) + "\n" for row in rows))
+            else:
+                sys.stdout.write("".join(f"{row['list']}\t{row['open']}\t{row['completed']}\n" for row in rows))
+            sys.stdout.flush()
+        except BrokenPipeError:
+            close_broken_pipe()
+        return
+
+    from rich.table import Table
+    from cl_tasks.utils import console
+    from cl_tasks.theme import ICONS
+
+    table = Table(title=f"{ICONS['list']} Task Lists", header_style="bold blue")
+    table.add_column("List", style="cyan")
+    table.add_column("Open", justify="right")
+    table.add_column("Completed", justify="right")
+    for row in rows:
+        name = f"[bold]{row['list']}[/] [dim](current)[/]" if row["current"] else row["list"]
+        table.add_row(name, str(row["open"]), str(row["completed"]))
+    console.print(table)
+    console.print(f"{ICONS['info']} [dim]Tip: Use 'cltasks --list <name> ...' to work on another list[/dim]")
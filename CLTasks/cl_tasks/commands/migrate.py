@@ -0,0 +1,57 @@
+# cl_tasks/commands/migrate.py
+
+import os
+import typer
+from rich.text import Text
+from cl_tasks.storage.file_store import FileTaskStore, FILE_PATH
+from cl_tasks.storage.sqlite_store import SQLiteTaskStore, DB_PATH
+from cl_tasks.utils import console, show_error, show_success
+from cl_tasks.theme import ICONS
+
+def main(
+    source: str = typer.Option(FILE_PATH, "--from", help="JSON task file to import"),
+    target: str = typer.Option(DB_PATH, "--to", help="SQLite database to import into"),
+    force: bool = typer.Option(
+        False, "--force", "-f",
+        help="Replace tasks already in the database"
+    )
+):
+    """Import tasks from the JSON task file into the SQLite store.
+
+    Args:
+        source: Path of the JSON task file
+        target: Path of the SQLite database
+        force: Whether to replace existing database contents
+    """
+    if not os.path.exists(source):
+        # Opening it would create an empty task file, and --force would
+        # then wipe the database
+        show_error(
+            f"There is no task file at {source}.",
+            title=f"[bold red]{ICONS['error']} Migration Aborted[/]"
+        )
+        raise typer.Exit(1)
+
+    store = SQLiteTaskStore(target)
+
+    if store.list_tasks() and not force:
+        show_error(
+            f"The database at {target} already has tasks. Use --force to replace them.",
+            title=f"[bold red]{ICONS['error']} Migration Aborted[/]"
+        )
+        raise typer.Exit(1)
+
+    with console.status("[bold blue]Importing tasks...[/]"):
+        tasks = FileTaskStore(source).list_tasks()
+        # The old tasks go in the same transaction, so a failure keeps them
+        count = store.import_tasks(tasks, replace=True)
+
+    show_success(
+        Text.assemble(
+            f"{ICONS['success']} Imported ",
+            Text(str(count), style="bold cyan"),
+            f" tasks into {target}"
+        ),
+        title="[bold green]Migration Complete[/]"
+    )
+    console.print(f"{ICONS['info']} [dim]Tip: Set USE_SQLITE=true to use the SQLite store[/dim]")
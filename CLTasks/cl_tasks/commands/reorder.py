@@ -7,13 +7,13 @@ from cl_tasks.utils import console, show_error, show_success
 from cl_tasks.theme import ICONS
 
 def main(
-    task_id: int = typer.Argument(..., help="ID of the task to reorder"),
+    current_position: int = typer.Argument(..., help="Current position of the task, as shown by 'list'"),
     position: int = typer.Argument(..., help="New position for the task (1-based)")
 ):
     """Reorder a task to change its priority.
     
     Args:
-        task_id: The ID of the task to reorder
+        current_position: The current position of the task to reorder
         position: New position for the task (1-based)
     """
     store = get_store()
@@ -27,44 +27,39 @@ def main(
         raise typer.Exit(1)
     
     # First confirm we have the task
-    tasks = store.list_tasks()
-    task_exists = any(task["id"] == task_id for task in tasks)
+    task = store.task_at(current_position)
     
-    if not task_exists:
+    if task is None:
         show_error(
-            f"Task with ID #{task_id} not found.", 
+            f"Task #{current_position} not found.", 
             title=f"[bold red]{ICONS['error']} Task Not Found[/]"
         )
         raise typer.Exit(1)
     
-    # Get current position for better UX
-    current_position = next(i+1 for i, task in enumerate(tasks) if task["id"] == task_id)
-    task_title = next(task["title"] for task in tasks if task["id"] == task_id)
+    task_title = task["title"]
     
     # Check if the task is already at the requested position
     if current_position == position:
         show_error(
-            f"Task #{task_id} is already at position {position}.",
+            f"Task #{current_position} is already at position {position}.",
             title=f"[bold yellow]{ICONS['warning']} No Change Needed[/]"
         )
         return
     
     # Proceed with reordering
     direction = "down" if position > current_position else "up"
-    with console.status(f"[bold blue]Moving task #{task_id} {direction} to position {position}...[/]"):
-        success = store.reorder_task(task_id, position)
+    with console.status(f"[bold blue]Moving task #{current_position} {direction} to position {position}...[/]"):
+        moved = store.reorder_task(task["id"], position)
 
-    if success:
-        # Handle case where position was beyond list length
-        final_position = position
-        if position > len(tasks):
-            final_position = len(tasks)
+    if moved:
+        # The store clamps positions beyond the end of the list
+        final_position = moved["position"]
             
         show_success(
             Text.assemble(
                 f"{ICONS['list']} Task ", 
-                Text(f"#{task_id}", style="cyan"),
-                f" ({task_title}) moved from position ",
+                Text(f"{task_title}", style="cyan"),
+                " moved from position ",
                 Text(f"{current_position}", style="yellow"),
                 " to position ",
                 Text(f"{final_position}", style="green")
@@ -74,6 +69,6 @@ def main(
     else:
         # This should never happen given our earlier check, but just in case
         show_error(
-            f"Failed to reorder task #{task_id}.", 
+            f"Failed to reorder task #{current_position}.", 
             title=f"[bold red]{ICONS['error']} Reorder Failed[/]"
         )
@@ -0,0 +1,99 @@
+# cl_tasks/commands/report.py
+
+import json
+import sys
+import time
+import typer
+from typing import Optional
+from cl_tasks.storage import get_store
+from cl_tasks.storage.intervals import GROUPINGS, Intervals, day_label, group_seconds, week_label
+from cl_tasks.output import OutputFormat, close_broken_pipe
+
+def _titles(store, ids):
+    """Titles of the tasks with ``ids``, looking through the archive too."""
+    from cl_tasks.storage.archive import merged_tasks
+
+    wanted = set(ids)
+    titles = {}
+    for task in merged_tasks(store):
+        if task["id"] in wanted:
+            titles[task["id"]] = task["title"]
+            if len(titles) == len(wanted):
+                break
+    return titles
+
+def main(
+    by: str = typer.Option("day", "--by", help="Group worked time by day, week or task"),
+    since: Optional[str] = typer.Option(None, "--since", help="Only count work from this date on (YYYY-MM-DD)"),
+    format: OutputFormat = typer.Option(
+        OutputFormat.table, "--format",
+        help="Output format; plain, json and ndjson are meant for piping"
+    )
+):
+    """Report how much time you worked, per day, week or task.
+
+    Every pause, and every completion of a running task, logs the stretch
+    of work it ended. Tasks still running count up to now.
+
+    Args:
+        by: What to group the worked time by
+        since: Date to start counting from
+        format: How to print the report
+    """
+    if by not in GROUPINGS:
+        print(f"--by must be one of: {', '.join(GROUPINGS)}.", file=sys.stderr)
+        raise typer.Exit(1)
+    since_time = None
+    if since is not None:
+        try:
+            since_time = time.mktime(time.strptime(since, "%Y-%m-%d"))
+        except ValueError:
+            print("--since must be a date like 2024-01-31.", file=sys.stderr)
+            raise typer.Exit(1)
+
+    store = get_store()
+    now = time.time()
+    running = [(task["id"], task["start_time"], now) for task in store.iter_tasks("running")]
+    # Each task list logs its work separately
+    totals = group_seconds(Intervals.read(store.intervals_path).extended(running), by, since_time)
+
+    if by == "task":
+        titles = _titles(store, totals)
+        labels = {key: titles.get(key, f"(deleted task {key})") for key in totals}
+    else:
+        labels = {key: (day_label if by == "day" else week_label)(key) for key in totals}
+    rows = []
+    for key, seconds in totals.items():
+        row = {by: labels[key], "seconds": round(seconds, 3)}
+        if by == "task":
+            row["id"] = key
+        rows.append(row)
+
+    if format != OutputFormat.table:
+        try:
+            if format == OutputFormat.json:
+                print(json.dumps(rows, indent=2))
+            elif format == OutputFormat.ndjson:
+                sys.stdout.write("".join(json.dumps(row) + "\n" for row in rows))
+            else:
+                sys.stdout.write("".join(f"{row[by]}\t{row['seconds']}\n" for row in rows))
+            sys.stdout.flush()
+        except BrokenPipeError:
+            close_broken_pipe()
+        return
+
+    from rich.table import Table
+    from cl_tasks.utils import console, format_seconds
+    from cl_tasks.theme import ICONS
+
+    if not rows:
+        console.print(f"{ICONS['info']} [dim]No tracked time yet. Start and pause tasks to log some.[/dim]")
+        return
+    table = Table(title=f"{ICONS['list']} Time Worked by {by.capitalize()}", header_style="bold blue")
+    table.add_column(by.capitalize(), style="cyan")
+    table.add_column("Worked", justify="right")
+    for row in rows:
+        table.add_row(row[by], format_seconds(row["seconds"]))
+    table.add_section()
+    table.add_row("[bold]Total[/]", f"[bold]{format_seconds(sum(totals.values()))}[/]")
+    console.print(table)
@@ -0,0 +1,63 @@
+# cl_tasks/commands/search.py
+
+import sys
+import typer
+from typing import Optional
+from cl_tasks.storage import get_store
+from cl_tasks.storage.search import tokenize
+from cl_tasks.output import OutputFormat, write_tasks, close_broken_pipe
+
+def main(
+    query: str = typer.Argument(..., help="Words to look for; each may be the start of a word"),
+    format: OutputFormat = typer.Option(
+        OutputFormat.table, "--format",
+        help="Output format; plain, json and ndjson are meant for piping"
+    ),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", help="Show at most this many tasks"),
+    reindex: bool = typer.Option(False, "--reindex", help="Rebuild the search index first"),
+    all_lists: bool = typer.Option(False, "--all-lists", help="Search every task list")
+):
+    """Find tasks whose title contains every word of the query.
+
+    Words match from their start and ignore case, so 'rep wri' finds
+    "Write report". Completed tasks are included; archived ones are not.
+
+    Args:
+        query: The words to search for
+        format: How to print the matching tasks
+        limit: Maximum number of tasks to show
+        reindex: Whether to rebuild the search index before searching
+        all_lists: Whether to search every list rather than the current one
+    """
+    if limit is not None and limit < 1:
+        print("--limit must be 1 or greater.", file=sys.stderr)
+        raise typer.Exit(1)
+    if not tokenize(query):
+        print("The query needs at least one word to search for.", file=sys.stderr)
+        raise typer.Exit(1)
+
+    if all_lists:
+        from cl_tasks.storage.lists import AllLists
+        store = AllLists()
+    else:
+        store = get_store()
+    if reindex and hasattr(store, "reindex"):
+        store.reindex()
+    tasks = store.search_tasks(query, limit)
+
+    if format != OutputFormat.table:
+        try:
+            write_tasks(tasks, format)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            close_broken_pipe()
+        return
+
+    from cl_tasks.commands.list import build_table
+    from cl_tasks.utils import console
+    from cl_tasks.theme import ICONS
+
+    if not tasks:
+        console.print(f"{ICONS['info']} [dim]No tasks match '{query}'.[/dim]")
+        raise typer.Exit(1)
+    console.print(build_table(tasks, f"{ICONS['show']} Tasks matching '{query}' ({len(tasks)})"))
@@ -1,40 +1,49 @@
 # cl_tasks/commands/show.py
 
+import sys
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 from cl_tasks.storage import get_store
-from cl_tasks.utils import create_task_panel, show_error
+from cl_tasks.output import OutputFormat, write_task
 
-def main(task_id: int = typer.Argument(..., help="ID of the task to show")):
+def main(
+    position: int = typer.Argument(..., help="Position of the task to show, as shown by 'list'"),
+    format: OutputFormat = typer.Option(
+        OutputFormat.table, "--format",
+        help="Output format; plain, json and ndjson are meant for piping"
+    )
+):
     """Show detailed information about a specific task.
-    
+
     Args:
-        task_id: The ID of the task to show
+        position: The position of the task to show
+        format: How to print the task
     """
-    console = Console()
     store = get_store()
-    tasks = store.list_tasks()
-    
-    # Find the task
-    task = None
-    for t in tasks:
-        if t["id"] == task_id:
-            task = t
-            break
-    
+    task = store.task_at(position)
+
+    if format != OutputFormat.table:
+        if not task:
+            print(f"Task #{position} not found.", file=sys.stderr)
+            raise typer.Exit(1)
+        write_task(task, format)
+        return
+
+    from rich.console import Console
+    from cl_tasks.utils import create_task_panel, show_error
+
+    console = Console()
+
     if not task:
         show_error(
-            f"Task with ID #{task_id} not found.", 
+            f"Task #{position} not found.",
             title="[bold red]Task Not Found[/]"
         )
         raise typer.Exit(1)
-    
+
     # Show task details in a nice panel
     panel = create_task_panel(
-        task, 
-        title=f"Task #{task_id} Details",
+        task,
+        title=f"Task #{position} Details",
         border_style="blue"
     )
     console.print(panel)
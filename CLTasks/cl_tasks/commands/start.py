@@ -6,35 +6,35 @@ from cl_tasks.storage import get_store
 from cl_tasks.theme import ICONS
 
 def main(
-    id: int = typer.Argument(..., help="ID of the task to start"),
+    position: int = typer.Argument(..., help="Position of the task to start, as shown by 'list'"),
 ):
     """Start a task in your list.
 
     Args:
-        id: The ID of the task to start
+        position: The position of the task to start
     """
     console = Console()
     store = get_store()
 
-    tasks = store.list_tasks()
-    task_exists = any(task["id"] == id for task in tasks)
+    task = store.task_at(position)
 
-    if not task_exists:
-        console.print(f"[bold red]Task with ID #{id} does not exist.[/]")
+    if task is None:
+        console.print(f"[bold red]Task #{position} does not exist.[/]")
         raise typer.Exit(1)
 
-    with console.status(f"[bold green]Starting task with ID #{id}...[/]"):
-        success = store.start_task(id)
+    with console.status(f"[bold green]Starting task #{position}...[/]"):
+        started = store.start_task(task["id"])
 
-    if success:
-        console.print(f"[bold green]Task with ID #{id} started successfully.[/]")
+    if started:
+        console.print(f"[bold green]Task #{position} started successfully.[/]")
         message = Text.assemble(
             "✅ Started task: ", 
-            Text(f"#{id}", style="bold cyan"),
-            Text(" ", style="bold white"),
+            Text(f"#{position}", style="bold cyan"),
+            Text(f" {started['title']}", style="bold white"),
         )
     else:
-        console.print(f"[bold red]Failed to start task with ID #{id}.[/]")
+        console.print(f"[bold red]Failed to start task #{position}.[/]")
+        raise typer.Exit(1)
         
 
     # Display in a nice panel
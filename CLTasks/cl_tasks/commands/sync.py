@@ -0,0 +1,38 @@
+# cl_tasks/commands/sync.py
+
+import typer
+from rich.text import Text
+from cl_tasks.storage import get_store
+from cl_tasks.utils import console, show_error, show_success
+from cl_tasks.theme import ICONS
+
+def main():
+    """Push queued changes to the remote task store and refresh the local cache.
+
+    Changes made while offline, or not yet synced when a command exited,
+    are sent in order. Any conflicts with changes made elsewhere are listed.
+    """
+    store = get_store()
+    if not hasattr(store, "sync"):
+        console.print(f"{ICONS['info']} [dim]This task store is not cached, so there is nothing to sync.[/dim]")
+        return
+
+    try:
+        with console.status("[bold blue]Syncing with the remote store...[/]"):
+            report = store.sync()
+    except Exception as e:
+        pending = store.sync_status()["pending"]
+        show_error(
+            f"{e}\n{pending} change(s) are still queued and will be retried.",
+            title=f"[bold red]{ICONS['error']} Sync Failed[/]"
+        )
+        raise typer.Exit(1)
+
+    message = Text.assemble(
+        f"{ICONS['success']} Pushed ",
+        Text(str(report["pushed"]), style="bold cyan"),
+        " queued change(s); local cache is up to date",
+    )
+    for conflict in report["conflicts"]:
+        message.append(f"\n{ICONS['warning']} {conflict}", style="yellow")
+    show_success(message, title="[bold green]Tasks Synced[/]")
@@ -0,0 +1,63 @@
+# cl_tasks/commands/tag.py
+
+import typer
+from typing import List, Optional
+from rich.text import Text
+from cl_tasks.storage import get_store
+from cl_tasks.utils import console, show_error, show_success
+from cl_tasks.theme import ICONS
+
+def main(
+    position: int = typer.Argument(..., help="Position of the task to tag, as shown by 'list'"),
+    tags: Optional[List[str]] = typer.Argument(None, help="Tags to add"),
+    remove: Optional[List[str]] = typer.Option(None, "--remove", "-r", help="Tag to remove (repeat for several)"),
+    project: Optional[str] = typer.Option(None, "--project", help="Move the task to this project"),
+    no_project: bool = typer.Option(False, "--no-project", help="Take the task out of its project")
+):
+    """Add or remove a task's tags, or change its project.
+
+    Args:
+        position: The position of the task to change
+        tags: Tags to add to the task
+        remove: Tags to remove from the task
+        project: Project to move the task to
+        no_project: Clear the task's project
+    """
+    if not (tags or remove or project or no_project):
+        show_error(
+            "Give tags to add, --remove, --project or --no-project.",
+            title=f"[bold red]{ICONS['error']} Nothing To Change[/]"
+        )
+        raise typer.Exit(1)
+
+    store = get_store()
+    task = store.task_at(position)
+    if task is None:
+        show_error(
+            f"Task #{position} not found.",
+            title=f"[bold red]{ICONS['error']} Task Not Found[/]"
+        )
+        raise typer.Exit(1)
+
+    try:
+        with console.status(f"[bold blue]Updating task #{position}...[/]"):
+            if tags or remove:
+                task = store.tag_task(task["id"], tags or (), remove or ()) or task
+            if project or no_project:
+                task = store.set_project(task["id"], None if no_project else project) or task
+    except ValueError as e:
+        show_error(str(e), title=f"[bold red]{ICONS['error']} Invalid Tag[/]")
+        raise typer.Exit(1)
+
+    labels = [f"#{tag}" for tag in task.get("tags", [])]
+    if task.get("project"):
+        labels.insert(0, f"@{task['project']}")
+    show_success(
+        Text.assemble(
+            f"{ICONS['success']} Task ",
+            Text(task["title"], style="cyan"),
+            " is now ",
+            Text(" ".join(labels) or "untagged", style="green")
+        ),
+        title="[bold green]Task Updated[/]"
+    )
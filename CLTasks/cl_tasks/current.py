@@ -0,0 +1,142 @@
+# cl_tasks/current.py
+"""
+The running tasks, kept in a small sidecar file for shell prompts.
+
+Whenever a store starts, pauses, completes or deletes a task it passes the
+operations to :func:`record`. That keeps ``~/.taskcli_current.json`` (or
+``CLTASKS_CURRENT_FILE``) listing just the tasks that are running. The
+``cltasks-current`` script reads only that file. It imports nothing beyond
+the standard library, so it is cheap enough to run on every prompt render::
+
+    $ cltasks-current
+    Write report 0:42:17
+
+It prints the most recently started task and how long it has run,
+including time before any pauses, plus ``(+N)`` when others are running
+too. It exits with status 1 when no task is running. ``--json`` prints
+every running task instead.
+
+The file covers every task list. Entries for a named list carry its name
+in ``list``, and the script shows it before the title, as in ``[work]``.
+"""
+
+import json
+import os
+import sys
+import time
+
+CURRENT_PATH = os.path.expanduser(os.getenv("CLTASKS_CURRENT_FILE", "~/.taskcli_current.json"))
+
+# Operations that can start or stop a task; an imported "add" can also
+# create one that is already running
+TRACKED_OPS = {"start", "pause", "complete", "delete"}
+
+
+def read_current(path: str = CURRENT_PATH) -> list:
+    """Return the running tasks in the sidecar file, latest started last."""
+    try:
+        with open(path) as f:
+            return json.load(f)["running"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _entry(task, list_name=None):
+    entry = {
+        "id": task["id"],
+        "title": task["title"],
+        "start_time": task["start_time"],
+        "paused_duration": task.get("paused_duration", 0),
+    }
+    if list_name is not None:
+        entry["list"] = list_name
+    return entry
+
+
+def _is_running(task):
+    return task.get("start_time") is not None and not task.get("completed")
+
+
+def record(ops, results, path: str = CURRENT_PATH, list_name: str = None) -> None:
+    """Update the sidecar file after ``ops`` produced ``results``.
+
+    Args:
+        ops: The operations a store just applied
+        results: What the store returned for each of them
+        path: Sidecar file to update
+        list_name: Named list the tasks belong to, or None for the default list
+    """
+    changes = [
+        (op, result) for op, result in zip(ops, results)
+        if result and (op["op"] in TRACKED_OPS or op["op"] == "add" and _is_running(result))
+    ]
+    if not changes:
+        return
+    from cl_tasks.storage.locking import FileLock, atomic_write_json
+
+    with FileLock(path)(exclusive=True):
+        running = read_current(path)
+        for op, task in changes:
+            # Task ids are only unique within a list
+            running = [
+                entry for entry in running
+                if entry["id"] != task["id"] or entry.get("list") != list_name
+            ]
+            if op["op"] != "delete" and _is_running(task):
+                running.append(_entry(task, list_name))
+        atomic_write_json(path, {"running": running})
+
+
+def rebuild(tasks, path: str = CURRENT_PATH, list_name: str = None) -> list:
+    """Rewrite one list's entries in the sidecar file from a full pass over ``tasks``.
+
+    Entries of other lists are kept as they are.
+
+    Returns:
+        list: The running tasks now recorded, latest started last
+    """
+    from cl_tasks.storage.locking import FileLock, atomic_write_json
+
+    entries = [_entry(task, list_name) for task in tasks if _is_running(task)]
+    with FileLock(path)(exclusive=True):
+        others = [entry for entry in read_current(path) if entry.get("list") != list_name]
+        running = sorted(others + entries, key=lambda e: e["start_time"])
+        atomic_write_json(path, {"running": running})
+    return running
+
+
+def elapsed_seconds(entry: dict, now: float = None) -> float:
+    """Seconds a running task has been worked on, across pauses."""
+    now = time.time() if now is None else now
+    return entry["paused_duration"] + max(now - entry["start_time"], 0)
+
+
+def entry_title(entry: dict) -> str:
+    """The entry's title, after its list's name if it is on a named list."""
+    return f"[{entry['list']}] {entry['title']}" if "list" in entry else entry["title"]
+
+
+def format_elapsed(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def main(argv=None) -> int:
+    """Entry point of the ``cltasks-current`` script."""
+    argv = sys.argv[1:] if argv is None else argv
+    running = read_current()
+    if "--json" in argv:
+        now = time.time()
+        print(json.dumps([dict(entry, elapsed=elapsed_seconds(entry, now)) for entry in running]))
+        return 0 if running else 1
+    if not running:
+        return 1
+    latest = running[-1]
+    others = f" (+{len(running) - 1})" if len(running) > 1 else ""
+    print(f"{entry_title(latest)} {format_elapsed(elapsed_seconds(latest))}{others}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# cl_tasks/output.py
+"""
+Machine-readable output for piping tasks into other tools.
+
+Nothing here imports Rich: tasks are written straight to stdout as they
+come from the store, so output of any size streams in constant memory.
+"""
+
+import json
+import os
+import sys
+from enum import Enum
+
+
+class OutputFormat(str, Enum):
+    table = "table"
+    plain = "plain"
+    json = "json"
+    ndjson = "ndjson"
+
+
+def task_status(task: dict) -> str:
+    """Return 'completed', 'running' or 'pending' for a task."""
+    if task["completed"]:
+        return "completed"
+    if task.get("start_time") is not None:
+        return "running"
+    return "pending"
+
+
+def format_plain(task: dict) -> str:
+    """One tab-separated line: position, id, status, duration, title."""
+    return "\t".join((
+        str(task.get("position", "")),
+        str(task["id"]),
+        task_status(task),
+        task.get("duration", "-"),
+        task["title"],
+    ))
+
+
+def write_tasks(tasks, fmt: OutputFormat, out=None) -> int:
+    """Stream ``tasks`` to ``out`` (stdout by default) in a machine format.
+
+    Args:
+        tasks: Any iterable of task dicts; it is consumed lazily
+        fmt: One of the non-table output formats
+        out: File-like object to write to
+
+    Returns:
+        int: Number of tasks written
+    """
+    out = out or sys.stdout
+    count = 0
+    if fmt == OutputFormat.json:
+        out.write("[")
+        for count, task in enumerate(tasks, start=1):
+            out.write(("," if count > 1 else "") + "\n  " + json.dumps(task))
+        out.write("\n]\n" if count else "]\n")
+    elif fmt == OutputFormat.ndjson:
+        for count, task in enumerate(tasks, start=1):
+            out.write(json.dumps(task) + "\n")
+    else:
+        for count, task in enumerate(tasks, start=1):
+            out.write(format_plain(task) + "\n")
+    return count
+
+
+def close_broken_pipe() -> None:
+    """Quietly stop writing after the reading end of a pipe (e.g. ``head``) closed.
+
+    Pointing stdout at /dev/null keeps Python from raising again when it
+    flushes stdout on exit.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def write_task(task: dict, fmt: OutputFormat, out=None) -> None:
+    """Write a single task in a machine format."""
+    out = out or sys.stdout
+    if fmt == OutputFormat.json:
+        out.write(json.dumps(task, indent=2) + "\n")
+    elif fmt == OutputFormat.ndjson:
+        out.write(json.dumps(task) + "\n")
+    else:
+        out.write(format_plain(task) + "\n")
@@ -1,11 +1,45 @@
 import os
 
 from cl_tasks.storage.file_store import FileTaskStore
+from cl_tasks.storage.lists import DEFAULT_LIST, named, selected_list, shard_options
 # from taskcli.storage.cosmos_store import CosmosTaskStore  # later
 
-def get_store():
+def get_store(list_name: str = None):
+    """Open the store the environment selects, holding one task list.
+
+    Args:
+        list_name: Named list to open; by default the one picked with
+            ``--list`` or ``CLTASKS_LIST``, else the default list
+    """
+    name = list_name or selected_list()
     use_cosmos = os.getenv("USE_COSMOS", "false").lower() == "true"
     if use_cosmos:
         from cl_tasks.storage.cosmos_store import CosmosTaskStore
-        return CosmosTaskStore()
-    return FileTaskStore()
\ No newline at end of file
+        if os.getenv("CLTASKS_CACHE", "true").lower() == "true":
+            # Serve reads and writes locally and sync with Cosmos in the background
+            from cl_tasks.storage.cached_store import CachedTaskStore
+
+            def remote():
+                return named(CosmosTaskStore(**shard_options(name, "cosmos")), name)
+            return named(CachedTaskStore(remote, **shard_options(name, "cache")), name)
+        return named(CosmosTaskStore(**shard_options(name, "cosmos")), name)
+    use_sqlite = os.getenv("USE_SQLITE", "false").lower() == "true"
+    if use_sqlite:
+        from cl_tasks.storage.sqlite_store import SQLiteTaskStore
+        return named(SQLiteTaskStore(**shard_options(name, "sqlite")), name)
+    use_binary = os.getenv("USE_BINARY", "false").lower() == "true"
+    if use_binary:
+        from cl_tasks.storage.binary_store import BinaryTaskStore
+        return named(BinaryTaskStore(**shard_options(name, "binary")), name)
+    use_journal = os.getenv("USE_JOURNAL", "false").lower() == "true"
+    if use_journal:
+        if name == DEFAULT_LIST:
+            # A running daemon already has the journal loaded; ask it instead.
+            # It serves the default list only.
+            from cl_tasks.storage.daemon import connect
+            client = connect()
+            if client is not None:
+                return client
+        from cl_tasks.storage.journal_store import JournalTaskStore
+        return named(JournalTaskStore(**shard_options(name, "journal")), name)
+    return named(FileTaskStore(**shard_options(name, "file")), name)
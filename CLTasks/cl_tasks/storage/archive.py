@@ -0,0 +1,210 @@
+# cl_tasks/storage/archive.py
+"""
+Cold storage for old completed tasks.
+
+``cltasks archive`` moves completed tasks out of a store into an archive
+file next to it (``<store path>.archive.gz``), so day-to-day commands only
+load and rewrite the active tasks. The archive is append-only: each run
+adds one gzip member holding the moved tasks as JSON lines, and gzip reads
+the members back as a single stream. (``gzip`` is imported only where it
+is used, to keep it off the startup path of ``list``.) A small ``.meta.json`` file keeps the
+archive's statistics, so reading them doesn't decompress anything.
+
+Moving tasks is crash-safe. The tasks are first written to a ``.pending``
+file, then deleted from the store, then appended to the archive. If a run
+is interrupted, :meth:`TaskArchive.recover` finishes or discards it
+depending on whether the deletion went through. The pending file records
+the archive's size, so finishing a run whose append already happened
+cuts the archive back first instead of appending the tasks twice.
+
+The ``merged_*`` helpers read a store and its archive together; archived
+tasks come after the store's own and have no ``position``.
+"""
+
+import json
+import math
+import os
+from itertools import islice
+from cl_tasks.storage import stats as task_stats
+from cl_tasks.storage.locking import atomic_write_json
+from cl_tasks.storage.query import check_query, matches
+
+# Statuses no archived task can have
+OPEN_STATUSES = ("open", "running")
+
+
+class TaskArchive:
+    """The archive file of one store, with its pending and meta files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pending_path = f"{path}.pending"
+        self.meta_path = f"{path}.meta.json"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def iter_tasks(self):
+        """Yield archived tasks, oldest run first."""
+        if not self.exists():
+            return
+        import gzip
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def get_stats(self) -> dict:
+        """Statistics of the archived tasks, in the format of ``storage.stats``."""
+        if not self.exists():
+            return task_stats.new_stats()
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta["size"] == os.path.getsize(self.path) and task_stats.is_current(meta["stats"]):
+                return meta["stats"]
+        except (OSError, ValueError, KeyError):
+            pass
+        # The meta file is missing or stale; count the archive once more
+        stats = task_stats.compute_stats(self.iter_tasks())
+        self._write_meta(stats)
+        return stats
+
+    def _write_meta(self, stats):
+        atomic_write_json(self.meta_path, {"size": os.path.getsize(self.path), "stats": stats})
+
+    def stage(self, tasks) -> None:
+        """Write ``tasks`` to the pending file before they leave the store.
+
+        The file starts with a line holding the archive's size, where
+        :meth:`commit` appends them.
+        """
+        import gzip
+
+        lines = "".join(json.dumps(task, separators=(",", ":")) + "\n" for task in tasks)
+        offset = os.path.getsize(self.path) if self.exists() else 0
+        with open(self.pending_path, "wb") as f:
+            f.write(b"%d\n" % offset)
+            f.write(gzip.compress(lines.encode("utf-8"), compresslevel=6))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_pending(self):
+        """The archive size recorded by :meth:`stage` (None if it wasn't) and the staged gzip member."""
+        with open(self.pending_path, "rb") as f:
+            data = f.read()
+        if data[:2] == b"\x1f\x8b":
+            return None, data  # Staged before the size was recorded
+        offset, _, member = data.partition(b"\n")
+        return int(offset), member
+
+    def commit(self) -> int:
+        """Append the pending tasks to the archive and update its statistics.
+
+        Returns:
+            int: Number of tasks appended
+        """
+        import gzip
+
+        offset, member = self._read_pending()
+        if offset is not None and self.exists() and os.path.getsize(self.path) > offset:
+            # An interrupted commit already appended all or part of the tasks
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+                os.fsync(f.fileno())
+        stats = self.get_stats()
+        tasks = [json.loads(line) for line in gzip.decompress(member).splitlines()]
+        with open(self.path, "ab") as f:
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+        for task in tasks:
+            task_stats.record_add(stats, task)
+        self._write_meta(stats)
+        os.unlink(self.pending_path)
+        return len(tasks)
+
+    def recover(self, store) -> None:
+        """Finish or roll back a run that was interrupted.
+
+        If the staged tasks are still in ``store`` the deletion never
+        happened, so the pending file is dropped; otherwise it is appended.
+        """
+        if not os.path.exists(self.pending_path):
+            return
+        import gzip
+
+        try:
+            lines = gzip.decompress(self._read_pending()[1]).splitlines()
+        except (OSError, EOFError, ValueError):
+            lines = None  # Torn while staging, so nothing was deleted yet
+        if lines is None or (lines and store.get_task(json.loads(lines[0])["id"]) is not None):
+            os.unlink(self.pending_path)
+        else:
+            self.commit()
+
+
+def parse_age(text: str) -> float:
+    """Parse an age like ``30d``, ``12h``, ``2w`` or ``90m`` into seconds.
+
+    Raises:
+        ValueError: If the text isn't a positive number followed by m, h, d or w
+    """
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+    text = text.strip().lower()
+    error = ValueError(f"Expected an age like 30d, 12h or 2w, got {text!r}")
+    if len(text) < 2 or text[-1] not in units:
+        raise error
+    try:
+        amount = float(text[:-1])
+    except ValueError:
+        raise error from None
+    # Zero, negative, NaN or infinite ages would archive everything or nothing
+    if not math.isfinite(amount) or amount <= 0:
+        raise error
+    return amount * units[text[-1]]
+
+
+def merged_count(store, status=None, tag=None, project=None) -> int:
+    """Count the tasks matching the filters in ``store`` and its archive."""
+    count = store.count_tasks(status, tag=tag, project=project)
+    archive = store.get_archive()
+    if archive is None or status in OPEN_STATUSES:
+        return count
+    if tag is None and project is None:
+        return count + archive.get_stats()["total"]
+    # The archive's counters don't cover tags and projects
+    return count + sum(1 for task in archive.iter_tasks() if matches(task, None, tag, project))
+
+
+def merged_tasks(store, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+    """Like ``store.iter_tasks``, continuing into the archive after the store.
+
+    Every archived task is completed, so ``status="open"`` or
+    ``"running"`` never reads it.
+    """
+    check_query(status, order)
+    archive = store.get_archive()
+    if archive is None or status in OPEN_STATUSES or not archive.exists():
+        yield from store.iter_tasks(status, order, limit, offset, tag=tag, project=project)
+        return
+
+    shown = 0
+    for task in store.iter_tasks(status, order, limit, offset, tag=tag, project=project):
+        shown += 1
+        yield task
+    if limit is not None and shown >= limit:
+        return
+    skip = max(0, offset - store.count_tasks(status, tag=tag, project=project))
+    stop = None if limit is None else skip + limit - shown
+    archived = (task for task in archive.iter_tasks() if matches(task, None, tag, project))
+    for task in islice(archived, skip, stop):
+        yield dict(task, archived=True)
+
+
+def merged_stats(store) -> dict:
+    """Statistics of ``store`` and its archive combined."""
+    archive = store.get_archive()
+    if archive is None:
+        return store.get_stats()
+    return task_stats.merge(store.get_stats(), archive.get_stats())
@@ -1,8 +1,22 @@
 from abc import ABC, abstractmethod
+from cl_tasks.storage.intervals import INTERVALS_PATH
 
 class TaskStore(ABC):
+    """Interface every task backend implements.
+
+    The mutators return a copy of the task they added or changed, with its
+    ``position``, or None when the task does not exist or the change does
+    not apply to it. Commands can report on the result without reading the
+    tasks again.
+    """
+
+    # The named list the store holds (None for the default list) and the
+    # interval log its finished work goes to; see storage.lists
+    list_name = None
+    intervals_path = INTERVALS_PATH
+
     @abstractmethod
-    def add_task(self, title: str, position: int = None):
+    def add_task(self, title: str, position: int = None, tags=None, project: str = None):
         pass
 
     @abstractmethod
@@ -14,7 +28,13 @@ class TaskStore(ABC):
         pass
 
     @abstractmethod
-    def list_tasks(self):
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        """Return tasks with their ``position``, filtered, ordered and paged.
+
+        See ``cl_tasks.storage.query`` for the accepted ``status`` and
+        ``order`` values and the ``tag`` and ``project`` filters. With no
+        arguments, every task in list order.
+        """
         pass
 
     @abstractmethod
@@ -27,4 +47,148 @@ class TaskStore(ABC):
         
     @abstractmethod
     def reorder_task(self, task_id: int, new_position: int):
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def tag_task(self, task_id: int, add=(), remove=()):
+        """Add the ``add`` tags to a task and remove the ``remove`` ones."""
+        pass
+
+    @abstractmethod
+    def set_project(self, task_id: int, project: str = None):
+        """Move a task into ``project``, or out of any project if None."""
+        pass
+
+    def iter_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        """Like :meth:`list_tasks`, but yields the tasks one at a time.
+
+        Stores that can read incrementally should override this so callers
+        streaming output don't need the whole list in memory.
+        """
+        yield from self.list_tasks(status, order, limit, offset, tag=tag, project=project)
+
+    def count_tasks(self, status=None, tag=None, project=None) -> int:
+        """Count the tasks matching ``status``, ``tag`` and ``project``."""
+        return len(self.list_tasks(status, tag=tag, project=project))
+
+    def get_stats(self) -> dict:
+        """Return the aggregate counters described in ``cl_tasks.storage.stats``.
+
+        Stores that maintain the counters on write should override this so
+        reading them doesn't walk every task.
+        """
+        from cl_tasks.storage.stats import compute_stats
+
+        return compute_stats(self.iter_tasks())
+
+    def get_task(self, task_id: int):
+        """Return the task with ``task_id`` and its ``position``, or None.
+
+        Stores that can look a task up directly should override this.
+        """
+        return next((task for task in self.iter_tasks() if task["id"] == task_id), None)
+
+    def task_added_by(self, key: str):
+        """Return the task created by the ``add`` carrying ``key``, or None.
+
+        Lets a client whose add may have landed before it lost the reply
+        check before sending it again. Stores that keep the keys of adds
+        should override this; the default can't tell.
+        """
+        return None
+
+    def task_at(self, position: int):
+        """Return the task shown at ``position`` (1-based), or None.
+
+        Commands take display positions while the mutators take stable task
+        ids; this maps one to the other. Stores that can seek to a position
+        should override it.
+        """
+        tasks = self.list_tasks()
+        if 1 <= position <= len(tasks):
+            return tasks[position - 1]
+        return None
+
+    def search_tasks(self, query: str, limit=None):
+        """Return the tasks whose title matches ``query``, in list order.
+
+        See ``cl_tasks.storage.search`` for how titles are matched. Stores
+        that keep a search index should override this; the default checks
+        every title.
+        """
+        from itertools import islice
+        from cl_tasks.storage.search import matches
+
+        found = (task for task in self.iter_tasks() if matches(task["title"], query))
+        return list(islice(found, limit))
+
+    def get_archive(self):
+        """Return the store's ``TaskArchive``, or None if it can't archive.
+
+        Stores backed by a local file keep their archive next to it.
+        """
+        path = getattr(self, "path", None)
+        if path is None:
+            return None
+        from cl_tasks.storage.archive import TaskArchive
+
+        return TaskArchive(f"{path}.archive.gz")
+
+    def archive_tasks(self, completed_before: float) -> int:
+        """Move tasks completed before ``completed_before`` into the archive.
+
+        Args:
+            completed_before: Epoch seconds; older completed tasks are moved
+
+        Returns:
+            int: Number of tasks archived
+        """
+        archive = self.get_archive()
+        if archive is None:
+            raise NotImplementedError(f"{type(self).__name__} does not support archiving")
+        from cl_tasks.storage.locking import FileLock
+
+        # One archiving run at a time, whatever the store
+        with FileLock(archive.path)(exclusive=True):
+            archive.recover(self)
+            tasks = [
+                task for task in self.iter_tasks("completed")
+                if task.get("end_time", 0) < completed_before
+            ]
+            if not tasks:
+                return 0
+            for task in tasks:
+                del task["position"]
+            archive.stage(tasks)
+            self.apply_batch([{"op": "delete", "id": task["id"]} for task in tasks])
+            return archive.commit()
+
+    def apply_batch(self, ops):
+        """Run several operations and return their results in order.
+
+        Each operation is a dict like ``{"op": "complete", "id": 3}``; see
+        ``cl_tasks.storage.ops`` for the fields each one takes. Stores that
+        can load and persist once for the whole batch should override this;
+        the default simply calls the matching method for each operation.
+
+        Raises:
+            ValueError: If an operation is malformed. Stores that override
+                this validate the whole batch before changing anything.
+        """
+        from cl_tasks.storage.ops import check_op
+
+        ops = [check_op(op) for op in ops]
+        results = []
+        for op in ops:
+            name = op["op"]
+            if name == "add":
+                results.append(self.add_task(op["title"], op.get("position"), op.get("tags"), op.get("project")))
+            elif name == "reorder":
+                results.append(self.reorder_task(op["id"], op["position"]))
+            elif name == "tag":
+                results.append(self.tag_task(op["id"], op.get("add") or (), op.get("remove") or ()))
+            elif name == "project":
+                results.append(self.set_project(op["id"], op.get("project")))
+            else:
+                results.append(getattr(self, f"{name}_task")(op["id"]))
+        return results
\ No newline at end of file
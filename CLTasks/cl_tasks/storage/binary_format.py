@@ -0,0 +1,268 @@
+# cl_tasks/storage/binary_format.py
+"""
+Compact binary encoding of a task document.
+
+The file is laid out so it can be memory-mapped and read in place::
+
+    header    magic, format version, next_id, task count, string count and
+              the offsets of the sections below (see ``HEADER``)
+    stats     u32 length + the document's ``stats`` record as JSON
+    strings   u32 offsets (string count + 1) into a UTF-8 blob; titles and
+              duration strings are stored once and referred to by index
+    index     u64 byte offset of each record in list order, then
+              (i64 id, u32 list index) pairs sorted by id (see ``ID_ENTRY``)
+    records   one per task, in list order: a u32 length prefix, the fixed
+              fields in ``RECORD``, then any other task fields as JSON
+
+The index lets a reader jump straight to the task at a position, or
+binary-search for a task id, and decode just that one record. Version 1
+files have no index and are read by walking the length prefixes.
+
+Numbers are little-endian. Optional fields are marked present by bits in
+the record's flags byte, so a task round-trips to exactly the dict the
+JSON store would hold (apart from integer times coming back as floats).
+"""
+
+import json
+import mmap
+import struct
+from itertools import islice
+
+MAGIC = b"CLTB"
+FORMAT_VERSION = 2
+
+# magic, version, next_id, task count, string count, stats, strings and records offsets
+HEADER = struct.Struct("<4sHQIIQQQ")
+# Version 2 follows the header with the offset of the index section
+INDEX_HEADER = struct.Struct("<Q")
+U64 = struct.Struct("<Q")
+# One entry of the id index: task id, position in the list (0-based)
+ID_ENTRY = struct.Struct("<qI")
+# id, title index, duration index, flags, start_time, end_time, paused_duration
+RECORD = struct.Struct("<qIIBddd")
+# Where the flags byte sits inside RECORD
+FLAGS_AT = struct.calcsize("<qII")
+U32 = struct.Struct("<I")
+
+# Flag bits of a record
+COMPLETED = 1
+HAS_START = 2
+HAS_END = 4
+HAS_PAUSED = 8
+
+# String index meaning "no string" (a task without a duration)
+NO_STRING = 0xFFFFFFFF
+
+# Fields stored in the fixed part of a record; anything else goes in the JSON tail
+FIXED_FIELDS = {"id", "title", "completed", "start_time", "end_time", "duration", "paused_duration"}
+
+
+class FormatError(ValueError):
+    """Raised when a file is not a task snapshot this version can read."""
+
+
+def encode_doc(doc: dict) -> bytes:
+    """Encode a task document into the binary snapshot format."""
+    strings, index = [], {}
+
+    def intern(value):
+        if value is None:
+            return NO_STRING
+        if value not in index:
+            index[value] = len(strings)
+            strings.append(value.encode("utf-8"))
+        return index[value]
+
+    records = []
+    for task in doc["tasks"]:
+        flags = COMPLETED if task.get("completed") else 0
+        flags |= HAS_START if "start_time" in task else 0
+        flags |= HAS_END if "end_time" in task else 0
+        flags |= HAS_PAUSED if "paused_duration" in task else 0
+        body = RECORD.pack(
+            task["id"],
+            intern(task["title"]),
+            intern(task.get("duration")),
+            flags,
+            task.get("start_time", 0.0),
+            task.get("end_time", 0.0),
+            task.get("paused_duration", 0.0),
+        )
+        extra = {k: v for k, v in task.items() if k not in FIXED_FIELDS and k != "position"}
+        if extra:
+            body += json.dumps(extra, separators=(",", ":")).encode("utf-8")
+        records.append(U32.pack(len(body)) + body)
+
+    stats = json.dumps(doc.get("stats", {}), separators=(",", ":")).encode("utf-8")
+    offsets, position = [], 0
+    for value in strings:
+        offsets.append(position)
+        position += len(value)
+    offsets.append(position)
+
+    stats_offset = HEADER.size + INDEX_HEADER.size
+    strings_offset = stats_offset + U32.size + len(stats)
+    index_offset = strings_offset + U32.size * len(offsets) + position
+    records_offset = index_offset + (U64.size + ID_ENTRY.size) * len(records)
+
+    record_offsets, at = [], records_offset
+    for record in records:
+        record_offsets.append(at)
+        at += len(record)
+    by_id = sorted((task["id"], i) for i, task in enumerate(doc["tasks"]))
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, doc["next_id"], len(records), len(strings),
+        stats_offset, strings_offset, records_offset,
+    )
+    return b"".join((
+        header, INDEX_HEADER.pack(index_offset),
+        U32.pack(len(stats)), stats,
+        struct.pack(f"<{len(offsets)}I", *offsets), *strings,
+        struct.pack(f"<{len(record_offsets)}Q", *record_offsets),
+        b"".join(ID_ENTRY.pack(task_id, i) for task_id, i in by_id),
+        *records,
+    ))
+
+
+class SnapshotReader:
+    """Read-only, memory-mapped view of a binary snapshot.
+
+    Iterating yields the tasks in list order, decoding each record only
+    when it is reached; :meth:`offset_at` and :meth:`find` use the index to
+    reach a single record without touching the others. Use as a context
+    manager, or call :meth:`close`.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            # The mapping stays valid after the file is replaced or closed
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.next_id, self.count, self.string_count,
+             self._stats_offset, self._strings_offset, self._records_offset) = HEADER.unpack_from(self._map)
+        except struct.error:
+            self.close()
+            raise FormatError(f"{path} is too short to be a task snapshot")
+        if magic != MAGIC or version not in (1, FORMAT_VERSION):
+            self.close()
+            raise FormatError(f"{path} is not a task snapshot this version can read")
+        self._blob_offset = self._strings_offset + U32.size * (self.string_count + 1)
+        self._index_offset = None
+        if version >= 2:
+            (self._index_offset,) = INDEX_HEADER.unpack_from(self._map, HEADER.size)
+            self._ids_offset = self._index_offset + U64.size * self.count
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def stats(self) -> dict:
+        (length,) = U32.unpack_from(self._map, self._stats_offset)
+        start = self._stats_offset + U32.size
+        return json.loads(self._map[start:start + length])
+
+    def string(self, index: int) -> str:
+        start, end = struct.unpack_from("<2I", self._map, self._strings_offset + U32.size * index)
+        return self._map[self._blob_offset + start:self._blob_offset + end].decode("utf-8")
+
+    def offsets(self):
+        """Yield the byte offset of each record, in list order."""
+        if self._index_offset is not None:
+            for i in range(self.count):
+                yield U64.unpack_from(self._map, self._index_offset + U64.size * i)[0]
+            return
+        offset = self._records_offset
+        for _ in range(self.count):
+            yield offset
+            offset += U32.size + U32.unpack_from(self._map, offset)[0]
+
+    def offset_at(self, index: int):
+        """Byte offset of the record at list ``index`` (0-based), or None."""
+        if not 0 <= index < self.count:
+            return None
+        if self._index_offset is None:
+            return next(islice(self.offsets(), index, None))
+        return U64.unpack_from(self._map, self._index_offset + U64.size * index)[0]
+
+    def find(self, task_id: int):
+        """Binary-search the id index for ``task_id``.
+
+        Returns:
+            tuple: ``(list index, byte offset)`` of its record, or None
+        """
+        if self._index_offset is None:
+            for index, offset in enumerate(self.offsets()):
+                if self.task_id(offset) == task_id:
+                    return index, offset
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            found, index = ID_ENTRY.unpack_from(self._map, self._ids_offset + ID_ENTRY.size * middle)
+            if found == task_id:
+                return index, self.offset_at(index)
+            if found < task_id:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def byte_range(self, offset: int) -> tuple:
+        """``(start, end)`` of the record at ``offset``, length prefix included."""
+        return offset, offset + U32.size + U32.unpack_from(self._map, offset)[0]
+
+    def task_id(self, offset: int) -> int:
+        """Id of the record at ``offset``, without decoding the rest."""
+        return struct.unpack_from("<q", self._map, offset + U32.size)[0]
+
+    def is_completed(self, offset: int) -> bool:
+        """Completed flag of the record at ``offset``, without decoding the rest."""
+        flags = self._map[offset + U32.size + FLAGS_AT]
+        return bool(flags & COMPLETED)
+
+    def decode(self, offset: int) -> dict:
+        """Decode the record at ``offset`` into a task dict."""
+        (length,) = U32.unpack_from(self._map, offset)
+        task_id, title, duration, flags, start, end, paused = RECORD.unpack_from(self._map, offset + U32.size)
+        task = {"id": task_id, "title": self.string(title), "completed": bool(flags & COMPLETED)}
+        if flags & HAS_START:
+            task["start_time"] = start
+        if flags & HAS_END:
+            task["end_time"] = end
+        if duration != NO_STRING:
+            task["duration"] = self.string(duration)
+        if flags & HAS_PAUSED:
+            task["paused_duration"] = paused
+        tail = offset + U32.size + RECORD.size
+        if length > RECORD.size:
+            task.update(json.loads(self._map[tail:offset + U32.size + length]))
+        return task
+
+    def __iter__(self):
+        for offset in self.offsets():
+            yield self.decode(offset)
+
+    def doc(self) -> dict:
+        """Decode the whole file into a task document."""
+        return {"next_id": self.next_id, "tasks": list(self), "stats": self.stats()}
+
+
+def read_doc(path: str) -> dict:
+    """Read a binary snapshot file into a task document."""
+    with SnapshotReader(path) as reader:
+        return reader.doc()
+
+
+def is_snapshot(path: str) -> bool:
+    """Whether ``path`` starts with the binary snapshot magic number."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
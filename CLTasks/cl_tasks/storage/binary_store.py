@@ -0,0 +1,111 @@
+import json
+import os
+from itertools import islice
+from cl_tasks.storage.file_store import FileTaskStore, FILE_PATH
+from cl_tasks.storage.locking import FileLock, atomic_write_bytes, file_version
+from cl_tasks.storage.ops import new_doc, load_doc
+from cl_tasks.storage.stats import is_current
+from cl_tasks.storage.binary_format import SnapshotReader, encode_doc, read_doc
+from cl_tasks.storage import query
+
+BINARY_PATH = os.path.expanduser("~/.taskcli_tasks.bin")
+
+
+class BinaryTaskStore(FileTaskStore):
+    """Task store kept in the compact binary format of ``binary_format``.
+
+    Writes work like the JSON store: load the whole document, apply the
+    operations and atomically replace the file. Reads that don't need the
+    whole document memory-map the file instead: listing decodes only the
+    records on the requested page, and looking one task up by position or
+    id goes through the file's index and decodes just that record.
+    """
+
+    def __init__(self, path: str = BINARY_PATH, legacy_path: str = FILE_PATH):
+        self.path = path
+        self._lock = FileLock(path)
+        self._loaded_version = None
+        self._cached = None
+        if not os.path.exists(self.path):
+            with self._lock(exclusive=True):
+                if not os.path.exists(self.path):
+                    # Seed from the plain JSON store, if there is one
+                    doc = new_doc()
+                    if legacy_path and os.path.exists(legacy_path):
+                        with open(legacy_path) as f:
+                            doc = load_doc(json.load(f))
+                    self._save_doc(doc)
+
+    def _read_doc(self):
+        # The binary format doesn't store the secondary indexes; rebuild them
+        return load_doc(read_doc(self.path))
+
+    def _save_doc(self, doc):
+        with self._lock(exclusive=True):
+            atomic_write_bytes(self.path, encode_doc(doc), expected_version=self._loaded_version)
+            self._loaded_version = file_version(self.path)
+            self._cached = (self._loaded_version, doc)
+
+    def _open_reader(self):
+        with self._lock():
+            return SnapshotReader(self.path)
+
+    def _current_doc(self):
+        """The cached document if the file hasn't changed since, else None."""
+        if self._cached is not None and self._cached[0] == self._source_version():
+            return self._cached[1]
+        return None
+
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        return list(self.iter_tasks(status, order, limit, offset, tag, project))
+
+    def iter_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        if query.has_filters(status, tag, project):
+            # Filters are answered from the indexes of the whole document
+            yield from super().iter_tasks(status, order, limit, offset, tag, project)
+            return
+        doc = self._current_doc()
+        if doc is not None:
+            yield from query.select_tasks(doc["tasks"], status, order, limit, offset)
+            return
+        query.check_query(status, order)
+        with self._open_reader() as reader:
+            # Filter on the records' flag bytes; only the page gets decoded
+            wanted = ("open", "completed") if order == "status" and status is None else (status,)
+            selected = (
+                (index + 1, record)
+                for state in wanted
+                for index, record in enumerate(reader.offsets())
+                if state is None or reader.is_completed(record) == (state == "completed")
+            )
+            stop = None if limit is None else offset + limit
+            for position, record in islice(selected, offset, stop):
+                yield dict(reader.decode(record), position=position)
+
+    def task_at(self, position: int):
+        doc = self._current_doc()
+        if doc is not None:
+            return super().task_at(position)
+        with self._open_reader() as reader:
+            record = reader.offset_at(position - 1)
+            return None if record is None else dict(reader.decode(record), position=position)
+
+    def get_task(self, task_id: int):
+        doc = self._current_doc()
+        if doc is not None:
+            return super().get_task(task_id)
+        with self._open_reader() as reader:
+            found = reader.find(task_id)
+            if found is None:
+                return None
+            index, record = found
+            return dict(reader.decode(record), position=index + 1)
+
+    def get_stats(self) -> dict:
+        doc = self._current_doc()
+        if doc is not None:
+            return doc["stats"]
+        with self._open_reader() as reader:
+            stats = reader.stats()
+        # Statistics counted an older way are recomputed on load
+        return stats if is_current(stats) else self._load_doc()["stats"]
@@ -0,0 +1,274 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from cl_tasks.storage.file_store import FileTaskStore
+from cl_tasks.storage.locking import FileLock, atomic_write_json
+from cl_tasks.storage.ops import apply_op, new_doc
+
+CACHE_PATH = os.path.expanduser("~/.taskcli_tasks.cache.json")
+OUTBOX_PATH = os.path.expanduser("~/.taskcli_tasks.outbox")
+
+# Pull from the remote store when the replica is older than this (seconds)
+CACHE_TTL = float(os.getenv("CLTASKS_CACHE_TTL", 30))
+# How long a command waits at exit for its changes to reach the remote
+SYNC_WAIT = float(os.getenv("CLTASKS_SYNC_WAIT", 2))
+# Conflicts kept for 'cltasks sync' to report
+MAX_CONFLICTS = 50
+
+
+def fingerprint(task: dict) -> str:
+    """Version token for a task as the remote store last returned it."""
+    import hashlib
+
+    fields = {name: value for name, value in task.items() if name not in ("position", "interval")}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class CachedTaskStore(FileTaskStore):
+    """Local write-through replica in front of a remote task store.
+
+    Reads are served from a JSON replica on disk, so they never wait on the
+    network. Each change is applied to the replica and appended, in the
+    same locked step, to a durable outbox file. A background thread then
+    pushes the outbox to the remote store and pulls the remote state back.
+    A command waits at most ``CLTASKS_SYNC_WAIT`` seconds for that on exit.
+    Whatever doesn't get through stays in the outbox for the next command,
+    so the CLI keeps working offline.
+
+    Tasks added locally get negative provisional ids until the remote
+    assigns real ones. The replica remembers a fingerprint of each task as
+    the remote last returned it. When an outbox entry is pushed and the
+    remote task no longer matches, the entry is recorded as a conflict.
+    A remote deletion wins (the local change is dropped). Any other local
+    change is applied on top of the remote version.
+
+    Args:
+        remote: Zero-argument callable returning the remote store; it is
+            only called when a sync actually runs
+        path: Replica file
+        outbox_path: Outbox file; its sync state lives next to it
+        ttl: Maximum age in seconds of the replica before a background pull
+    """
+
+    # The remote store logs the intervals and the running task as the outbox
+    # is pushed, with real ids; local ids would be left behind in the sidecar
+    logs_intervals = False
+    logs_current = False
+
+    def __init__(self, remote, path: str = CACHE_PATH, outbox_path: str = OUTBOX_PATH, ttl: float = CACHE_TTL):
+        super().__init__(path)
+        self._remote_factory = remote
+        self._remote = None
+        self.outbox_path = outbox_path
+        self.state_path = f"{outbox_path}.state.json"
+        self.ttl = ttl
+        self._outbox_lock = FileLock(outbox_path)
+        self._syncer = None
+
+        state = self._read_state()
+        if state["synced_at"] is None:
+            # First use: fill the replica before serving anything from it.
+            # Offline, start from an empty replica and catch up later.
+            self._sync_quietly()
+        elif self._pending() or time.time() - state["synced_at"] > ttl:
+            self._start_sync()
+
+    @property
+    def remote(self):
+        if self._remote is None:
+            self._remote = self._remote_factory()
+        return self._remote
+
+    # Sync state: how far the outbox has been pushed and what the remote holds
+
+    def _read_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"flushed_seq": 0, "id_map": {}, "versions": {}, "synced_at": None,
+                    "conflicts": [], "last_error": None}
+
+    def _write_state(self, state):
+        atomic_write_json(self.state_path, state)
+
+    def _read_outbox(self):
+        """Outbox records in order, skipping a torn final line."""
+        if not os.path.exists(self.outbox_path):
+            return []
+        records = []
+        with open(self.outbox_path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def _pending(self, state=None):
+        state = state or self._read_state()
+        return [record for record in self._read_outbox() if record["seq"] > state["flushed_seq"]]
+
+    # Local writes
+
+    def _apply(self, doc, op):
+        if op["op"] != "add":
+            return apply_op(doc, op)
+        # New tasks get a provisional negative id until the remote assigns one.
+        # It is kept on the op so replaying the outbox gives the same id. The
+        # key lets a push that lost its reply find the task it created.
+        cache = doc.setdefault("cache", {"next_local_id": -1})
+        op.setdefault("local_id", cache["next_local_id"])
+        op.setdefault("key", uuid.uuid4().hex)
+        cache["next_local_id"] = min(cache["next_local_id"], op["local_id"]) - 1
+        next_id = doc["next_id"]
+        doc["next_id"] = op["local_id"]
+        try:
+            return apply_op(doc, op)
+        finally:
+            doc["next_id"] = next_id
+
+    def _commit(self, doc, ops):
+        # Runs under the replica's exclusive lock, so outbox seqs stay ordered
+        with self._outbox_lock(exclusive=True):
+            last = self._read_outbox()
+            seq = last[-1]["seq"] if last else self._read_state()["flushed_seq"]
+            records = [dict(op, seq=seq + i + 1) for i, op in enumerate(ops)]
+            with open(self.outbox_path, "a") as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+                f.flush()
+                os.fsync(f.fileno())
+        self._save_doc(doc)
+        self._start_sync()
+
+    # Syncing with the remote store
+
+    def _start_sync(self):
+        if self._syncer is not None and self._syncer.is_alive():
+            return
+        self._syncer = threading.Thread(target=self._sync_quietly, name="cltasks-sync", daemon=True)
+        self._syncer.start()
+        atexit.register(self._syncer.join, SYNC_WAIT)
+
+    def _sync_quietly(self):
+        try:
+            self.sync()
+        except Exception:
+            pass  # Recorded in the state file; the next command retries
+
+    def sync(self) -> dict:
+        """Push the outbox to the remote store, then refresh the replica.
+
+        Returns:
+            dict: ``pushed`` (operations sent), ``conflicts`` (new conflict
+            messages) and ``error`` (why the sync stopped early, or None)
+        """
+        report = {"pushed": 0, "conflicts": [], "error": None}
+        try:
+            with self._outbox_lock(exclusive=True):
+                state = self._read_state()
+                for record in self._pending(state):
+                    conflict = self._push(record, state)
+                    if conflict:
+                        report["conflicts"].append(conflict)
+                        state["conflicts"] = (state["conflicts"] + [conflict])[-MAX_CONFLICTS:]
+                    state["flushed_seq"] = record["seq"]
+                    report["pushed"] += 1
+                    self._write_state(state)
+                flushed_seq = state["flushed_seq"]
+            # Fetch without holding any lock, so local commands aren't held up
+            tasks = [
+                {name: value for name, value in task.items() if name != "position"}
+                for task in self.remote.list_tasks()
+            ]
+        except Exception as e:
+            report["error"] = f"{type(e).__name__}: {e}"
+            with self._outbox_lock(exclusive=True):
+                state = self._read_state()
+                state["last_error"] = report["error"]
+                self._write_state(state)
+            raise
+        # Same lock order as local writes: the replica, then the outbox
+        with self._lock(exclusive=True), self._outbox_lock(exclusive=True):
+            state = self._read_state()
+            if state["flushed_seq"] == flushed_seq:
+                # Otherwise another sync pushed more since; its pull is newer
+                self._rebuild(tasks, state)
+            state["last_error"] = None
+            self._write_state(state)
+            self._trim_outbox(state)
+        return report
+
+    def _push(self, record, state):
+        """Send one outbox record to the remote; return a conflict message or None."""
+        op = {name: value for name, value in record.items() if name not in ("seq", "local_id")}
+        if op["op"] == "add":
+            added = None
+            if state.get("in_flight") == record["seq"] and record.get("key"):
+                # The last push of this add was cut off and may have landed
+                added = self.remote.task_added_by(record["key"])
+            if added is None:
+                # Saved first, so a retry knows to look before adding again
+                state["in_flight"] = record["seq"]
+                self._write_state(state)
+                added = self.remote.apply_batch([op])[0]
+            state.pop("in_flight", None)
+            state["id_map"][str(record["local_id"])] = added["id"]
+            state["versions"][str(added["id"])] = fingerprint(added)
+            return None
+
+        task_id = state["id_map"].get(str(op["id"]), op["id"])
+        op["id"] = task_id
+        current = self.remote.get_task(task_id)
+        if current is None:
+            return f"Task {task_id} was deleted remotely; dropped local '{op['op']}'"
+        conflict = None
+        known = state["versions"].get(str(task_id))
+        if known is not None and known != fingerprint(current):
+            conflict = f"Task {task_id} changed remotely; applied local '{op['op']}' on top"
+        result = self.remote.apply_batch([op])[0]
+        if result:
+            state["versions"][str(task_id)] = fingerprint(result)
+        return conflict
+
+    def _rebuild(self, tasks, state):
+        """Replace the replica with the remote ``tasks`` plus any unpushed changes."""
+        state["versions"] = {str(task["id"]): fingerprint(task) for task in tasks}
+        state["synced_at"] = time.time()
+        try:
+            cache = self._load_doc().get("cache", {"next_local_id": -1})
+        except (OSError, ValueError):
+            cache = {"next_local_id": -1}
+        doc = new_doc(tasks)
+        doc["cache"] = cache
+        for record in self._pending(state):
+            op = dict(record)
+            if "id" in op:
+                op["id"] = state["id_map"].get(str(op["id"]), op["id"])
+            self._apply(doc, op)
+        self._save_doc(doc)
+
+    def _trim_outbox(self, state):
+        """Drop records that reached the remote (called under the outbox lock)."""
+        pending = self._pending(state)
+        tmp_path = f"{self.outbox_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in pending))
+        os.replace(tmp_path, self.outbox_path)
+        # Local ids can be forgotten once nothing refers to them
+        if not pending:
+            state["id_map"] = {}
+            self._write_state(state)
+
+    def sync_status(self) -> dict:
+        """``pending`` outbox count, ``synced_at``, recent ``conflicts`` and ``last_error``."""
+        state = self._read_state()
+        return {
+            "pending": len(self._pending(state)),
+            "synced_at": state["synced_at"],
+            "conflicts": state["conflicts"],
+            "last_error": state["last_error"],
+        }
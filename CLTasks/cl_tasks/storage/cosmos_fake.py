@@ -0,0 +1,287 @@
+# cl_tasks/storage/cosmos_fake.py
+"""
+In-process stand-in for an Azure Cosmos DB container.
+
+``FakeContainer`` implements the part of ``azure.cosmos.ContainerProxy``
+that :class:`~cl_tasks.storage.cosmos_store.CosmosTaskStore` uses (point
+reads and writes, patches, transactional batches, and paged queries), so the
+store can be exercised offline::
+
+    store = CosmosTaskStore(container=FakeContainer(), user="alice")
+
+Queries are limited to the SQL shapes the store issues: ``SELECT *``,
+``SELECT VALUE COUNT(1)``, ``SELECT VALUE MAX(c.f)`` or a field list,
+``WHERE`` clauses of ``c.f <op> @param`` joined with ``AND``,
+``ORDER BY`` and ``OFFSET ... LIMIT``.
+
+Every request is recorded in ``metrics``: the request count, an estimate
+of the request units (RU) it would cost, and a simulated round-trip
+latency. Nothing actually sleeps unless ``sleep=True``.
+"""
+
+import copy
+import operator
+import re
+import time
+
+# Rough request-unit costs, close to what Cosmos charges for small items
+RU_COST = {
+    "read": 1.0,
+    "create": 5.7,
+    "upsert": 5.7,
+    "replace": 6.3,
+    "patch": 6.3,
+    "delete": 5.5,
+    "query": 2.8,
+}
+# Extra RU per item a query returns
+RU_PER_QUERY_ITEM = 0.05
+# Cosmos rejects transactional batches with more operations than this
+MAX_BATCH_OPERATIONS = 100
+# ...and patches with none or more than this
+MAX_PATCH_OPERATIONS = 10
+
+
+class FakeCosmosError(Exception):
+    """Error carrying an HTTP-style ``status_code`` like the SDK's exceptions."""
+
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(message or f"Request failed with status {status_code}")
+        self.status_code = status_code
+
+
+class _BatchFailed(FakeCosmosError):
+    def __init__(self, status_code, error_index):
+        super().__init__(status_code, f"Batch operation {error_index} failed with status {status_code}")
+        self.error_index = error_index
+
+
+_COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_QUERY = re.compile(
+    r"^SELECT\s+(?P<select>.+?)\s+FROM\s+c"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+(?P<order>.+?))?"
+    r"(?:\s+OFFSET\s+(?P<offset>\S+)\s+LIMIT\s+(?P<limit>\S+))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION = re.compile(r"^c\.(\w+)\s*(=|!=|<=|>=|<|>)\s*(\S+)$")
+
+
+class FakePager:
+    """Mimics ``azure.core.paging.ItemPaged`` for query results."""
+
+    def __init__(self, container, items, max_item_count):
+        self._container = container
+        self._items = items
+        self._page_size = max_item_count or 100
+        self.continuation_token = None
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+    def by_page(self, continuation_token=None):
+        start = int(continuation_token or 0)
+        while True:
+            page = self._items[start:start + self._page_size]
+            start += len(page)
+            self.continuation_token = str(start) if start < len(self._items) else None
+            # Even an empty result costs a round trip
+            self._container._record("query", len(page))
+            yield iter(page)
+            if self.continuation_token is None:
+                return
+
+
+class FakeContainer:
+    """A single container partitioned on ``partition_key_path``.
+
+    Args:
+        partition_key_path: Document field the items are partitioned on
+        latency_ms: Simulated round-trip time of each request
+        sleep: Whether to actually wait ``latency_ms`` per request
+    """
+
+    def __init__(self, partition_key_path: str = "/userId", latency_ms: float = 5.0, sleep: bool = False):
+        self.partition_key_field = partition_key_path.lstrip("/")
+        self.latency_ms = latency_ms
+        self.sleep = sleep
+        self._partitions = {}
+        self._etag = 0
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.metrics = {"requests": 0, "request_charge": 0.0, "latency_ms": 0.0}
+
+    def _record(self, kind, items=0, charge=None):
+        self.metrics["requests"] += 1
+        if charge is None:
+            charge = RU_COST[kind] + RU_PER_QUERY_ITEM * items
+        self.metrics["request_charge"] += charge
+        self.metrics["latency_ms"] += self.latency_ms
+        if self.sleep:
+            time.sleep(self.latency_ms / 1000)
+
+    def _partition(self, partition_key):
+        return self._partitions.setdefault(partition_key, {})
+
+    def _stamp(self, body):
+        self._etag += 1
+        body["_etag"] = f'"{self._etag}"'
+        return copy.deepcopy(body)
+
+    # Single-item operations, applied to a partition without recording metrics
+
+    def _create(self, items, body):
+        if body["id"] in items:
+            raise FakeCosmosError(409, f"Item {body['id']} already exists")
+        items[body["id"]] = self._stamp(copy.deepcopy(body))
+        return copy.deepcopy(items[body["id"]])
+
+    def _upsert(self, items, body):
+        items[body["id"]] = self._stamp(copy.deepcopy(body))
+        return copy.deepcopy(items[body["id"]])
+
+    def _check(self, items, item, if_match_etag):
+        if item not in items:
+            raise FakeCosmosError(404, f"Item {item} not found")
+        if if_match_etag is not None and items[item]["_etag"] != if_match_etag:
+            raise FakeCosmosError(412, f"Item {item} was changed by another request")
+
+    def _replace(self, items, item, body, if_match_etag=None):
+        self._check(items, item, if_match_etag)
+        items[item] = self._stamp(copy.deepcopy(body))
+        return copy.deepcopy(items[item])
+
+    def _patch(self, items, item, patch_operations, if_match_etag=None):
+        if not 1 <= len(patch_operations) <= MAX_PATCH_OPERATIONS:
+            raise FakeCosmosError(400, f"A patch must hold 1 to {MAX_PATCH_OPERATIONS} operations")
+        self._check(items, item, if_match_etag)
+        body = copy.deepcopy(items[item])
+        for patch in patch_operations:
+            field = patch["path"].lstrip("/")
+            if patch["op"] in ("set", "add", "replace"):
+                body[field] = patch["value"]
+            elif patch["op"] == "remove":
+                body.pop(field, None)
+            elif patch["op"] == "incr":
+                body[field] = body.get(field, 0) + patch["value"]
+            else:
+                raise FakeCosmosError(400, f"Unsupported patch operation {patch['op']!r}")
+        items[item] = self._stamp(body)
+        return copy.deepcopy(items[item])
+
+    def _delete(self, items, item, if_match_etag=None):
+        self._check(items, item, if_match_etag)
+        del items[item]
+
+    # The ContainerProxy API
+
+    def read_item(self, item, partition_key):
+        self._record("read")
+        items = self._partition(partition_key)
+        if item not in items:
+            raise FakeCosmosError(404, f"Item {item} not found")
+        return copy.deepcopy(items[item])
+
+    def create_item(self, body):
+        self._record("create")
+        return self._create(self._partition(body[self.partition_key_field]), body)
+
+    def upsert_item(self, body):
+        self._record("upsert")
+        return self._upsert(self._partition(body[self.partition_key_field]), body)
+
+    def replace_item(self, item, body, if_match_etag=None, **kwargs):
+        self._record("replace")
+        return self._replace(self._partition(body[self.partition_key_field]), item, body, if_match_etag)
+
+    def patch_item(self, item, partition_key, patch_operations, if_match_etag=None, **kwargs):
+        self._record("patch")
+        return self._patch(self._partition(partition_key), item, patch_operations, if_match_etag)
+
+    def delete_item(self, item, partition_key, if_match_etag=None, **kwargs):
+        self._record("delete")
+        self._delete(self._partition(partition_key), item, if_match_etag)
+
+    def execute_item_batch(self, batch_operations, partition_key, **kwargs):
+        """Run ``batch_operations`` atomically: all of them apply or none do.
+
+        Operations use the SDK's tuple form, e.g. ``("create", (body,))`` or
+        ``("replace", (item, body), {"if_match_etag": etag})``.
+        """
+        if len(batch_operations) > MAX_BATCH_OPERATIONS:
+            raise FakeCosmosError(400, f"A batch may hold at most {MAX_BATCH_OPERATIONS} operations")
+        items = self._partition(partition_key)
+        working = copy.deepcopy(items)
+        results = []
+        for index, operation in enumerate(batch_operations):
+            kind, args = operation[0], operation[1]
+            kwargs = operation[2] if len(operation) > 2 else {}
+            try:
+                if kind == "read":
+                    if args[0] not in working:
+                        raise FakeCosmosError(404)
+                    results.append(copy.deepcopy(working[args[0]]))
+                else:
+                    results.append(getattr(self, f"_{kind}")(working, *args, **kwargs))
+            except FakeCosmosError as e:
+                self._record("query")  # A failed batch is still billed
+                raise _BatchFailed(e.status_code, index)
+        # One round trip, billed for every operation in it
+        self._record("batch", charge=sum(RU_COST[kind] for kind, *_ in batch_operations))
+        items.clear()
+        items.update(working)
+        return results
+
+    def query_items(self, query, parameters=None, partition_key=None, max_item_count=None, **kwargs):
+        match = _QUERY.match(query.strip())
+        if match is None:
+            raise FakeCosmosError(400, f"Query not supported by the fake: {query}")
+        values = {p["name"]: p["value"] for p in parameters or []}
+
+        def value(token):
+            return values[token] if token.startswith("@") else int(token)
+
+        if partition_key is None:
+            items = [item for partition in self._partitions.values() for item in partition.values()]
+        else:
+            items = list(self._partition(partition_key).values())
+
+        if match["where"]:
+            for condition in re.split(r"\s+AND\s+", match["where"], flags=re.IGNORECASE):
+                parsed = _CONDITION.match(condition.strip())
+                if parsed is None:
+                    raise FakeCosmosError(400, f"Condition not supported by the fake: {condition}")
+                field, comparison, token = parsed.groups()
+                wanted, compare = value(token), _COMPARISONS[comparison]
+                items = [item for item in items if field in item and compare(item[field], wanted)]
+
+        if match["order"]:
+            # Sort by the last key first so earlier keys take precedence
+            for key in reversed([k.strip() for k in match["order"].split(",")]):
+                field, _, direction = key.partition(" ")
+                items.sort(key=lambda item: item[field[2:]], reverse=direction.strip().upper() == "DESC")
+
+        if match["offset"]:
+            start = value(match["offset"])
+            items = items[start:start + value(match["limit"])]
+
+        select = match["select"].strip()
+        if select.upper() == "VALUE COUNT(1)":
+            items = [len(items)]
+        elif select.upper().startswith("VALUE MAX("):
+            field = select[len("VALUE MAX(c."):-1]
+            items = [max(item[field] for item in items)] if items else []
+        elif select != "*":
+            fields = [f.strip()[2:] for f in select.split(",")]
+            items = [{f: item[f] for f in fields if f in item} for item in items]
+        return FakePager(self, copy.deepcopy(items), max_item_count)
@@ -1,17 +1,402 @@
+import copy
+import getpass
+import os
 from cl_tasks.storage.base import TaskStore
+from cl_tasks.storage.ops import new_op, new_add_op, apply_op, check_op, normalize_tags
+from cl_tasks.storage.stats import new_stats, compute_stats, is_current
+from cl_tasks.storage import intervals, query
+from cl_tasks import current, trace
+
+COSMOS_ENDPOINT = os.getenv("COSMOS_ENDPOINT")
+COSMOS_KEY = os.getenv("COSMOS_KEY")
+COSMOS_DATABASE = os.getenv("COSMOS_DATABASE", "cltasks")
+COSMOS_CONTAINER = os.getenv("COSMOS_CONTAINER", "tasks")
+
+# Same spacing as the SQLite store's ranks
+RANK_GAP = 1024.0
+# Items fetched per round trip when listing
+PAGE_SIZE = 100
+# Cosmos caps a transactional batch at 100 operations
+MAX_BATCH_OPERATIONS = 100
+# ...and a patch at 10 operations
+MAX_PATCH_OPERATIONS = 10
+# Retries when another client changed the user's tasks mid-operation
+MAX_WRITE_ATTEMPTS = 5
+
+META_ID = "meta"
+# Bookkeeping fields on a task item that aren't part of the task
+ITEM_FIELDS = {"id", "userId", "type", "taskId", "rank", "addKey"}
+
+# One client and container proxy per account for the whole process
+_CLIENTS = {}
+_CONTAINERS = {}
+
+
+def get_container(endpoint=None, key=None, database=None, container=None):
+    """Return a container proxy, reusing the process-wide client for the account.
+
+    Creates the database and container (partitioned on ``/userId``) if they
+    don't exist yet. Needs the optional ``azure-cosmos`` package.
+    """
+    endpoint = endpoint or COSMOS_ENDPOINT
+    key = key or COSMOS_KEY
+    database = database or COSMOS_DATABASE
+    container = container or COSMOS_CONTAINER
+    if not endpoint or not key:
+        raise RuntimeError("Set COSMOS_ENDPOINT and COSMOS_KEY to use the Cosmos store")
+
+    cache_key = (endpoint, database, container)
+    if cache_key not in _CONTAINERS:
+        try:
+            from azure.cosmos import CosmosClient, PartitionKey
+        except ImportError:
+            raise RuntimeError(
+                "The Cosmos store needs the azure-cosmos package: pip install 'taskcli[cosmos]'"
+            )
+        if (endpoint, key) not in _CLIENTS:
+            _CLIENTS[(endpoint, key)] = CosmosClient(endpoint, credential=key)
+        db = _CLIENTS[(endpoint, key)].create_database_if_not_exists(database)
+        _CONTAINERS[cache_key] = db.create_container_if_not_exists(
+            id=container, partition_key=PartitionKey(path="/userId")
+        )
+    return _CONTAINERS[cache_key]
+
+
+def _status_of(error):
+    return getattr(error, "status_code", None)
+
+
+def _patch_operations(before: dict, after: dict) -> list:
+    """Patch operations turning task ``before`` into ``after``."""
+    patches = [
+        {"op": "set", "path": f"/{name}", "value": value}
+        for name, value in after.items()
+        if name != "position" and before.get(name, object()) != value
+    ]
+    patches += [{"op": "remove", "path": f"/{name}"} for name in before if name not in after]
+    return patches
+
+
+class _RankedTasks:
+    """Re-iterable view of a store's tasks in list order, fetched page by page."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __iter__(self):
+        for item in self.store._query("SELECT * FROM c WHERE c.type = @type ORDER BY c.rank", type="task"):
+            yield self.store._to_task(item)
+
 
 class CosmosTaskStore(TaskStore):
-    def add_task(self, title: str, position: int = None):
-        raise NotImplementedError("Cosmos not yet implemented")
+    """Task store backed by an Azure Cosmos DB container.
+
+    Each user's tasks live in their own logical partition (``userId``), next
+    to a ``meta`` item holding the next task id and the statistics. Every
+    change is one transactional batch that updates the task and the meta
+    item together, guarded by the meta item's ETag so concurrent clients
+    retry instead of overwriting each other. List order uses gap ranks like
+    the SQLite store, so a reorder is usually a single patch; when a gap
+    runs out the ranks are respaced in batches of patches.
+
+    Args:
+        container: A container proxy; by default the one configured by the
+            ``COSMOS_*`` environment variables. Pass a
+            ``cosmos_fake.FakeContainer`` to run offline.
+        user: Partition key value; defaults to ``CLTASKS_USER`` or the
+            login name
+        list_name: Named task list to hold; its tasks get a partition of
+            their own, ``<user>:<list>``
+    """
+
+    def __init__(self, container=None, user: str = None, list_name: str = None):
+        self.container = container if container is not None else get_container()
+        self.user = user or os.getenv("CLTASKS_USER") or getpass.getuser()
+        if list_name is not None:
+            self.user = f"{self.user}:{list_name}"
+
+    def _read_meta(self):
+        try:
+            meta = self.container.read_item(META_ID, partition_key=self.user)
+        except Exception as e:
+            if _status_of(e) != 404:
+                raise
+        else:
+            return meta if is_current(meta["stats"]) else self._recount(meta)
+        meta = {"id": META_ID, "userId": self.user, "type": "meta", "next_id": 1, "stats": new_stats()}
+        try:
+            return self.container.create_item(meta)
+        except Exception as e:
+            if _status_of(e) != 409:
+                raise
+            # Another client created it first
+            return self.container.read_item(META_ID, partition_key=self.user)
+
+    def _recount(self, meta):
+        """Recompute statistics counted an older way and store them."""
+        meta = dict(meta, stats=compute_stats(self._to_task(item) for item in self._query(
+            "SELECT * FROM c WHERE c.type = @type", type="task"
+        )))
+        try:
+            return self.container.replace_item(META_ID, meta, if_match_etag=meta["_etag"])
+        except Exception as e:
+            if _status_of(e) != 412:
+                raise
+            # Another client changed the meta item first; use its version
+            return self._read_meta()
+
+    def _read_item(self, task_id):
+        try:
+            return self.container.read_item(str(task_id), partition_key=self.user)
+        except Exception as e:
+            if _status_of(e) != 404:
+                raise
+            return None
+
+    def _query(self, sql, page_size=PAGE_SIZE, **parameters):
+        """Yield the results of ``sql`` in this user's partition, page by page."""
+        pages = self.container.query_items(
+            query=sql,
+            parameters=[{"name": f"@{name}", "value": value} for name, value in parameters.items()],
+            partition_key=self.user,
+            max_item_count=page_size,
+        ).by_page()
+        for page in pages:
+            yield from page
+
+    def _scalar(self, sql, **parameters):
+        return next(iter(self._query(sql, **parameters)), None)
+
+    def _to_task(self, item, position=None):
+        task = {name: value for name, value in item.items() if name not in ITEM_FIELDS and not name.startswith("_")}
+        task["id"] = item["taskId"]
+        if position is not None:
+            task["position"] = position
+        return task
+
+    def _position_of(self, rank):
+        return self._scalar(
+            "SELECT VALUE COUNT(1) FROM c WHERE c.type = @type AND c.rank < @rank",
+            type="task", rank=rank,
+        ) + 1
 
-    def list_tasks(self):
-        raise NotImplementedError("Cosmos not yet implemented")
+    def _rank_for_position(self, position, exclude_id=None):
+        """Pick a rank that places a task at ``position``; see the SQLite store."""
+        exclude = str(exclude_id) if exclude_id is not None else ""
+        if position is not None and position >= 1:
+            neighbours = [item["rank"] for item in self._query(
+                "SELECT c.rank FROM c WHERE c.type = @type AND c.id != @exclude "
+                "ORDER BY c.rank OFFSET @offset LIMIT 2",
+                type="task", exclude=exclude, offset=max(position - 2, 0),
+            )]
+            if position == 1:
+                return neighbours[0] - RANK_GAP if neighbours else 0.0
+            if len(neighbours) == 2:
+                rank = (neighbours[0] + neighbours[1]) / 2
+                if neighbours[0] < rank < neighbours[1]:
+                    return rank
+                self._rebalance()
+                return self._rank_for_position(position, exclude_id)
+
+        last = self._scalar(
+            "SELECT VALUE MAX(c.rank) FROM c WHERE c.type = @type AND c.id != @exclude",
+            type="task", exclude=exclude,
+        )
+        return 0.0 if last is None else last + RANK_GAP
+
+    def _rebalance(self):
+        """Respace every rank evenly, one transactional batch per 100 tasks."""
+        ids = [item["id"] for item in self._query(
+            "SELECT c.id FROM c WHERE c.type = @type ORDER BY c.rank", type="task"
+        )]
+        for start in range(0, len(ids), MAX_BATCH_OPERATIONS):
+            batch = [
+                ("patch", (item_id, [{"op": "set", "path": "/rank", "value": (start + i) * RANK_GAP}]))
+                for i, item_id in enumerate(ids[start:start + MAX_BATCH_OPERATIONS])
+            ]
+            self.container.execute_item_batch(batch_operations=batch, partition_key=self.user)
+
+    def _execute(self, op):
+        """Apply one operation as a single transactional batch.
+
+        The operation runs through ``ops.apply_op`` on a one-task document
+        built from the task's item and the meta item, so the task fields
+        and statistics change exactly as in the file stores.
+        """
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            with trace.phase("store.load"):
+                meta = self._read_meta()
+                item = self._read_item(op["id"]) if "id" in op else None
+            if "id" in op and item is None:
+                return None
+            before = self._to_task(item) if item else None
+            doc = {
+                "next_id": meta["next_id"],
+                "tasks": [dict(before)] if before else [],
+                "stats": copy.deepcopy(meta["stats"]),
+            }
+            result = apply_op(doc, dict(op, position=None) if op["op"] == "add" else op)
+            if not result:
+                return None
+
+            batch = []
+            if (doc["next_id"], doc["stats"]) != (meta["next_id"], meta["stats"]):
+                new_meta = dict(meta, next_id=doc["next_id"], stats=doc["stats"])
+                batch.append(("replace", (META_ID, new_meta), {"if_match_etag": meta["_etag"]}))
+            if op["op"] == "add":
+                rank = self._rank_for_position(op.get("position"))
+                task = doc["tasks"][0]
+                new_item = dict(task, id=str(task["id"]), taskId=task["id"], userId=self.user, type="task", rank=rank)
+                if op.get("key"):
+                    # Lets task_added_by find it if the reply gets lost
+                    new_item["addKey"] = op["key"]
+                batch.append(("create", (new_item,)))
+            elif op["op"] == "delete":
+                rank = item["rank"]
+                batch.append(("delete", (item["id"],)))
+            else:
+                rank = item["rank"]
+                # Nothing is sent for a change that leaves the task as it was,
+                # e.g. a tag it already has; Cosmos rejects empty patches
+                patches = _patch_operations(before, doc["tasks"][0])
+                for start in range(0, len(patches), MAX_PATCH_OPERATIONS):
+                    chunk = patches[start:start + MAX_PATCH_OPERATIONS]
+                    if start == 0:
+                        batch.append(("patch", (item["id"], chunk), {"if_match_etag": item["_etag"]}))
+                    else:
+                        batch.append(("patch", (item["id"], chunk)))
+
+            position = self._position_of(rank)
+            try:
+                if batch:
+                    with trace.phase("store.save"):
+                        self.container.execute_item_batch(batch_operations=batch, partition_key=self.user)
+            except Exception as e:
+                if _status_of(e) in (409, 412):
+                    continue  # Someone else changed the tasks; start over
+                raise
+            result = dict(result, position=position)
+            with trace.phase("store.log"):
+                current.record([op], [result], list_name=self.list_name)
+                intervals.record([op], [result], self.intervals_path)
+            return result
+        raise RuntimeError(f"Gave up on '{op['op']}' after {MAX_WRITE_ATTEMPTS} attempts")
+
+    def add_task(self, title: str, position: int = None, tags=None, project: str = None):
+        return self._execute(new_add_op(title, position, tags, project))
+
+    def tag_task(self, task_id: int, add=(), remove=()):
+        return self._execute(new_op("tag", id=task_id, add=normalize_tags(add), remove=normalize_tags(remove)))
+
+    def set_project(self, task_id: int, project: str = None):
+        return self._execute(new_op("project", id=task_id, project=project))
+
+    def start_task(self, task_id: int):
+        return self._execute(new_op("start", id=task_id))
+
+    def pause_task(self, task_id: int):
+        """Pause a task and record the paused duration.
+
+        Args:
+            task_id: The ID of the task to pause
+
+        Returns:
+            The paused task, or None if it wasn't running
+        """
+        return self._execute(new_op("pause", id=task_id))
 
     def complete_task(self, task_id: int):
-        raise NotImplementedError("Cosmos not yet implemented")
-        
+        return self._execute(new_op("complete", id=task_id))
+
     def delete_task(self, task_id: int):
-        raise NotImplementedError("Cosmos not yet implemented")
-        
+        return self._execute(new_op("delete", id=task_id))
+
     def reorder_task(self, task_id: int, new_position: int):
-        raise NotImplementedError("Cosmos not yet implemented")
+        """Reorder a task to a new position.
+
+        Args:
+            task_id: ID of the task to reorder
+            new_position: New position to move the task to (1-based)
+
+        Returns:
+            The moved task with its new position, or None if not found
+        """
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            item = self._read_item(task_id)
+            if item is None:
+                return None
+            rank = self._rank_for_position(new_position, exclude_id=task_id)
+            try:
+                self.container.patch_item(
+                    item["id"], partition_key=self.user,
+                    patch_operations=[{"op": "set", "path": "/rank", "value": rank}],
+                    if_match_etag=item["_etag"],
+                )
+            except Exception as e:
+                if _status_of(e) == 412:
+                    continue
+                raise
+            return self._to_task(item, self._position_of(rank))
+        raise RuntimeError(f"Gave up reordering task {task_id} after {MAX_WRITE_ATTEMPTS} attempts")
+
+    def apply_batch(self, ops):
+        """Run ``ops`` one transactional batch at a time.
+
+        Unlike the default, each operation keeps its own ``at`` timestamp,
+        so changes made offline and pushed later are timed correctly.
+        """
+        ops = [check_op(op) for op in ops]
+        return [
+            self.reorder_task(op["id"], op["position"]) if op["op"] == "reorder" else self._execute(op)
+            for op in ops
+        ]
+
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        return list(self.iter_tasks(status, order, limit, offset, tag, project))
+
+    def iter_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        query.check_query(status, order)
+        if status is None and order == "position" and tag is None and project is None:
+            # The page is cut server-side; positions follow from the offset
+            sql = "SELECT * FROM c WHERE c.type = @type ORDER BY c.rank"
+            params = {"type": "task"}
+            if limit is not None or offset:
+                sql += " OFFSET @offset LIMIT @limit"
+                params.update(offset=offset, limit=limit if limit is not None else 2 ** 31 - 1)
+            for i, item in enumerate(self._query(sql, **params)):
+                yield self._to_task(item, offset + i + 1)
+            return
+        # Positions count every task, so filtered listings stream all tasks
+        # in rank order and stop fetching pages once the page is filled
+        yield from query.select_tasks(_RankedTasks(self), status, order, limit, offset, tag, project)
+
+    def count_tasks(self, status=None, tag=None, project=None) -> int:
+        query.check_query(status, "position")
+        if query.has_filters(status, tag, project):
+            return sum(1 for _ in self.iter_tasks(status, tag=tag, project=project))
+        stats = self.get_stats()
+        if status == "open":
+            return stats["total"] - stats["completed"]
+        return stats["completed" if status == "completed" else "total"]
+
+    def get_stats(self) -> dict:
+        return self._read_meta()["stats"]
+
+    def get_task(self, task_id: int):
+        item = self._read_item(task_id)
+        return self._to_task(item, self._position_of(item["rank"])) if item else None
+
+    def task_added_by(self, key: str):
+        item = self._scalar(
+            "SELECT * FROM c WHERE c.type = @type AND c.addKey = @key", type="task", key=key
+        )
+        return self._to_task(item, self._position_of(item["rank"])) if item else None
+
+    def task_at(self, position: int):
+        if position < 1:
+            return None
+        item = self._scalar(
+            "SELECT * FROM c WHERE c.type = @type ORDER BY c.rank OFFSET @offset LIMIT 1",
+            type="task", offset=position - 1,
+        )
+        return self._to_task(item, position) if item else None
@@ -0,0 +1,219 @@
+# cl_tasks/storage/daemon.py
+"""
+Long-running task server and its client.
+
+``cltasks daemon start`` runs :func:`serve` in the background. It keeps a
+:class:`~cl_tasks.storage.journal_store.JournalTaskStore` loaded in memory
+and answers requests on a Unix domain socket (``~/.taskcli.sock``, or
+``CLTASKS_SOCKET``). Changes still go to the journal, so nothing is lost
+if the daemon stops, and other processes using the journal files directly
+stay in step with it.
+
+While the daemon is up, ``get_store`` hands commands a
+:class:`DaemonClient` instead of a store. Each call becomes one request
+over the socket, so a command doesn't parse the task files at all. When
+no daemon answers, ``get_store`` falls back to opening the journal files
+directly.
+
+The protocol is one JSON object per line each way. A request is
+``{"method": ..., "args": [...]}``. A reply is ``{"result": ...}`` or
+``{"error": {"type": ..., "message": ...}}``.
+
+This module imports only the standard library until :func:`serve` runs,
+so connecting stays cheap.
+"""
+
+import json
+import os
+import socket
+from cl_tasks.storage.base import TaskStore
+from cl_tasks import trace
+
+SOCKET_PATH = os.path.expanduser(os.getenv("CLTASKS_SOCKET", "~/.taskcli.sock"))
+
+# How long a client waits for the daemon to accept before using the files
+CONNECT_TIMEOUT = 0.2
+
+# Store methods the daemon serves; everything else is refused
+METHODS = {
+    "add_task", "start_task", "pause_task", "complete_task", "delete_task",
+    "reorder_task", "tag_task", "set_project", "list_tasks", "count_tasks", "get_stats", "get_task",
+    "task_at", "apply_batch", "archive_tasks", "search_tasks", "reindex",
+}
+# Exceptions re-raised as themselves on the client side
+ERRORS = {error.__name__: error for error in (ValueError, KeyError, NotImplementedError)}
+
+
+class DaemonError(Exception):
+    """Raised by the client when the daemon fails or can't be reached."""
+
+
+class DaemonClient(TaskStore):
+    """Task store that forwards every call to a running daemon.
+
+    Use :func:`connect` to get one; it returns None when no daemon answers.
+
+    Attributes:
+        path: The daemon store's snapshot path, so archives are found next to it
+        pid: Process id of the daemon
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        info = self._call("ping")
+        self.path = info["path"]
+        self.pid = info["pid"]
+
+    def _call(self, method, *args):
+        try:
+            with trace.phase(f"daemon.{method}"):
+                self._sock.sendall(json.dumps({"method": method, "args": args}).encode("utf-8") + b"\n")
+                line = self._reader.readline()
+        except OSError as e:
+            raise DaemonError(f"Lost connection to the task daemon: {e}") from e
+        if not line:
+            raise DaemonError("The task daemon closed the connection")
+        reply = json.loads(line)
+        if "error" in reply:
+            error = reply["error"]
+            raise ERRORS.get(error["type"], DaemonError)(error["message"])
+        return reply["result"]
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def shutdown(self):
+        """Ask the daemon to exit once it has answered."""
+        self._call("shutdown")
+
+    def add_task(self, title: str, position: int = None, tags=None, project: str = None):
+        return self._call("add_task", title, position, tags, project)
+
+    def start_task(self, task_id: int):
+        return self._call("start_task", task_id)
+
+    def pause_task(self, task_id: int):
+        return self._call("pause_task", task_id)
+
+    def complete_task(self, task_id: int):
+        return self._call("complete_task", task_id)
+
+    def delete_task(self, task_id: int):
+        return self._call("delete_task", task_id)
+
+    def reorder_task(self, task_id: int, new_position: int):
+        return self._call("reorder_task", task_id, new_position)
+
+    def tag_task(self, task_id: int, add=(), remove=()):
+        return self._call("tag_task", task_id, list(add), list(remove))
+
+    def set_project(self, task_id: int, project: str = None):
+        return self._call("set_project", task_id, project)
+
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        return self._call("list_tasks", status, order, limit, offset, tag, project)
+
+    def count_tasks(self, status=None, tag=None, project=None) -> int:
+        return self._call("count_tasks", status, tag, project)
+
+    def get_stats(self) -> dict:
+        return self._call("get_stats")
+
+    def get_task(self, task_id: int):
+        return self._call("get_task", task_id)
+
+    def task_at(self, position: int):
+        return self._call("task_at", position)
+
+    def apply_batch(self, ops):
+        return self._call("apply_batch", list(ops))
+
+    def archive_tasks(self, completed_before: float) -> int:
+        return self._call("archive_tasks", completed_before)
+
+    def search_tasks(self, query: str, limit=None):
+        return self._call("search_tasks", query, limit)
+
+    def reindex(self) -> None:
+        return self._call("reindex")
+
+
+def connect(path: str = SOCKET_PATH):
+    """Return a :class:`DaemonClient` for the daemon at ``path``, or None.
+
+    Costs one ``stat`` when no daemon has been started, and a failed
+    connect when one left a stale socket behind.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+        sock.settimeout(None)
+        return DaemonClient(sock)
+    except (OSError, DaemonError):
+        sock.close()
+        return None
+
+
+def serve(path: str = SOCKET_PATH, store=None):
+    """Serve ``store`` (a journal store by default) on ``path`` until shut down.
+
+    Requests from all connections are handled one at a time, so the store
+    sees the same sequence of calls a single process would make.
+    """
+    import socketserver
+    import threading
+    from cl_tasks.storage.journal_store import JournalTaskStore
+
+    store = store or JournalTaskStore()
+    store_lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    method = request["method"]
+                    if method == "ping":
+                        result = {"pid": os.getpid(), "path": store.path}
+                    elif method == "shutdown":
+                        result = None
+                        threading.Thread(target=server.shutdown).start()
+                    elif method in METHODS:
+                        with store_lock:
+                            result = getattr(store, method)(*request.get("args", []))
+                    else:
+                        raise ValueError(f"Unknown method {method!r}")
+                    reply = {"result": result}
+                except Exception as e:
+                    reply = {"error": {"type": type(e).__name__, "message": str(e)}}
+                self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    if connect(path) is not None:
+        raise DaemonError(f"A task daemon is already listening on {path}")
+    if os.path.exists(path):
+        os.unlink(path)  # Left behind by a daemon that didn't exit cleanly
+
+    # Only the owner may talk to the daemon
+    old_umask = os.umask(0o077)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    serve()
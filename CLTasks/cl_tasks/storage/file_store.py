@@ -1,130 +1,283 @@
-import time
 import json
 import os
+from itertools import islice
 from cl_tasks.storage.base import TaskStore
+from cl_tasks.storage.locking import (
+    FileLock, ConcurrentModificationError, atomic_write_json, file_version
+)
+from cl_tasks.storage.ops import (
+    new_op, new_add_op, new_doc, load_doc, apply_op, check_op, with_positions, find_task,
+    normalize_tags,
+)
+from cl_tasks.storage import query
+from cl_tasks.storage.search import FOLD_ENTRIES, IndexFile, TitleIndex, matches, search_tag
+from cl_tasks.storage import intervals
+from cl_tasks import current, trace
 
 FILE_PATH = os.path.expanduser("~/.taskcli_tasks.json")
 
+# How often a write is retried when another process changed the file under it
+MAX_WRITE_ATTEMPTS = 5
+
 class FileTaskStore(TaskStore):
-    def __init__(self):
-        if not os.path.exists(FILE_PATH):
-            with open(FILE_PATH, "w") as f:
-                json.dump([], f)
+    # In-memory search index and id-to-position map, each keyed by what it describes
+    _index = None
+    _positions = None
+    # Whether this store appends finished work to the interval log
+    logs_intervals = True
+    # Whether this store keeps the running-task sidecar up to date
+    logs_current = True
+
+    def __init__(self, path: str = FILE_PATH):
+        self.path = path
+        self._lock = FileLock(path)
+        self._loaded_version = None
+        self._cached = None
+        if not os.path.exists(self.path):
+            with self._lock(exclusive=True):
+                if not os.path.exists(self.path):
+                    self._save_doc(new_doc())
+
+    def _source_version(self):
+        """Version token of the file(s) the task document is read from."""
+        return file_version(self.path)
+
+    def _read_doc(self):
+        with open(self.path) as f:
+            return load_doc(json.load(f))
+
+    def _load_doc(self):
+        """Return the task document, parsing the file only if it changed.
+
+        The parsed document is cached on the store, keyed by the file's
+        version token, so a command that looks a task up and then changes
+        it reads the file once. Callers get the cached document itself and
+        must copy anything they hand out.
+        """
+        with self._lock():
+            version = self._source_version()
+            if self._cached is None or self._cached[0] != version:
+                with trace.phase("store.load"):
+                    self._cached = (version, self._read_doc())
+            self._loaded_version = version
+            return self._cached[1]
+
+    def _save_doc(self, doc):
+        with self._lock(exclusive=True):
+            atomic_write_json(self.path, doc, expected_version=self._loaded_version, indent=2)
+            self._loaded_version = file_version(self.path)
+            self._cached = (self._loaded_version, doc)
 
     def _load_tasks(self):
-        with open(FILE_PATH) as f:
-            return json.load(f)
+        return self._load_doc()["tasks"]
 
-    def _save_tasks(self, tasks):
-        with open(FILE_PATH, "w") as f:
-            json.dump(tasks, f, indent=2)
+    def _apply(self, doc, op):
+        """Apply one operation to the loaded document; a hook for subclasses."""
+        return apply_op(doc, op)
+
+    def _commit(self, doc, ops):
+        """Persist ``doc`` after the successful ``ops`` have been applied to it."""
+        self._save_doc(doc)
+
+    def _execute_batch(self, ops):
+        """Load the tasks once, apply ``ops`` in order and persist once.
+
+        The whole read-modify-write runs under the exclusive lock. If the file
+        still changed underneath us (no ``fcntl``, or a writer ignoring the
+        lock) the operations are re-applied to a fresh copy.
+        """
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            with self._lock(exclusive=True):
+                doc = self._load_doc()
+                tag = search_tag(doc)
+                try:
+                    with trace.phase("store.apply"):
+                        results = [self._apply(doc, op) for op in ops]
+                    applied = [op for op, result in zip(ops, results) if result]
+                    if not applied:
+                        return results
+                    with trace.phase("store.save"):
+                        self._commit(doc, applied)
+                    with trace.phase("store.log"):
+                        if self.logs_current:
+                            current.record(ops, results, list_name=self.list_name)
+                        if self.logs_intervals:
+                            intervals.record(ops, results, self.intervals_path)
+                        self._log_search_changes(tag, doc, ops, results)
+                except ConcurrentModificationError:
+                    self._cached = None
+                    continue
+                except BaseException:
+                    # The cached document may be half-changed; read it afresh next time
+                    self._cached = None
+                    raise
+                return results
+        raise ConcurrentModificationError(
+            f"Gave up writing {self.path} after {MAX_WRITE_ATTEMPTS} attempts"
+        )
+
+    def _execute(self, op):
+        """Apply a single operation; see :meth:`_execute_batch`."""
+        return self._execute_batch([op])[0]
+
+    def apply_batch(self, ops):
+        ops = [check_op(op) for op in ops]
+        return self._execute_batch(ops)
+
+    def add_task(self, title: str, position: int = None, tags=None, project: str = None):
+        return self._execute(new_add_op(title, position, tags, project))
 
-    def add_task(self, title: str, position: int = None):
-        tasks = self._load_tasks()
-        new_id = len(tasks) + 1
-        task = {"id": new_id, "title": title, "completed": False}
-        
-        # If position is specified, insert at that position and reorder
-        if position is not None and position > 0:
-            # If position is greater than the list length, just append
-            if position > len(tasks) + 1:
-                tasks.append(task)
-            else:
-                # Insert at the specified position
-                tasks.insert(position - 1, task)
-                
-                # Reorder IDs
-                for i, t in enumerate(tasks):
-                    t["id"] = i + 1
-        else:
-            tasks.append(task)
-            
-        self._save_tasks(tasks)
-        return task
-    
     def start_task(self, task_id: int):
+        return self._execute(new_op("start", id=task_id))
+
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        if status is None and order == "position" and limit is None and not offset and tag is None and project is None:
+            return with_positions(self._load_tasks())
+        return list(self.iter_tasks(status, order, limit, offset, tag, project))
+
+    def iter_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        if not query.has_filters(status, tag, project):
+            return query.select_tasks(self._load_tasks(), status, order, limit, offset)
+        with self._lock():
+            doc = self._load_doc()
+            positions = self._filtered_positions(doc, status, tag, project)
+        return query.select_positions(doc["tasks"], positions, status, order, limit, offset)
+
+    def _position_map(self, doc):
+        """Map of task id to list index for ``doc``, cached until the file changes."""
+        version = self._cached[0]
+        if self._positions is None or self._positions[0] != version:
+            self._positions = (version, {task["id"]: i for i, task in enumerate(doc["tasks"])})
+        return self._positions[1]
+
+    def _filtered_positions(self, doc, status, tag, project):
+        """Sorted list indexes of the tasks the secondary indexes allow through."""
+        indexes = doc["indexes"]
+        candidates = []
+        if tag is not None:
+            candidates.append(indexes["tags"].get(tag, ()))
+        if project is not None:
+            candidates.append(indexes["projects"].get(project, ()))
+        if status == "running":
+            candidates.append(indexes["running"])
+        # Intersect starting from the smallest id list
+        candidates.sort(key=len)
+        ids = set(candidates[0])
+        for other in candidates[1:]:
+            ids.intersection_update(other)
+        positions = self._position_map(doc)
+        return sorted(positions[task_id] for task_id in ids)
+
+    @property
+    def search_path(self) -> str:
+        return f"{self.path}.search.json"
+
+    def _log_search_changes(self, tag, doc, ops, results):
+        """Record adds and deletes in the search index, once one exists."""
+        new_tag = search_tag(doc)
+        if new_tag == tag:
+            return
+        changes = [
+            ("add" if op["op"] == "add" else "remove", result)
+            for op, result in zip(ops, results)
+            if result and op["op"] in ("add", "delete")
+        ]
+        if self._index is not None and self._index[0] == tag:
+            for name, task in changes:
+                getattr(self._index[1], name)(task)
+            self._index = (new_tag, self._index[1])
+        IndexFile(self.search_path).append(tag, new_tag, changes)
+
+    def _search_index(self, doc):
+        """Return the title index for ``doc``, loading or rebuilding it as needed."""
+        tag = search_tag(doc)
+        if self._index is None or self._index[0] != tag:
+            index_file = IndexFile(self.search_path)
+            loaded = index_file.load(tag)
+            if loaded is None:
+                index = TitleIndex.build(doc["tasks"])
+                index_file.save(index, tag)
+            else:
+                index, entries = loaded
+                if entries >= FOLD_ENTRIES:
+                    index_file.save(index, tag)
+            self._index = (tag, index)
+        return self._index[1]
+
+    def search_tasks(self, query: str, limit=None):
+        with self._lock():
+            doc = self._load_doc()
+            ids = self._search_index(doc).search(query)
+            if not ids:
+                return []
+            positions = self._position_map(doc)
+            # Re-check the titles, in case they were edited outside cltasks
+            found = (
+                dict(doc["tasks"][i], position=i + 1)
+                for i in sorted(positions[task_id] for task_id in ids if task_id in positions)
+            )
+            return list(islice((task for task in found if matches(task["title"], query)), limit))
+
+    def reindex(self) -> None:
+        """Rebuild the search index, e.g. after editing titles by hand."""
+        with self._lock():
+            doc = self._load_doc()
+            index = TitleIndex.build(doc["tasks"])
+            IndexFile(self.search_path).save(index, search_tag(doc))
+            self._index = (search_tag(doc), index)
+
+    def archive_tasks(self, completed_before: float) -> int:
+        # Hold the write lock throughout so no other process touches the
+        # tasks between choosing them and deleting them
+        with self._lock(exclusive=True):
+            return super().archive_tasks(completed_before)
+
+    def get_task(self, task_id: int):
+        return find_task(self._load_doc(), task_id)
+
+    def task_at(self, position: int):
         tasks = self._load_tasks()
-        for task in tasks:
-            if task["id"] == task_id:
-                task["start_time"] = time.time()
-                self._save_tasks(tasks)
-                return True
-        return False
+        if 1 <= position <= len(tasks):
+            return dict(tasks[position - 1], position=position)
+        return None
 
-    def list_tasks(self):
-        return self._load_tasks()
+    def count_tasks(self, status=None, tag=None, project=None) -> int:
+        query.check_query(status, "position")
+        if query.has_filters(status, tag, project):
+            return sum(1 for _ in self.iter_tasks(status, tag=tag, project=project))
+        counters = self.get_stats()
+        if status == "open":
+            return counters["total"] - counters["completed"]
+        return counters["completed" if status == "completed" else "total"]
+
+    def get_stats(self) -> dict:
+        # Kept current by apply_op, so no pass over the tasks is needed
+        return self._load_doc()["stats"]
 
     def complete_task(self, task_id: int):
-        tasks = self._load_tasks()
-        for task in tasks:
-            if task["id"] == task_id:
-                task["completed"] = True
-                task["end_time"] = time.time()
-                duration = task["end_time"] - task["start_time"] if "start_time" in task else 0
-                # convert duration to a human-readable format
-                task["duration"] = time.strftime("%H:%M:%S", time.gmtime(duration))
-                self._save_tasks(tasks)
-                return True
-        return False
-    
+        return self._execute(new_op("complete", id=task_id))
+
     def delete_task(self, task_id: int):
-        deleted_task = False
-        tasks = self._load_tasks()
-        for i, task in enumerate(tasks):
-            if task["id"] == task_id:
-                del tasks[i]
-                deleted_task = True
-                break  # Add break to exit loop after deletion
-
-        # reorder the task IDs after deletion
-        if deleted_task:
-            for i, task in enumerate(tasks):
-                task["id"] = i + 1
-            self._save_tasks(tasks)
-        
-        return deleted_task
-    
+        return self._execute(new_op("delete", id=task_id))
+
     def reorder_task(self, task_id: int, new_position: int):
         """Reorder a task to a new position.
-        
+
         Args:
             task_id: ID of the task to reorder
             new_position: New position to move the task to (1-based)
-            
+
         Returns:
             bool: Whether the reordering was successful
         """
-        tasks = self._load_tasks()
-        
-        # Find the task with the given ID
-        task_to_move = None
-        task_index = None
-        for i, task in enumerate(tasks):
-            if task["id"] == task_id:
-                task_to_move = task
-                task_index = i
-                break
-        
-        if task_to_move is None:
-            return False  # Task not found
-        
-        # Remove the task from the current position
-        tasks.pop(task_index)
-        
-        # If new position is greater than list length, append to the end
-        if new_position > len(tasks) + 1:
-            tasks.append(task_to_move)
-        else:
-            # Insert at the new position (adjust for 0-based index)
-            tasks.insert(new_position - 1, task_to_move)
-        
-        # Reorder all task IDs to maintain consistency
-        for i, task in enumerate(tasks):
-            task["id"] = i + 1
-        
-        self._save_tasks(tasks)
-        return True
-    
+        return self._execute(new_op("reorder", id=task_id, position=new_position))
+
+    def tag_task(self, task_id: int, add=(), remove=()):
+        return self._execute(new_op("tag", id=task_id, add=normalize_tags(add), remove=normalize_tags(remove)))
+
+    def set_project(self, task_id: int, project: str = None):
+        return self._execute(new_op("project", id=task_id, project=project))
+
     def pause_task(self, task_id: int):
         """Pause a task and record the paused duration.
 
@@ -134,19 +287,4 @@ class FileTaskStore(TaskStore):
         Returns:
             bool: True if the task was successfully paused, False otherwise
         """
-        tasks = self._load_tasks()
-        for task in tasks:
-            if task["id"] == task_id:
-                if "start_time" not in task or task.get("completed", False):
-                    # Task is not running or already completed
-                    return False
-
-                # Calculate the elapsed time since the task was started
-                elapsed_time = time.time() - task["start_time"]
-                task["paused_duration"] = task.get("paused_duration", 0) + elapsed_time
-
-                # Remove the start_time to indicate the task is paused
-                del task["start_time"]
-                self._save_tasks(tasks)
-                return True
-        return False
+        return self._execute(new_op("pause", id=task_id))
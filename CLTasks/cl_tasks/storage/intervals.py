@@ -0,0 +1,253 @@
+# cl_tasks/storage/intervals.py
+"""
+Log of the stretches of time spent working on tasks, and reports over it.
+
+Pausing a task, or completing one that is running, ends a stretch of work.
+The stores pass every such change to :func:`record`, which appends one
+interval to ``~/.taskcli_intervals.bin`` (or ``CLTASKS_INTERVALS_FILE``).
+Each interval is three little-endian doubles: the task id, then the start
+and end as epoch seconds. The file is never rewritten, and reading it is a
+single ``frombytes`` into three numeric columns.
+
+:func:`group_seconds` sums the intervals by local day, ISO week or task.
+It uses NumPy when it is installed (``pip install taskcli[report]``), so a
+report over years of history is a handful of array operations. Without
+NumPy the same grouping runs as a plain loop.
+"""
+
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+
+INTERVALS_PATH = os.path.expanduser(os.getenv("CLTASKS_INTERVALS_FILE", "~/.taskcli_intervals.bin"))
+
+RECORD = struct.Struct("<ddd")
+
+GROUPINGS = ("day", "week", "task")
+
+DAY = 86400.0
+
+# Every store imports this module to append to the log, so NumPy is only
+# imported once something reads the log; see _numpy
+_NUMPY_UNSET = object()
+numpy = _NUMPY_UNSET
+
+
+def _numpy():
+    """The NumPy module, or None if it isn't installed (it is optional)."""
+    global numpy
+    if numpy is _NUMPY_UNSET:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+
+def record(ops, results, path: str = INTERVALS_PATH) -> None:
+    """Append the intervals that ``results`` ended to the log.
+
+    Args:
+        ops: The operations a store just applied
+        results: What the store returned for each of them
+        path: Interval log to append to
+    """
+    data = b"".join(
+        RECORD.pack(result["id"], *result["interval"])
+        for result in results if result and "interval" in result
+    )
+    if data:
+        # One write in append mode, so concurrent writers don't interleave
+        with open(path, "ab") as f:
+            f.write(data)
+
+
+class Intervals:
+    """The log as three columns: ``ids``, ``starts`` and ``ends``.
+
+    The columns are NumPy arrays when NumPy is installed, else ``array("d")``.
+    """
+
+    def __init__(self, ids, starts, ends):
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        # A crash mid-append can leave a partial record at the end
+        data = data[:len(data) - len(data) % RECORD.size]
+        if _numpy() is not None:
+            flat = numpy.frombuffer(data, dtype="<f8")
+        else:
+            flat = array("d")
+            flat.frombytes(data)
+            if sys.byteorder == "big":
+                flat.byteswap()
+        return cls(flat[0::3], flat[1::3], flat[2::3])
+
+    @classmethod
+    def read(cls, path: str = INTERVALS_PATH):
+        try:
+            with open(path, "rb") as f:
+                return cls.from_bytes(f.read())
+        except FileNotFoundError:
+            return cls.from_bytes(b"")
+
+    def extended(self, rows):
+        """These intervals plus ``rows`` of ``(id, start, end)``, e.g. running tasks."""
+        rows = list(rows)
+        if not rows:
+            return self
+        ids, starts, ends = (array("d", column) for column in zip(*rows))
+        if _numpy() is not None:
+            return Intervals(*(numpy.concatenate((mine, extra)) for mine, extra in (
+                (self.ids, ids), (self.starts, starts), (self.ends, ends))))
+        return Intervals(self.ids + ids, self.starts + starts, self.ends + ends)
+
+
+def _gmtoff(hour):
+    return time.localtime(hour * 3600).tm_gmtoff
+
+
+def offset_changes(first: float, last: float):
+    """Local UTC offsets in force from ``first`` to ``last`` (epoch seconds).
+
+    Returns:
+        tuple: Times the offset changed (the first is ``first``) and the
+        offset in seconds from each of them on
+    """
+    hour, end = int(first // 3600), int(last // 3600) + 1
+    times, offsets = [hour * 3600.0], [_gmtoff(hour)]
+    # Offsets only change a couple of times a year: step a day at a time,
+    # then search the day for the hour it changed
+    while hour < end:
+        step = min(24, end - hour)
+        if _gmtoff(hour + step) != offsets[-1]:
+            low, high = hour, hour + step
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _gmtoff(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            times.append(high * 3600.0)
+            offsets.append(_gmtoff(high))
+            step = high - hour
+        hour += step
+    return times, offsets
+
+
+def day_label(day: int) -> str:
+    """``YYYY-MM-DD`` for a local day number (days since 1970-01-01)."""
+    return time.strftime("%Y-%m-%d", time.gmtime(day * DAY))
+
+
+def week_label(week: int) -> str:
+    """``YYYY-Www`` for a week number counted in Mondays since 1970."""
+    # Day 0 was a Thursday, so week w starts on day 7w - 3
+    return time.strftime("%G-W%V", time.gmtime((week * 7 - 3) * DAY))
+
+
+def group_seconds(intervals: Intervals, by: str, since: float = None) -> dict:
+    """Sum the worked seconds in ``intervals`` per local day, ISO week or task.
+
+    Intervals that cross midnight are split between the days they cover.
+
+    Args:
+        intervals: The intervals to sum
+        by: One of :data:`GROUPINGS`
+        since: Leave out work before this epoch time
+
+    Returns:
+        dict: Seconds per day number, week number or task id, in key order
+    """
+    if by not in GROUPINGS:
+        raise ValueError(f"Cannot group by {by!r}; use one of {', '.join(GROUPINGS)}")
+    if _numpy() is not None:
+        return _group_numpy(intervals, by, since)
+    return _group_python(intervals, by, since)
+
+
+def _group_numpy(intervals, by, since):
+    np = numpy
+    ids = np.asarray(intervals.ids)
+    starts = np.asarray(intervals.starts)
+    ends = np.asarray(intervals.ends)
+    if since is not None:
+        starts = np.maximum(starts, since)
+    keep = ends > starts
+    ids, starts, ends = ids[keep], starts[keep], ends[keep]
+    if not len(ids):
+        return {}
+
+    if by == "task":
+        keys, weights = ids.astype(np.int64), ends - starts
+    else:
+        times, offsets = offset_changes(starts.min(), ends.max())
+        times, offsets = np.array(times), np.array(offsets, dtype=np.float64)
+        local_times = times + offsets
+
+        def local(moments):
+            return moments + offsets[np.searchsorted(times, moments, side="right") - 1]
+
+        def midnight(days):
+            # Local midnights never fall in a DST gap or overlap
+            found = np.searchsorted(local_times, days * DAY, side="right") - 1
+            return days * DAY - offsets[np.maximum(found, 0)]
+
+        first = np.floor(local(starts) / DAY).astype(np.int64)
+        last = np.maximum(np.ceil(local(ends) / DAY).astype(np.int64) - 1, first)
+        # Most intervals fall within one day; split the rest into one row per day
+        crossing = np.flatnonzero(last > first)
+        counts = last[crossing] - first[crossing] + 1
+        rows = np.repeat(crossing, counts)
+        split_days = first[rows] + np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        split = (np.minimum(ends[rows], midnight(split_days + 1))
+                 - np.maximum(starts[rows], midnight(split_days)))
+        single = last == first
+        days = np.concatenate((first[single], split_days))
+        weights = np.concatenate((ends[single] - starts[single], split))
+        keys = days if by == "day" else (days + 3) // 7
+
+    # Keys are small integers, so count into one slot per key instead of sorting
+    lowest = keys.min()
+    present = np.flatnonzero(np.bincount(keys - lowest))
+    totals = np.bincount(keys - lowest, weights=weights)[present]
+    return dict(zip((present + lowest).tolist(), totals.tolist()))
+
+
+def _group_python(intervals, by, since):
+    totals = {}
+    starts, ends = intervals.starts, intervals.ends
+    if by != "task" and len(starts):
+        times, offsets = offset_changes(min(starts), max(ends))
+        local_times = [moment + offset for moment, offset in zip(times, offsets)]
+
+        def midnight(day):
+            found = max(bisect_right(local_times, day * DAY) - 1, 0)
+            return day * DAY - offsets[found]
+
+    for i, task_id in enumerate(intervals.ids):
+        start, end = starts[i], ends[i]
+        if since is not None:
+            start = max(start, since)
+        if end <= start:
+            continue
+        if by == "task":
+            key = int(task_id)
+            totals[key] = totals.get(key, 0.0) + end - start
+            continue
+        day = int((start + offsets[bisect_right(times, start) - 1]) // DAY)
+        while midnight(day) < end:
+            piece = min(end, midnight(day + 1)) - max(start, midnight(day))
+            key = day if by == "day" else (day + 3) // 7
+            totals[key] = totals.get(key, 0.0) + piece
+            day += 1
+    return dict(sorted(totals.items()))
@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+from cl_tasks.storage.file_store import FileTaskStore, FILE_PATH
+from cl_tasks.storage.locking import FileLock, atomic_write_json, file_version
+from cl_tasks.storage.ops import apply_op, new_doc, load_doc
+
+SNAPSHOT_PATH = os.path.expanduser("~/.taskcli_tasks.snapshot.json")
+JOURNAL_PATH = os.path.expanduser("~/.taskcli_tasks.journal")
+
+# Compact the journal into the snapshot once it grows past this many bytes
+COMPACT_THRESHOLD = int(os.getenv("CLTASKS_JOURNAL_COMPACT_BYTES", 256 * 1024))
+
+
+class JournalTaskStore(FileTaskStore):
+    """Task store that appends one record per operation instead of rewriting the file.
+
+    State lives in a snapshot (a task document tagged with ``"seq"``) plus an
+    append-only journal of operation records, each tagged with a sequence
+    number. Loading replays the journal records newer than the snapshot.
+    Once the journal passes ``COMPACT_THRESHOLD`` bytes it is folded into a
+    fresh snapshot on a background thread.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = SNAPSHOT_PATH,
+        journal_path: str = JOURNAL_PATH,
+        legacy_path: str = FILE_PATH,
+        compact_threshold: int = COMPACT_THRESHOLD,
+    ):
+        self.path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_threshold = compact_threshold
+        self._seq = 0
+        self._lock = FileLock(snapshot_path)
+        self._compactor = None
+        self._cached = None
+
+        if not os.path.exists(self.path):
+            with self._lock(exclusive=True):
+                if not os.path.exists(self.path):
+                    # Seed the first snapshot from the plain JSON store, if there is one
+                    doc = new_doc()
+                    if legacy_path and os.path.exists(legacy_path):
+                        with open(legacy_path) as f:
+                            doc = load_doc(json.load(f))
+                    self._write_snapshot(0, doc)
+
+    def _write_snapshot(self, seq, doc):
+        atomic_write_json(self.path, dict(doc, seq=seq), separators=(",", ":"))
+
+    def _read_journal(self):
+        """Yield the journal records, skipping a torn final line."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A crash mid-append can leave a partial last record
+                    continue
+
+    def _replay(self):
+        """Rebuild the task document from the snapshot and journal.
+
+        Returns:
+            tuple: The task document and the sequence number it reflects
+        """
+        with open(self.path) as f:
+            doc = load_doc(json.load(f))
+        seq = doc.pop("seq")
+        for op in self._read_journal():
+            if op["seq"] <= seq:
+                continue  # Already folded into the snapshot
+            apply_op(doc, op)
+            seq = op["seq"]
+        return doc, seq
+
+    def _source_version(self):
+        # Appends change the journal's size, compaction replaces both files
+        return (file_version(self.path), file_version(self.journal_path))
+
+    def _read_doc(self):
+        doc, self._seq = self._replay()
+        return doc
+
+    def _save_doc(self, doc):
+        # Whole-document writes bypass the journal, so start a fresh snapshot
+        with self._lock(exclusive=True):
+            self._write_snapshot(self._seq, doc)
+            open(self.journal_path, "w").close()
+            self._cached = (self._source_version(), doc)
+
+    def _commit(self, doc, ops):
+        # Runs inside _execute_batch's exclusive lock, so seq numbers stay
+        # unique across processes. A batch goes out as a single write.
+        records = [dict(op, seq=self._seq + i + 1) for i, op in enumerate(ops)]
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode()
+        with self._lock(exclusive=True):
+            with open(self.journal_path, "ab+") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        # A crash mid-append left a partial last record. End its
+                        # line, or this batch would be skipped along with it.
+                        data = b"\n" + data
+                f.write(data)
+                size = f.tell()
+            self._cached = (self._source_version(), doc)
+        self._seq = records[-1]["seq"]
+
+        if size >= self.compact_threshold:
+            self._start_compaction()
+
+    def _start_compaction(self):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        # Non-daemon, so the interpreter finishes the compaction before exiting
+        self._compactor = threading.Thread(target=self.compact, name="cltasks-compact")
+        self._compactor.start()
+
+    def compact(self):
+        """Fold the journal into a new snapshot."""
+        with self._lock(exclusive=True):
+            doc, seq = self._replay()
+            self._write_snapshot(seq, doc)
+
+            # Keep only records appended after the snapshot was taken. A crash
+            # before this point is harmless: older records are skipped by seq.
+            pending = [op for op in self._read_journal() if op["seq"] > seq]
+            tmp_path = f"{self.journal_path}.tmp"
+            with open(tmp_path, "w") as f:
+                for op in pending:
+                    f.write(json.dumps(op, separators=(",", ":")) + "\n")
+            os.replace(tmp_path, self.journal_path)
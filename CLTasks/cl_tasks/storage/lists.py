@@ -0,0 +1,185 @@
+# cl_tasks/storage/lists.py
+"""
+Named task lists, each kept in a shard of its own.
+
+``cltasks --list work add ...`` (or ``CLTASKS_LIST=work``) runs a command
+on the ``work`` list instead of the default one. A named list is a
+directory under ``~/.taskcli_lists`` (or ``CLTASKS_LISTS_DIR``). It holds
+the list's task file for whichever backend is in use, with its search
+index, archive and interval log next to it. On Cosmos DB each list gets a
+partition of its own. The default list keeps the original paths, so
+existing tasks stay where they are.
+
+A command opens only the shard of its own list. Each shard has its own
+files and lock, so commands on different lists can run in parallel
+without waiting on or rewriting each other's tasks. The only file they
+share is the running-task sidecar of :mod:`cl_tasks.current`, which is
+locked and updated entry by entry.
+
+:class:`AllLists` reads every list at once for ``list --all-lists``. It
+walks the shards in turn and opens each one only when the listing gets
+to it, so a page that the first lists fill never loads the rest.
+"""
+
+import os
+import re
+from itertools import islice
+
+DEFAULT_LIST = "default"
+
+LISTS_DIR = os.path.expanduser(os.getenv("CLTASKS_LISTS_DIR", "~/.taskcli_lists"))
+
+_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*\Z")
+
+
+def check_name(name: str) -> str:
+    """Return ``name`` if it can name a list.
+
+    Raises:
+        ValueError: If it has characters other than letters, digits, ``-`` and ``_``
+    """
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid list name {name!r}: use letters, digits, '-' and '_'")
+    return name
+
+
+def selected_list() -> str:
+    """The list commands work on: ``CLTASKS_LIST`` (set by ``--list``), else the default."""
+    return os.getenv("CLTASKS_LIST") or DEFAULT_LIST
+
+
+def list_names() -> list:
+    """The default list, then every named list in alphabetical order."""
+    try:
+        entries = os.listdir(LISTS_DIR)
+    except FileNotFoundError:
+        entries = []
+    named = sorted(
+        entry for entry in entries
+        if entry != DEFAULT_LIST and _NAME.match(entry) and os.path.isdir(os.path.join(LISTS_DIR, entry))
+    )
+    return [DEFAULT_LIST, *named]
+
+
+def list_dir(name: str) -> str:
+    """Directory of the named list ``name``, created the first time the list is used."""
+    directory = os.path.join(LISTS_DIR, check_name(name))
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def shard_options(name: str, backend: str) -> dict:
+    """Constructor arguments that point a store of ``backend`` at list ``name``.
+
+    Empty for the default list, whose stores use their usual paths.
+
+    Args:
+        name: The list
+        backend: ``file``, ``journal``, ``binary``, ``sqlite``, ``cache``
+            (the local replica in front of Cosmos DB) or ``cosmos``
+    """
+    if name == DEFAULT_LIST:
+        return {}
+    if backend == "cosmos":
+        return {"list_name": name}
+    base = os.path.join(list_dir(name), "tasks")
+    return {
+        "file": {"path": f"{base}.json"},
+        "journal": {
+            "snapshot_path": f"{base}.snapshot.json",
+            "journal_path": f"{base}.journal",
+            "legacy_path": f"{base}.json",
+        },
+        "binary": {"path": f"{base}.bin", "legacy_path": f"{base}.json"},
+        "sqlite": {"path": f"{base}.db"},
+        "cache": {"path": f"{base}.cache.json", "outbox_path": f"{base}.outbox"},
+    }[backend]
+
+
+def named(store, name: str):
+    """Mark ``store`` as holding list ``name`` and give it the list's interval log."""
+    if name != DEFAULT_LIST:
+        store.list_name = name
+        store.intervals_path = os.path.join(list_dir(name), "intervals.bin")
+    return store
+
+
+class AllLists:
+    """Read-only view of every list, for the ``merged_*`` helpers of ``storage.archive``.
+
+    Tasks come list by list, each with its list's name in ``list``, and
+    include the lists' archived tasks. Ordered by status, the open tasks of
+    every list come before any completed ones.
+    """
+
+    def __init__(self, names=None):
+        self.names = list_names() if names is None else list(names)
+        self._stores = {}
+
+    def store(self, name: str):
+        """The store of list ``name``, opened on first use."""
+        if name not in self._stores:
+            from cl_tasks.storage import get_store
+
+            self._stores[name] = get_store(name)
+        return self._stores[name]
+
+    def get_archive(self):
+        # Each list's archive is read along with the list itself
+        return None
+
+    def iter_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        from cl_tasks.storage.archive import merged_count, merged_tasks
+        from cl_tasks.storage.query import check_query
+
+        check_query(status, order)
+        statuses = ("open", "completed") if order == "status" and status is None else (status,)
+        remaining = limit
+        for state in statuses:
+            for name in self.names:
+                if remaining == 0:
+                    return
+                store = self.store(name)
+                if offset:
+                    # Skip whole lists by their counts instead of reading them
+                    count = merged_count(store, state, tag, project)
+                    if count <= offset:
+                        offset -= count
+                        continue
+                tasks = merged_tasks(store, state, "position", remaining, offset, tag, project)
+                offset = 0
+                for task in tasks:
+                    if remaining is not None:
+                        remaining -= 1
+                    yield dict(task, list=name)
+
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        return list(self.iter_tasks(status, order, limit, offset, tag, project))
+
+    def count_tasks(self, status=None, tag=None, project=None) -> int:
+        from cl_tasks.storage.archive import merged_count
+
+        return sum(merged_count(self.store(name), status, tag, project) for name in self.names)
+
+    def get_stats(self) -> dict:
+        from cl_tasks.storage.archive import merged_stats
+        from cl_tasks.storage.stats import merge, new_stats
+
+        totals = new_stats()
+        for name in self.names:
+            totals = merge(totals, merged_stats(self.store(name)))
+        return totals
+
+    def reindex(self) -> None:
+        for name in self.names:
+            store = self.store(name)
+            if hasattr(store, "reindex"):
+                store.reindex()
+
+    def search_tasks(self, query: str, limit=None):
+        found = (
+            dict(task, list=name)
+            for name in self.names
+            for task in self.store(name).search_tasks(query, limit)
+        )
+        return list(islice(found, limit))
@@ -0,0 +1,111 @@
+# cl_tasks/storage/locking.py
+"""
+Process-safe access helpers for the file-based task stores.
+
+Readers take a shared ``fcntl.flock`` lock and writers an exclusive one on a
+``.lock`` file next to the data file, so many ``cltasks`` processes can read
+at once while writers queue up. Writes go to a temporary file that is
+swapped in with ``os.replace``, so readers never see a half-written file.
+
+On platforms without ``fcntl`` the locks are no-ops and the version check
+in :func:`atomic_write_json` is what catches a concurrent writer.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class ConcurrentModificationError(Exception):
+    """Raised when the file changed between loading and saving it."""
+
+
+def file_version(path):
+    """Return a cheap token that changes whenever ``path`` is replaced or rewritten.
+
+    ``path`` may also be an open file descriptor, to version exactly the
+    file that was read.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class FileLock:
+    """Shared/exclusive advisory lock on ``<path>.lock``.
+
+    Locks are re-entrant per thread: asking for a lock the thread already
+    holds (or a shared lock while holding an exclusive one) just nests.
+    """
+
+    def __init__(self, path: str):
+        self.lock_path = f"{path}.lock"
+        self._local = threading.local()
+
+    @contextmanager
+    def __call__(self, exclusive: bool = False):
+        held = getattr(self._local, "mode", None)
+        if held == "exclusive" or (held == "shared" and not exclusive):
+            yield
+            return
+        if held == "shared":
+            raise RuntimeError("Cannot upgrade a shared task file lock to exclusive")
+
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._local.mode = "exclusive" if exclusive else "shared"
+            try:
+                yield
+            finally:
+                self._local.mode = None
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write_json(path: str, data, expected_version=None, **dump_kwargs):
+    """Write ``data`` as JSON to ``path`` via a temp file and ``os.replace``.
+
+    Args:
+        path: Destination file
+        data: JSON-serialisable object
+        expected_version: Token from :func:`file_version` taken when the data
+            was loaded; if the file has changed since, nothing is written
+        **dump_kwargs: Passed through to ``json.dump``
+
+    Raises:
+        ConcurrentModificationError: If ``expected_version`` no longer matches
+    """
+    _atomic_write(path, "w", lambda f: json.dump(data, f, **dump_kwargs), expected_version)
+
+
+def atomic_write_bytes(path: str, data: bytes, expected_version=None):
+    """Like :func:`atomic_write_json`, for data that is already encoded."""
+    _atomic_write(path, "wb", lambda f: f.write(data), expected_version)
+
+
+def _atomic_write(path, mode, write, expected_version):
+    # A per-process, per-thread name in the same directory keeps os.replace
+    # atomic without paying for the tempfile import on every startup
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if expected_version is not None and file_version(path) != expected_version:
+            raise ConcurrentModificationError(f"{path} was modified by another process")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,361 @@
+# cl_tasks/storage/ops.py
+"""
+Task mutations expressed as small, replayable operation records.
+
+Every change to the task list is described by a dict such as
+``{"op": "start", "id": 3, "at": 1700000000.0}``. Stores apply these
+records to an in-memory task document; because the timestamp travels with
+the record, applying the same records to the same document always gives
+the same result, which is what lets the journal store replay them on load.
+
+A task document looks like ``{"next_id": 4, "tasks": [...], "stats": {...},
+"indexes": {...}}``. Task ids are assigned from ``next_id`` and never
+change; a task's display position is simply its index in ``tasks``.
+``stats`` holds the aggregate counters described in
+:mod:`cl_tasks.storage.stats`. ``indexes`` holds secondary indexes
+(see :func:`build_indexes`). Every operation keeps both current.
+
+Tasks may carry ``tags`` (a sorted list of lowercase words) and a
+``project`` name. Both fields are left out when empty.
+
+An ``add`` may also carry the :data:`STATE_FIELDS` of a task that already
+has a history, such as one read by ``cltasks import``; the new task starts
+out with them instead of open and untouched.
+
+The task returned for a ``pause``, or a ``complete`` of a running task,
+also carries ``interval``: the ``[start, end]`` of the stretch of work it
+ended, for :mod:`cl_tasks.storage.intervals`. It isn't stored on the task.
+"""
+
+import time
+from cl_tasks.storage import stats
+from cl_tasks.storage.query import is_running
+
+
+def new_op(name: str, **fields) -> dict:
+    """Build an operation record stamped with the current time."""
+    op = {"op": name}
+    op.update(fields)
+    op.setdefault("at", time.time())
+    return op
+
+
+def new_add_op(title: str, position: int = None, tags=None, project: str = None) -> dict:
+    """Build an ``add`` record, leaving out the tags and project when unset."""
+    fields = {}
+    if tags:
+        fields["tags"] = normalize_tags(tags)
+    if project:
+        fields["project"] = project
+    return new_op("add", title=title, position=position, **fields)
+
+
+# Fields an "add" may carry to recreate a task's state
+STATE_FIELDS = ("completed", "start_time", "end_time", "paused_duration")
+
+# Fields each operation needs besides "op" and "at"
+REQUIRED_FIELDS = {
+    "add": ("title",),
+    "start": ("id",),
+    "pause": ("id",),
+    "complete": ("id",),
+    "delete": ("id",),
+    "reorder": ("id", "position"),
+    "tag": ("id",),
+    "project": ("id",),
+}
+
+
+def normalize_tags(tags) -> list:
+    """Return ``tags`` lowercased, without a leading ``#``, deduplicated and sorted.
+
+    Raises:
+        ValueError: If a tag is empty or contains whitespace or a comma
+    """
+    normalized = set()
+    for tag in tags or ():
+        tag = str(tag).strip().lstrip("#").lower()
+        if not tag or any(c.isspace() or c == "," for c in tag):
+            raise ValueError(f"Invalid tag {tag!r}: tags are single words")
+        normalized.add(tag)
+    return sorted(normalized)
+
+
+def check_op(op: dict) -> dict:
+    """Validate an operation record, stamping it with a time if it has none.
+
+    Raises:
+        ValueError: If the operation is unknown or missing a field
+    """
+    name = op.get("op")
+    if name not in REQUIRED_FIELDS:
+        raise ValueError(f"Unknown task operation: {name!r}")
+    missing = [field for field in REQUIRED_FIELDS[name] if op.get(field) is None]
+    if missing:
+        raise ValueError(f"'{name}' operation is missing: {', '.join(missing)}")
+    for field in ("tags", "add", "remove"):
+        if op.get(field) is not None:
+            op = dict(op, **{field: normalize_tags(op[field])})
+    if "at" not in op:
+        op = dict(op, at=time.time())
+    return op
+
+
+def new_doc(tasks=None) -> dict:
+    """Build a task document, upgrading a legacy bare task list if given.
+
+    Files written before ids were stable hold a plain list whose ids match
+    the list positions, so they are already unique.
+    """
+    tasks = tasks or []
+    next_id = max((task["id"] for task in tasks), default=0) + 1
+    return {
+        "next_id": next_id,
+        "tasks": tasks,
+        "stats": stats.compute_stats(tasks),
+        "indexes": build_indexes(tasks),
+    }
+
+
+def load_doc(data) -> dict:
+    """Normalise data read from disk into a task document.
+
+    Documents saved before the statistics or indexes existed, or with
+    statistics counted an older way, get them computed here; the next
+    write saves them.
+    """
+    if isinstance(data, list):
+        return new_doc(data)
+    if "stats" not in data or not stats.is_current(data["stats"]):
+        data["stats"] = stats.compute_stats(data["tasks"])
+    if "indexes" not in data:
+        data["indexes"] = build_indexes(data["tasks"])
+    return data
+
+
+def build_indexes(tasks) -> dict:
+    """Secondary indexes over ``tasks``, for filtering without a scan.
+
+    ``tags`` and ``projects`` map each tag or project name to the ids of
+    its tasks, and ``running`` lists the ids of running tasks. The id
+    lists are in no particular order.
+    """
+    indexes = {"tags": {}, "projects": {}, "running": []}
+    for task in tasks:
+        _index(indexes, task)
+    return indexes
+
+
+def _index(indexes, task):
+    """Add ``task`` to ``indexes`` (a no-op for documents without indexes)."""
+    if indexes is None:
+        return
+    for tag in task.get("tags", ()):
+        indexes["tags"].setdefault(tag, []).append(task["id"])
+    if task.get("project") is not None:
+        indexes["projects"].setdefault(task["project"], []).append(task["id"])
+    if is_running(task):
+        indexes["running"].append(task["id"])
+
+
+def _track_running(indexes, before, after):
+    """Update the running index after a task went from ``before`` to ``after``."""
+    if indexes is None or is_running(before) == is_running(after):
+        return
+    if is_running(after):
+        indexes["running"].append(after["id"])
+    else:
+        indexes["running"].remove(after["id"])
+
+
+def _unindex(indexes, task):
+    """Remove ``task`` from ``indexes``, dropping keys left without tasks."""
+    if indexes is None:
+        return
+    keyed = [("tags", tag) for tag in task.get("tags", ())]
+    if task.get("project") is not None:
+        keyed.append(("projects", task["project"]))
+    for kind, key in keyed:
+        ids = indexes[kind][key]
+        ids.remove(task["id"])
+        if not ids:
+            del indexes[kind][key]
+    if is_running(task):
+        indexes["running"].remove(task["id"])
+
+
+def with_positions(tasks):
+    """Return copies of ``tasks`` annotated with their 1-based display position."""
+    return [dict(task, position=i + 1) for i, task in enumerate(tasks)]
+
+
+def _find(tasks, task_id):
+    for i, task in enumerate(tasks):
+        if task["id"] == task_id:
+            return i, task
+    return None, None
+
+
+def find_task(doc: dict, task_id: int):
+    """Return a copy of the task with ``task_id`` and its position, or None."""
+    index, task = _find(doc["tasks"], task_id)
+    if task is None:
+        return None
+    return dict(task, position=index + 1)
+
+
+def _add(doc, op):
+    tasks = doc["tasks"]
+    position = op.get("position")
+    task = {"id": doc["next_id"], "title": op["title"], "completed": False}
+    if op.get("tags"):
+        task["tags"] = normalize_tags(op["tags"])
+    if op.get("project"):
+        task["project"] = op["project"]
+    for field in STATE_FIELDS:
+        if op.get(field) is not None:
+            task[field] = op[field]
+    if task["completed"]:
+        task["duration"] = stats.format_duration(stats.task_seconds(task))
+    doc["next_id"] += 1
+
+    # If position is specified, insert there; otherwise append
+    if position is not None and 0 < position <= len(tasks):
+        tasks.insert(position - 1, task)
+    else:
+        tasks.append(task)
+        position = len(tasks)
+    stats.record_add(doc["stats"], task)
+    _index(doc.get("indexes"), task)
+    return dict(task, position=position)
+
+
+def _start(doc, op):
+    index, task = _find(doc["tasks"], op["id"])
+    if task is None:
+        return None
+    before = dict(task)
+    task["start_time"] = op["at"]
+    _track_running(doc.get("indexes"), before, task)
+    if task.get("completed"):
+        # Restarting a completed task changes its tracked duration
+        stats.record_change(doc["stats"], before, task)
+    return dict(task, position=index + 1)
+
+
+def _pause(doc, op):
+    index, task = _find(doc["tasks"], op["id"])
+    if task is None:
+        return None
+    if "start_time" not in task or task.get("completed", False):
+        # Task is not running or already completed
+        return None
+
+    # Accumulate the elapsed time and drop start_time to mark it paused
+    before = dict(task)
+    elapsed_time = op["at"] - task["start_time"]
+    task["paused_duration"] = task.get("paused_duration", 0) + elapsed_time
+    del task["start_time"]
+    _track_running(doc.get("indexes"), before, task)
+    return dict(task, position=index + 1, interval=[before["start_time"], op["at"]])
+
+
+def _complete(doc, op):
+    index, task = _find(doc["tasks"], op["id"])
+    if task is None:
+        return None
+    before = dict(task)
+    task["completed"] = True
+    task["end_time"] = op["at"]
+    # convert duration to a human-readable format
+    task["duration"] = stats.format_duration(stats.task_seconds(task))
+    stats.record_change(doc["stats"], before, task)
+    _track_running(doc.get("indexes"), before, task)
+    if is_running(before):
+        return dict(task, position=index + 1, interval=[before["start_time"], op["at"]])
+    return dict(task, position=index + 1)
+
+
+def _delete(doc, op):
+    index, task = _find(doc["tasks"], op["id"])
+    if index is None:
+        return None
+    del doc["tasks"][index]
+    stats.record_delete(doc["stats"], task)
+    _unindex(doc.get("indexes"), task)
+    # The position the task had before it was removed
+    return dict(task, position=index + 1)
+
+
+def _reorder(doc, op):
+    tasks = doc["tasks"]
+    index, task = _find(tasks, op["id"])
+    if task is None:
+        return None  # Task not found
+
+    tasks.pop(index)
+    new_position = op["position"]
+    # If new position is greater than list length, append to the end
+    if new_position > len(tasks) + 1:
+        tasks.append(task)
+        new_position = len(tasks)
+    else:
+        tasks.insert(new_position - 1, task)
+    return dict(task, position=new_position)
+
+
+def _tag(doc, op):
+    index, task = _find(doc["tasks"], op["id"])
+    if task is None:
+        return None
+    _unindex(doc.get("indexes"), task)
+    tags = set(task.get("tags", ())) | set(normalize_tags(op.get("add")))
+    tags -= set(normalize_tags(op.get("remove")))
+    task.pop("tags", None)
+    if tags:
+        task["tags"] = sorted(tags)
+    _index(doc.get("indexes"), task)
+    return dict(task, position=index + 1)
+
+
+def _project(doc, op):
+    index, task = _find(doc["tasks"], op["id"])
+    if task is None:
+        return None
+    _unindex(doc.get("indexes"), task)
+    task.pop("project", None)
+    if op.get("project"):
+        task["project"] = op["project"]
+    _index(doc.get("indexes"), task)
+    return dict(task, position=index + 1)
+
+
+_HANDLERS = {
+    "add": _add,
+    "start": _start,
+    "pause": _pause,
+    "complete": _complete,
+    "delete": _delete,
+    "reorder": _reorder,
+    "tag": _tag,
+    "project": _project,
+}
+
+
+def apply_op(doc: dict, op: dict):
+    """Apply one operation record to a task document in place.
+
+    Args:
+        doc: The task document to mutate
+        op: An operation record built with :func:`new_op`
+
+    Returns:
+        A copy of the added or changed task with its ``position`` (for
+        ``delete``, the task as it was removed), or None if the task does
+        not exist or the operation did not apply to it.
+    """
+    try:
+        handler = _HANDLERS[op["op"]]
+    except KeyError:
+        raise ValueError(f"Unknown task operation: {op.get('op')!r}")
+    return handler(doc, op)
@@ -0,0 +1,116 @@
+# cl_tasks/storage/query.py
+"""
+Filtering, ordering and paging shared by the in-memory task stores.
+
+Stores with a query engine (SQLite) translate the same arguments into SQL
+instead; both accept:
+
+- ``status``: ``None`` for every task, ``"open"`` for tasks not yet
+  completed, ``"running"`` for open tasks that are started and not
+  paused, or ``"completed"``
+- ``order``: ``"position"`` for list order, or ``"status"`` for open
+  tasks first and then completed ones, each in list order
+- ``limit`` / ``offset``: the page of matching tasks to return
+- ``tag`` / ``project``: only tasks carrying that tag, or in that project
+
+Positions always count every task, whatever the filters.
+"""
+
+from itertools import islice
+
+STATUSES = (None, "open", "running", "completed")
+ORDERS = ("position", "status")
+
+
+def check_query(status, order):
+    """Raise ValueError for a status or order the stores don't understand."""
+    if status not in STATUSES:
+        raise ValueError(f"Unknown task status filter: {status!r}")
+    if order not in ORDERS:
+        raise ValueError(f"Unknown task order: {order!r}")
+
+
+def is_running(task: dict) -> bool:
+    """Whether ``task`` is started, not paused and not completed."""
+    return not task["completed"] and task.get("start_time") is not None
+
+
+def matches(task: dict, status, tag=None, project=None) -> bool:
+    """Whether ``task`` passes the ``status``, ``tag`` and ``project`` filters."""
+    if tag is not None and tag not in task.get("tags", ()):
+        return False
+    if project is not None and task.get("project") != project:
+        return False
+    if status == "open":
+        return not task["completed"]
+    if status == "running":
+        return is_running(task)
+    if status == "completed":
+        return bool(task["completed"])
+    return True
+
+
+def has_filters(status=None, tag=None, project=None) -> bool:
+    """Whether the filters go beyond the open/completed split the counters cover."""
+    return status == "running" or tag is not None or project is not None
+
+
+def select_tasks(tasks, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+    """Lazily yield one page of ``tasks`` with their positions.
+
+    Args:
+        tasks: All tasks in list order (a list, so it can be walked twice)
+        status: Status filter, see the module docstring
+        order: Sort order, see the module docstring
+        limit: Maximum number of tasks to yield, or None for all
+        offset: Number of matching tasks to skip first
+        tag: Only yield tasks with this tag
+        project: Only yield tasks in this project
+
+    Yields:
+        Copies of the selected tasks, each with its ``position``
+    """
+    check_query(status, order)
+    numbered = enumerate(tasks, start=1)
+    if order == "status" and status is None:
+        # Open tasks first, then completed; two lazy passes over the list
+        selected = (
+            pair
+            for wanted in ("open", "completed")
+            for pair in enumerate(tasks, start=1)
+            if matches(pair[1], wanted, tag, project)
+        )
+    else:
+        selected = (pair for pair in numbered if matches(pair[1], status, tag, project))
+
+    stop = None if limit is None else offset + limit
+    for position, task in islice(selected, offset, stop):
+        yield dict(task, position=position)
+
+
+
+def select_positions(tasks, positions, status=None, order="position", limit=None, offset=0):
+    """Like :func:`select_tasks`, for tasks already narrowed down by an index.
+
+    Args:
+        tasks: All tasks in list order
+        positions: Sorted 0-based indexes in ``tasks`` of the candidates
+        status: Status filter applied to the candidates
+        order: Sort order, see the module docstring
+        limit: Maximum number of tasks to yield, or None for all
+        offset: Number of matching tasks to skip first
+
+    Yields:
+        Copies of the selected tasks, each with its ``position``
+    """
+    check_query(status, order)
+    wanted = ("open", "completed") if order == "status" and status is None else (status,)
+    selected = (
+        index
+        for state in wanted
+        for index in positions
+        if matches(tasks[index], state)
+    )
+    stop = None if limit is None else offset + limit
+    for index in islice(selected, offset, stop):
+        yield dict(tasks[index], position=index + 1)
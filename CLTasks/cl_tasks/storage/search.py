@@ -0,0 +1,206 @@
+# cl_tasks/storage/search.py
+"""
+Word search over task titles.
+
+Titles are split into lowercase words. A query matches a task when every
+query word is the start of some word in its title, so ``rep wri`` finds
+"Write report". :class:`TitleIndex` maps each word to the ids of the tasks
+using it and keeps the words sorted. Each query word is then one binary
+search for the range of words it prefixes, however many tasks there are.
+
+The file stores keep the index in ``<store path>.search.json`` once the
+first search has built it (see :class:`IndexFile`). The index is tagged
+with the task document's ``next_id`` and task count, which every add and
+delete changes. Each add or delete appends a small entry to a change log
+next to it, and searches fold the log back into the index file. If the
+tasks change some other way, the tags stop lining up and the next search
+rebuilds the index from scratch. Stores without an index fall back to
+:func:`matches` on every title.
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left, insort
+
+_WORD = re.compile(r"\w+")
+
+# Fold the change log into the index file once it has this many entries
+FOLD_ENTRIES = 500
+
+
+def tokenize(text: str) -> list:
+    """Split ``text`` into its distinct lowercase words, in order."""
+    return list(dict.fromkeys(_WORD.findall(text.lower())))
+
+
+def matches(title: str, query: str) -> bool:
+    """Whether every word of ``query`` starts some word of ``title``.
+
+    A query without any words matches nothing, as in :meth:`TitleIndex.search`.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return False
+    words = tokenize(title)
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+class TitleIndex:
+    """Inverted index from title words to task ids.
+
+    Args:
+        postings: Mapping of word to the ids of tasks whose title uses it
+    """
+
+    def __init__(self, postings=None):
+        self.postings = {word: set(ids) for word, ids in (postings or {}).items()}
+        self.words = sorted(self.postings)
+
+    @classmethod
+    def build(cls, tasks):
+        index = cls()
+        for task in tasks:
+            for word in tokenize(task["title"]):
+                index.postings.setdefault(word, set()).add(task["id"])
+        index.words = sorted(index.postings)
+        return index
+
+    def add(self, task: dict) -> None:
+        for word in tokenize(task["title"]):
+            if word not in self.postings:
+                self.postings[word] = set()
+                insort(self.words, word)
+            self.postings[word].add(task["id"])
+
+    def remove(self, task: dict) -> None:
+        for word in tokenize(task["title"]):
+            ids = self.postings.get(word)
+            if ids is None:
+                continue
+            ids.discard(task["id"])
+            if not ids:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def _prefixed(self, term):
+        """Ids of tasks with a word starting with ``term``."""
+        found = set()
+        for i in range(bisect_left(self.words, term), len(self.words)):
+            word = self.words[i]
+            if not word.startswith(term):
+                break
+            found |= self.postings[word]
+        return found
+
+    def search(self, query: str) -> set:
+        """Ids of the tasks matching every word of ``query``; none if it has no words."""
+        result = None
+        # Longest words first; they match fewest tasks, keeping the intersection small
+        for term in sorted(tokenize(query), key=len, reverse=True):
+            ids = self._prefixed(term)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result or set()
+
+
+def search_tag(doc: dict) -> list:
+    """Tag identifying the set of titles in a task document."""
+    return [doc["next_id"], doc["stats"]["total"]]
+
+
+class IndexFile:
+    """A saved :class:`TitleIndex` plus its append-only change log.
+
+    The index file holds two JSON lines: a header with the tag it was
+    built for, then the postings. Each log line records one batch of adds
+    and removals, in order, with the tags before and after it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.log_path = f"{path}.log"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _read_log(self):
+        if not os.path.exists(self.log_path):
+            return []
+        entries = []
+        with open(self.log_path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break  # Torn final entry
+        return entries
+
+    def _end_tag(self):
+        """The tag the index and its log describe together, or None."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - 65536))
+                lines = f.read().splitlines()
+            if lines:
+                return json.loads(lines[-1])["to"]
+        except (OSError, ValueError, KeyError):
+            pass
+        try:
+            with open(self.path) as f:
+                return json.loads(f.readline())["source"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def load(self, tag):
+        """Return the index as of ``tag`` and how many log entries it took, or None."""
+        try:
+            with open(self.path) as f:
+                current = json.loads(f.readline())["source"]
+                index = TitleIndex(json.loads(f.readline()))
+        except (OSError, ValueError, KeyError):
+            return None
+        entries = self._read_log()
+        for entry in entries:
+            if entry["from"] != current:
+                return None
+            for name, task_id, title in entry["changes"]:
+                getattr(index, name)({"id": task_id, "title": title})
+            current = entry["to"]
+        if current != tag:
+            return None
+        return index, len(entries)
+
+    def append(self, before, after, changes) -> None:
+        """Log adds and deletes that took the tasks from tag ``before`` to ``after``.
+
+        Does nothing if there is no index yet or it no longer matches
+        ``before``; the next search then rebuilds it.
+
+        Args:
+            before: Tag of the tasks before the changes
+            after: Tag of the tasks after them
+            changes: ``("add", task)`` or ``("remove", task)`` pairs, in order
+        """
+        if not self.exists() or self._end_tag() != before:
+            return
+        entry = {
+            "from": before,
+            "to": after,
+            "changes": [[name, task["id"], task["title"]] for name, task in changes],
+        }
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def save(self, index: TitleIndex, tag) -> None:
+        """Write ``index`` as of ``tag`` and empty the log."""
+        from cl_tasks.storage.locking import atomic_write_bytes
+
+        postings = {word: sorted(index.postings[word]) for word in index.words}
+        data = json.dumps({"source": tag}) + "\n" + json.dumps(postings, separators=(",", ":")) + "\n"
+        atomic_write_bytes(self.path, data.encode("utf-8"))
+        if os.path.exists(self.log_path):
+            atomic_write_bytes(self.log_path, b"")
@@ -0,0 +1,550 @@
+import os
+import sqlite3
+from bisect import bisect_left, insort
+from cl_tasks.storage.base import TaskStore
+from cl_tasks.storage.ops import STATE_FIELDS, new_op, new_add_op, check_op, normalize_tags
+from cl_tasks.storage.query import check_query, has_filters
+from cl_tasks.storage.stats import format_duration, task_seconds
+from cl_tasks.storage import intervals
+from cl_tasks import current, trace
+
+DB_PATH = os.path.expanduser("~/.taskcli_tasks.db")
+
+# Ranks are spaced this far apart so most inserts fit between two neighbours
+RANK_GAP = 1024.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    start_time REAL,
+    end_time REAL,
+    duration TEXT,
+    paused_duration REAL,
+    rank REAL NOT NULL,
+    project TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_rank ON tasks (rank);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed_rank ON tasks (completed, rank);
+
+CREATE TABLE IF NOT EXISTS task_tags (
+    tag TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_task_tags_task ON task_tags (task_id);
+
+-- Aggregates for 'list --stats', kept current by the triggers below
+CREATE TABLE IF NOT EXISTS task_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    timed INTEGER NOT NULL,
+    tracked_seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_stats_days (
+    day TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL
+);
+"""
+
+# Stored as PRAGMA user_version. Version 1 counts paused time in durations.
+SCHEMA_VERSION = 1
+
+# A row's contribution to task_stats, written in terms of the row alias;
+# the same figures as storage.stats counts for the JSON stores
+_CONTRIBUTION = {
+    "completed": "{r}.completed",
+    "timed": "({r}.completed AND ({r}.start_time IS NOT NULL OR {r}.paused_duration IS NOT NULL))",
+    "tracked_seconds": (
+        "CASE WHEN {r}.completed THEN COALESCE({r}.paused_duration, 0) + "
+        "CASE WHEN {r}.start_time IS NOT NULL THEN MAX({r}.end_time - {r}.start_time, 0) ELSE 0 END "
+        "ELSE 0 END"
+    ),
+}
+
+
+def _stats_update(row: str, sign: str) -> str:
+    """UPDATE adding (``+``) or removing (``-``) the contribution of ``row``."""
+    columns = ", ".join(
+        f"{name} = {name} {sign} {expr.format(r=row)}" for name, expr in _CONTRIBUTION.items()
+    )
+    return f"UPDATE task_stats SET total = total {sign} 1, {columns};"
+
+
+def _day_update(row: str, sign: str) -> str:
+    """Statements moving ``row``'s completion day count by one."""
+    day = f"date({row}.end_time, 'unixepoch', 'localtime')"
+    if sign == "+":
+        return (
+            f"INSERT OR IGNORE INTO task_stats_days VALUES ({day}, 0); "
+            f"UPDATE task_stats_days SET completed = completed + 1 WHERE day = {day};"
+        )
+    return (
+        f"UPDATE task_stats_days SET completed = completed - 1 WHERE day = {day}; "
+        "DELETE FROM task_stats_days WHERE completed <= 0;"
+    )
+
+
+# Run after the migrations in __init__, since they use the project column
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tasks_project_rank ON tasks (project, rank);
+CREATE INDEX IF NOT EXISTS idx_tasks_running ON tasks (rank)
+WHERE completed = 0 AND start_time IS NOT NULL;
+"""
+
+TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS tasks_tags_delete AFTER DELETE ON tasks BEGIN
+    DELETE FROM task_tags WHERE task_id = OLD.id;
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_stats_insert AFTER INSERT ON tasks BEGIN
+    {_stats_update("NEW", "+")}
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_stats_delete AFTER DELETE ON tasks BEGIN
+    {_stats_update("OLD", "-")}
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_stats_update
+AFTER UPDATE OF completed, start_time, end_time, paused_duration ON tasks BEGIN
+    {_stats_update("OLD", "-")}
+    {_stats_update("NEW", "+")}
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_days_insert AFTER INSERT ON tasks
+WHEN NEW.completed AND NEW.end_time IS NOT NULL BEGIN
+    {_day_update("NEW", "+")}
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_days_delete AFTER DELETE ON tasks
+WHEN OLD.completed AND OLD.end_time IS NOT NULL BEGIN
+    {_day_update("OLD", "-")}
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_days_update_old AFTER UPDATE OF completed, end_time ON tasks
+WHEN OLD.completed AND OLD.end_time IS NOT NULL BEGIN
+    {_day_update("OLD", "-")}
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_days_update_new AFTER UPDATE OF completed, end_time ON tasks
+WHEN NEW.completed AND NEW.end_time IS NOT NULL BEGIN
+    {_day_update("NEW", "+")}
+END;
+"""
+
+COLUMNS = ("id", "title", "completed", "start_time", "end_time", "duration", "paused_duration", "project")
+
+
+def _select(alias: str = "tasks.") -> str:
+    """Select list for a task row: ``COLUMNS`` and then its space-separated tags."""
+    columns = ", ".join(alias + c for c in COLUMNS)
+    return f"{columns}, (SELECT group_concat(tag, ' ') FROM task_tags WHERE task_id = {alias}id)"
+
+
+def _row_to_task(row, position=None):
+    """Convert a row selected with :func:`_select` into the task dict shape used by the commands."""
+    task = {"id": row[0], "title": row[1], "completed": bool(row[2])}
+    # Optional fields are left out when unset, like in the JSON store
+    for name, value in zip(COLUMNS[3:], row[3:len(COLUMNS)]):
+        if value is not None:
+            task[name] = value
+    if row[len(COLUMNS)]:
+        task["tags"] = sorted(row[len(COLUMNS)].split(" "))
+    if position is not None:
+        task["position"] = position
+    return task
+
+
+class SQLiteTaskStore(TaskStore):
+    """Task store backed by SQLite.
+
+    Tasks keep a stable primary-key id; list order lives in a separate
+    ``rank`` column. New ranks are picked between the neighbouring rows, so
+    adding, moving or deleting a task only writes that one row.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # Sorted ranks, read on first use while a batch runs (see _position_of)
+        self._batching = False
+        self._ranks = None
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+            if "project" not in columns:
+                # Databases created before tasks had projects
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN project TEXT")
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                # The old triggers left paused time out of the statistics
+                self.conn.execute("DROP TRIGGER IF EXISTS tasks_stats_insert")
+                self.conn.execute("DROP TRIGGER IF EXISTS tasks_stats_delete")
+                self.conn.execute("DROP TRIGGER IF EXISTS tasks_stats_update")
+                self._rebuild_stats()
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            elif self.conn.execute("SELECT 1 FROM task_stats").fetchone() is None:
+                self._rebuild_stats()
+        self.conn.executescript(INDEXES)
+        self.conn.executescript(TRIGGERS)
+
+    def _rebuild_stats(self):
+        """Fill the statistics tables from the tasks, for databases created
+        before they existed. The triggers keep them current from then on."""
+        sums = ", ".join(f"COALESCE(SUM({expr.format(r='tasks')}), 0)" for expr in _CONTRIBUTION.values())
+        self.conn.execute("DELETE FROM task_stats")
+        self.conn.execute(f"INSERT INTO task_stats SELECT 1, COUNT(*), {sums} FROM tasks")
+        self.conn.execute("DELETE FROM task_stats_days")
+        self.conn.execute(
+            "INSERT INTO task_stats_days "
+            "SELECT date(end_time, 'unixepoch', 'localtime') AS day, COUNT(*) FROM tasks "
+            "WHERE completed AND end_time IS NOT NULL GROUP BY day"
+        )
+
+    def _get(self, task_id: int):
+        row = self.conn.execute(
+            f"SELECT {_select()} FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return _row_to_task(row) if row else None
+
+    def get_task(self, task_id: int):
+        row = self.conn.execute(
+            f"SELECT {_select()}, rank FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return _row_to_task(row[:-1], self._position_of(row[-1])) if row else None
+
+    def _position_of(self, rank):
+        """1-based position of the row with ``rank``.
+
+        A single operation counts it on the rank index. A batch reads the
+        sorted ranks once and bisects them, since counting for every
+        operation would scan the table once per task.
+        """
+        if not self._batching:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE rank < ?", (rank,)
+            ).fetchone()[0] + 1
+        if self._ranks is None:
+            self._ranks = [row[0] for row in self.conn.execute("SELECT rank FROM tasks ORDER BY rank")]
+        return bisect_left(self._ranks, rank) + 1
+
+    def _rank_for_position(self, position, exclude_id=None):
+        """Pick a rank that places a task at ``position`` (1-based).
+
+        Args:
+            position: Target position, or None to append
+            exclude_id: Task being moved, ignored when looking at neighbours
+
+        Returns:
+            float: The rank to store
+        """
+        exclude = exclude_id if exclude_id is not None else -1
+        if position is None or position < 1:
+            position = None
+
+        if position is not None:
+            neighbours = self.conn.execute(
+                "SELECT rank FROM tasks WHERE id != ? ORDER BY rank LIMIT 2 OFFSET ?",
+                (exclude, max(position - 2, 0)),
+            ).fetchall()
+            if position == 1:
+                if neighbours:
+                    return neighbours[0][0] - RANK_GAP
+                return 0.0
+            if len(neighbours) == 2:
+                before, after = neighbours[0][0], neighbours[1][0]
+                rank = (before + after) / 2
+                if before < rank < after:
+                    return rank
+                # The gap is exhausted; spread the ranks out and try again
+                self._rebalance()
+                return self._rank_for_position(position, exclude_id)
+
+        last = self.conn.execute(
+            "SELECT MAX(rank) FROM tasks WHERE id != ?", (exclude,)
+        ).fetchone()[0]
+        return 0.0 if last is None else last + RANK_GAP
+
+    def _rebalance(self):
+        """Respace every rank evenly. Only needed after many inserts at one spot."""
+        ids = [row[0] for row in self.conn.execute("SELECT id FROM tasks ORDER BY rank")]
+        self.conn.executemany(
+            "UPDATE tasks SET rank = ? WHERE id = ?",
+            [(i * RANK_GAP, task_id) for i, task_id in enumerate(ids)],
+        )
+        self._ranks = None
+
+    def _op_add(self, op):
+        rank = self._rank_for_position(op.get("position"))
+        state = {field: op[field] for field in STATE_FIELDS if op.get(field) is not None}
+        duration = format_duration(task_seconds(state)) if state.get("completed") else None
+        cursor = self.conn.execute(
+            "INSERT INTO tasks (title, rank, project, completed, start_time, end_time, paused_duration, duration) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (op["title"], rank, op.get("project") or None, int(state.get("completed", False)),
+             state.get("start_time"), state.get("end_time"), state.get("paused_duration"), duration),
+        )
+        self._set_tags(cursor.lastrowid, op.get("tags") or ())
+        if self._ranks is not None:
+            insort(self._ranks, rank)
+        # The new row lands exactly at the requested position, or last; the
+        # task count comes from task_stats, so bulk appends don't count rows
+        total = self.conn.execute("SELECT total FROM task_stats").fetchone()[0]
+        position = op.get("position")
+        if position is None or not 1 <= position <= total:
+            position = total
+        return dict(self._get(cursor.lastrowid), position=position)
+
+    def _set_tags(self, task_id, tags):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO task_tags (tag, task_id) VALUES (?, ?)",
+            [(tag, task_id) for tag in tags],
+        )
+
+    def _op_tag(self, op):
+        if self._get(op["id"]) is None:
+            return None
+        self._set_tags(op["id"], op.get("add") or ())
+        self.conn.executemany(
+            "DELETE FROM task_tags WHERE tag = ? AND task_id = ?",
+            [(tag, op["id"]) for tag in op.get("remove") or ()],
+        )
+        return self.get_task(op["id"])
+
+    def _op_project(self, op):
+        cursor = self.conn.execute(
+            "UPDATE tasks SET project = ? WHERE id = ?", (op.get("project") or None, op["id"])
+        )
+        return self.get_task(op["id"]) if cursor.rowcount else None
+
+    def _op_start(self, op):
+        cursor = self.conn.execute(
+            "UPDATE tasks SET start_time = ? WHERE id = ?", (op["at"], op["id"])
+        )
+        return self.get_task(op["id"]) if cursor.rowcount else None
+
+    def _op_pause(self, op):
+        task = self._get(op["id"])
+        if task is None or "start_time" not in task or task["completed"]:
+            return None
+        elapsed_time = op["at"] - task["start_time"]
+        self.conn.execute(
+            "UPDATE tasks SET paused_duration = ?, start_time = NULL WHERE id = ?",
+            (task.get("paused_duration", 0) + elapsed_time, op["id"]),
+        )
+        return dict(self.get_task(op["id"]), interval=[task["start_time"], op["at"]])
+
+    def _op_complete(self, op):
+        task = self._get(op["id"])
+        if task is None:
+            return None
+        duration = task.get("paused_duration", 0)
+        if "start_time" in task:
+            duration += max(op["at"] - task["start_time"], 0)
+        self.conn.execute(
+            "UPDATE tasks SET completed = 1, end_time = ?, duration = ? WHERE id = ?",
+            (op["at"], format_duration(duration), op["id"]),
+        )
+        if "start_time" in task and not task["completed"]:
+            return dict(self.get_task(op["id"]), interval=[task["start_time"], op["at"]])
+        return self.get_task(op["id"])
+
+    def _op_delete(self, op):
+        task = self.get_task(op["id"])
+        if task is None:
+            return None
+        self.conn.execute("DELETE FROM tasks WHERE id = ?", (op["id"],))
+        if self._ranks is not None:
+            del self._ranks[task["position"] - 1]
+        return task
+
+    def _op_reorder(self, op):
+        row = self.conn.execute("SELECT rank FROM tasks WHERE id = ?", (op["id"],)).fetchone()
+        if row is None:
+            return None
+        rank = self._rank_for_position(op["position"], exclude_id=op["id"])
+        self.conn.execute("UPDATE tasks SET rank = ? WHERE id = ?", (rank, op["id"]))
+        if self._ranks is not None:
+            del self._ranks[bisect_left(self._ranks, row[0])]
+            insort(self._ranks, rank)
+        return self.get_task(op["id"])
+
+    def _execute(self, op):
+        return self.apply_batch([op])[0]
+
+    def apply_batch(self, ops):
+        """Run several operations in a single SQLite transaction."""
+        ops = [check_op(op) for op in ops]
+        # The transaction commits at the end of the phase
+        self._batching = len(ops) > 1
+        try:
+            with trace.phase("store.apply"), self.conn:
+                results = [getattr(self, f"_op_{op['op']}")(op) for op in ops]
+        finally:
+            self._batching = False
+            self._ranks = None
+        with trace.phase("store.log"):
+            current.record(ops, results, list_name=self.list_name)
+            intervals.record(ops, results, self.intervals_path)
+        return results
+
+    def add_task(self, title: str, position: int = None, tags=None, project: str = None):
+        return self._execute(new_add_op(title, position, tags, project))
+
+    def tag_task(self, task_id: int, add=(), remove=()):
+        return self._execute(new_op("tag", id=task_id, add=normalize_tags(add), remove=normalize_tags(remove)))
+
+    def set_project(self, task_id: int, project: str = None):
+        return self._execute(new_op("project", id=task_id, project=project))
+
+    def start_task(self, task_id: int):
+        return self._execute(new_op("start", id=task_id))
+
+    def pause_task(self, task_id: int):
+        """Pause a task and record the paused duration.
+
+        Args:
+            task_id: The ID of the task to pause
+
+        Returns:
+            bool: True if the task was successfully paused, False otherwise
+        """
+        return self._execute(new_op("pause", id=task_id))
+
+    def list_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        return list(self.iter_tasks(status, order, limit, offset, tag, project))
+
+    def iter_tasks(self, status=None, order="position", limit=None, offset=0, tag=None, project=None):
+        check_query(status, order)
+        where, params = self._filter_clause(status, tag, project)
+
+        if not where and order == "position":
+            # Rows come back in rank order, so positions can just be counted
+            rows = self.conn.execute(
+                f"SELECT {_select()} FROM tasks ORDER BY rank LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            )
+            for i, row in enumerate(rows):
+                yield _row_to_task(row, offset + i + 1)
+            return
+
+        # Number every row once in rank order, then filter and page
+        order_by = "completed, rank" if order == "status" else "rank"
+        rows = self.conn.execute(
+            f"SELECT {_select('t.')}, t.position "
+            "FROM (SELECT *, ROW_NUMBER() OVER (ORDER BY rank) AS position FROM tasks) t "
+            f"{where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            (*params, -1 if limit is None else limit, offset),
+        )
+        for row in rows:
+            yield _row_to_task(row[:-1], row[-1])
+
+    def _filter_clause(self, status, tag=None, project=None):
+        """WHERE clause and parameters for the status, tag and project filters."""
+        conditions, params = [], []
+        if status == "open":
+            conditions.append("completed = 0")
+        elif status == "running":
+            conditions.append("completed = 0 AND start_time IS NOT NULL")
+        elif status == "completed":
+            conditions.append("completed = 1")
+        if tag is not None:
+            conditions.append("id IN (SELECT task_id FROM task_tags WHERE tag = ?)")
+            params.append(tag)
+        if project is not None:
+            conditions.append("project = ?")
+            params.append(project)
+        if not conditions:
+            return "", ()
+        return "WHERE " + " AND ".join(conditions), tuple(params)
+
+    def count_tasks(self, status=None, tag=None, project=None) -> int:
+        check_query(status, "position")
+        if has_filters(status, tag, project):
+            where, params = self._filter_clause(status, tag, project)
+            return self.conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+        total, completed = self.conn.execute(
+            "SELECT total, completed FROM task_stats"
+        ).fetchone()
+        if status == "open":
+            return total - completed
+        return completed if status == "completed" else total
+
+    def get_stats(self) -> dict:
+        total, completed, timed, tracked_seconds = self.conn.execute(
+            "SELECT total, completed, timed, tracked_seconds FROM task_stats"
+        ).fetchone()
+        return {
+            "total": total,
+            "completed": completed,
+            "timed": timed,
+            "tracked_seconds": tracked_seconds,
+            "days": dict(self.conn.execute("SELECT day, completed FROM task_stats_days")),
+        }
+
+    def task_at(self, position: int):
+        if position < 1:
+            return None
+        row = self.conn.execute(
+            f"SELECT {_select()} FROM tasks ORDER BY rank LIMIT 1 OFFSET ?",
+            (position - 1,),
+        ).fetchone()
+        return _row_to_task(row, position) if row else None
+
+    def complete_task(self, task_id: int):
+        return self._execute(new_op("complete", id=task_id))
+
+    def delete_task(self, task_id: int):
+        return self._execute(new_op("delete", id=task_id))
+
+    def reorder_task(self, task_id: int, new_position: int):
+        """Reorder a task to a new position.
+
+        Args:
+            task_id: ID of the task to reorder
+            new_position: New position to move the task to (1-based)
+
+        Returns:
+            bool: Whether the reordering was successful
+        """
+        return self._execute(new_op("reorder", id=task_id, position=new_position))
+
+    def import_tasks(self, tasks, replace: bool = False):
+        """Bulk-insert tasks from another store, keeping their order and ids.
+
+        Args:
+            tasks: Task dicts in list order, as returned by ``list_tasks``
+            replace: Whether to remove the existing tasks first. It happens
+                in the same transaction, so a failed import keeps them.
+
+        Returns:
+            int: Number of tasks imported
+        """
+        last = None if replace else self.conn.execute("SELECT MAX(rank) FROM tasks").fetchone()[0]
+        start = 0.0 if last is None else last + RANK_GAP
+        rows = [
+            (
+                task["id"],
+                task["title"],
+                int(task.get("completed", False)),
+                task.get("start_time"),
+                task.get("end_time"),
+                task.get("duration"),
+                task.get("paused_duration"),
+                task.get("project"),
+                start + i * RANK_GAP,
+            )
+            for i, task in enumerate(tasks)
+        ]
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM tasks")
+            self.conn.executemany(
+                f"INSERT INTO tasks ({', '.join(COLUMNS)}, rank) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                rows,
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO task_tags (tag, task_id) VALUES (?, ?)",
+                [(tag, task["id"]) for task in tasks for tag in task.get("tags", ())],
+            )
+        return len(rows)
+
+    def clear(self):
+        """Remove every task."""
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks")
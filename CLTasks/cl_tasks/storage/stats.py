@@ -0,0 +1,146 @@
+# cl_tasks/storage/stats.py
+"""
+Aggregate task statistics that are kept up to date as tasks change.
+
+The JSON and journal stores keep a ``stats`` record inside the task
+document, and :func:`cl_tasks.storage.ops.apply_op` adjusts it for each
+add, complete and delete. SQLite keeps the same numbers in tables that are
+maintained by triggers. Either way, reading the statistics never walks
+the task list:
+
+- ``total`` / ``completed``: task counts
+- ``timed``: completed tasks that were started, so they have a duration
+- ``tracked_seconds``: summed duration of the completed tasks, including
+  the time worked before any pauses
+- ``days``: number of tasks completed on each local date (``YYYY-MM-DD``)
+- ``version``: :data:`STATS_VERSION` when the record was computed; older
+  records are recomputed on load, because durations used to leave out
+  paused time
+"""
+
+import time
+
+# How many days the throughput figure averages over
+THROUGHPUT_DAYS = 7
+
+# Bumped whenever a task's contribution to the counters changes
+STATS_VERSION = 2
+
+
+def new_stats() -> dict:
+    return {"total": 0, "completed": 0, "timed": 0, "tracked_seconds": 0.0, "days": {}, "version": STATS_VERSION}
+
+
+def is_current(stats: dict) -> bool:
+    """Whether ``stats`` was computed the way this version counts tasks."""
+    return stats.get("version") == STATS_VERSION
+
+
+def day_of(timestamp: float) -> str:
+    """Local calendar date of ``timestamp``, as used for the ``days`` keys."""
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def was_started(task: dict) -> bool:
+    """Whether ``task`` was ever started (it may be paused now)."""
+    return "start_time" in task or "paused_duration" in task
+
+
+def task_seconds(task: dict) -> float:
+    """Tracked duration of a completed task, in seconds.
+
+    That is the time worked before any pauses plus the time since the last
+    start, if the task was running when it was completed.
+    """
+    if not task.get("completed"):
+        return 0.0
+    seconds = task.get("paused_duration") or 0.0
+    if "start_time" in task:
+        seconds += max(task["end_time"] - task["start_time"], 0.0)
+    return seconds
+
+
+def format_duration(seconds: float) -> str:
+    """``HH:MM:SS`` for a task's ``duration`` field; hours go past 24."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _count(stats: dict, task: dict, sign: int) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) one task's contribution."""
+    stats["total"] += sign
+    if not task.get("completed"):
+        return
+    stats["completed"] += sign
+    if was_started(task):
+        stats["timed"] += sign
+        stats["tracked_seconds"] += sign * task_seconds(task)
+    if "end_time" in task:
+        day = day_of(task["end_time"])
+        remaining = stats["days"].get(day, 0) + sign
+        if remaining > 0:
+            stats["days"][day] = remaining
+        else:
+            stats["days"].pop(day, None)
+
+
+def record_add(stats: dict, task: dict) -> None:
+    _count(stats, task, 1)
+
+
+def record_delete(stats: dict, task: dict) -> None:
+    _count(stats, task, -1)
+
+
+def record_change(stats: dict, before: dict, after: dict) -> None:
+    """Account for ``before`` turning into ``after`` (e.g. on completion)."""
+    _count(stats, before, -1)
+    _count(stats, after, 1)
+
+
+def merge(*records) -> dict:
+    """Combine statistics records, e.g. a store's and its archive's."""
+    merged = new_stats()
+    for record in records:
+        for name in ("total", "completed", "timed", "tracked_seconds"):
+            merged[name] += record[name]
+        for day, count in record["days"].items():
+            merged["days"][day] = merged["days"].get(day, 0) + count
+    return merged
+
+
+def compute_stats(tasks) -> dict:
+    """Build the statistics from scratch with one pass over ``tasks``.
+
+    Only needed for documents written before statistics were stored.
+    """
+    stats = new_stats()
+    for task in tasks:
+        record_add(stats, task)
+    return stats
+
+
+def summarize(stats: dict, now: float = None) -> dict:
+    """Derive the figures shown by ``list --stats`` from the stored counters.
+
+    Returns:
+        dict: ``total``, ``completed``, ``pending``, ``percent``,
+        ``tracked_seconds``, ``average_seconds`` (None if nothing was timed),
+        ``completed_today`` and ``throughput`` (completions per day over the
+        last :data:`THROUGHPUT_DAYS` days)
+    """
+    now = time.time() if now is None else now
+    days = stats["days"]
+    recent = sum(days.get(day_of(now - i * 86400), 0) for i in range(THROUGHPUT_DAYS))
+    total, completed = stats["total"], stats["completed"]
+    return {
+        "total": total,
+        "completed": completed,
+        "pending": total - completed,
+        "percent": int(completed * 100 / total) if total else 0,
+        "tracked_seconds": stats["tracked_seconds"],
+        "average_seconds": stats["tracked_seconds"] / stats["timed"] if stats["timed"] else None,
+        "completed_today": days.get(day_of(now), 0),
+        "throughput": recent / THROUGHPUT_DAYS,
+    }
@@ -0,0 +1,193 @@
+# cl_tasks/trace.py
+"""
+Per-phase timing for cltasks commands.
+
+``cltasks --profile <command>`` (or ``CLTASKS_TRACE=1``) times the phases a
+command goes through: importing its module, loading and parsing the tasks,
+applying changes, saving, and rendering the output. It prints a breakdown
+to stderr when the command finishes. ``--trace FILE`` (or
+``CLTASKS_TRACE=FILE``) writes the same spans as a Chrome trace that
+chrome://tracing and https://ui.perfetto.dev show as a timeline, and
+``--cprofile FILE`` also runs the command under cProfile and saves the
+stats for ``python -m pstats FILE``.
+
+Code marks a phase with ``with trace.phase("store.load"):``. When tracing
+is off that returns a shared no-op context manager, so instrumented code
+costs one function call per phase. Nothing here imports Rich.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+# When this module was first imported, as close to process start as cltasks gets
+STARTED = time.perf_counter_ns()
+
+_NULL = nullcontext()
+
+# Finished spans as (name, start_ns, end_ns, thread id)
+_spans = []
+_enabled = False
+
+
+def _span(name: str, start: int, end: int = None) -> None:
+    _spans.append((name, start, time.perf_counter_ns() if end is None else end, threading.get_ident()))
+
+
+class _Phase:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        _span(self.name, self.start)
+        return False
+
+
+def phase(name: str):
+    """Context manager that times the code inside it as phase ``name``."""
+    return _Phase(name) if _enabled else _NULL
+
+
+def startup_span(name: str, start: int) -> None:
+    """Record a span that started before tracing could be switched on.
+
+    Imports run before the command line is parsed, so they are always
+    timed; the few spans this records are dropped unless tracing is on.
+
+    Args:
+        name: Name of the phase
+        start: ``time.perf_counter_ns()`` when it started
+    """
+    _span(name, start)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def settings_from_env():
+    """``(breakdown, trace_path)`` asked for through ``CLTASKS_TRACE``."""
+    value = os.getenv("CLTASKS_TRACE", "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return False, None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True, None
+    return False, value
+
+
+def begin(command: str, breakdown: bool = False, trace_path: str = None, cprofile_path: str = None):
+    """Start tracing a command, if any output was asked for.
+
+    Args:
+        command: Name of the command being run, for the report
+        breakdown: Print a per-phase breakdown to stderr at the end
+        trace_path: Write a Chrome trace to this file at the end
+        cprofile_path: Run the command under cProfile and save the stats here
+
+    Returns:
+        Callable that stops tracing and writes the output, or None if
+        nothing was asked for
+    """
+    global _enabled
+    if not (breakdown or trace_path or cprofile_path):
+        return None
+    _enabled = True
+    profiler = None
+    if cprofile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter_ns()
+
+    def finish():
+        global _enabled
+        _span(f"command {command}", start)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+        _enabled = False
+        end = time.perf_counter_ns()
+        if trace_path:
+            write_chrome_trace(trace_path, _spans)
+        if breakdown:
+            sys.stderr.write(format_breakdown(_spans, end - STARTED, f"cltasks {command}"))
+            if trace_path:
+                sys.stderr.write(f"Chrome trace written to {trace_path}\n")
+            if cprofile_path:
+                sys.stderr.write(f"cProfile stats written to {cprofile_path}\n")
+
+    return finish
+
+
+def _nested(spans):
+    """``spans`` in start order, each with its nesting depth in its thread."""
+    stacks = {}
+    for name, start, end, thread in sorted(spans, key=lambda span: (span[1], -span[2])):
+        stack = stacks.setdefault(thread, [])
+        while stack and stack[-1] <= start:
+            stack.pop()
+        yield name, start, end, thread, len(stack)
+        stack.append(end)
+
+
+def format_breakdown(spans, total_ns: int, title: str) -> str:
+    """Plain-text table of the time spent per phase.
+
+    Phases with the same name and depth are summed, in the order they first
+    ran, and indented under the phase they ran in. Spans from other
+    threads, such as journal compaction, are listed after the main thread's.
+
+    Args:
+        spans: Spans as ``(name, start_ns, end_ns, thread id)``
+        total_ns: Wall time the command took, from when cltasks started
+        title: First line of the report
+
+    Returns:
+        str: The report, ending in a newline
+    """
+    main_thread = threading.main_thread().ident
+    rows = {}
+    for name, start, end, thread, depth in _nested(spans):
+        if thread != main_thread:
+            name = f"{name} (thread)"
+        calls, elapsed = rows.get((depth, name), (0, 0))
+        rows[(depth, name)] = (calls + 1, elapsed + end - start)
+
+    ordered = sorted(rows, key=lambda key: key[1].endswith(" (thread)"))
+    width = max([len("phase")] + [2 * depth + len(name) for depth, name in ordered])
+    lines = [
+        f"{title}: {total_ns / 1e6:.1f} ms",
+        f"  {'phase':<{width}}  {'calls':>5}  {'ms':>9}  {'share':>6}",
+    ]
+    for depth, name in ordered:
+        calls, elapsed = rows[(depth, name)]
+        label = "  " * depth + name
+        share = 100 * elapsed / total_ns if total_ns else 0.0
+        lines.append(f"  {label:<{width}}  {calls:>5}  {elapsed / 1e6:>9.2f}  {share:>5.1f}%")
+    return "\n".join(lines) + "\n"
+
+
+def write_chrome_trace(path: str, spans) -> None:
+    """Write ``spans`` as a Chrome trace (the JSON "trace event" format).
+
+    Times are in microseconds from when cltasks started.
+    """
+    pid = os.getpid()
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "cltasks"}}]
+    for name, start, end, thread in spans:
+        events.append({
+            "name": name, "cat": name.split(" ")[0].split(".")[0], "ph": "X",
+            "ts": (start - STARTED) / 1000, "dur": (end - start) / 1000,
+            "pid": pid, "tid": thread,
+        })
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
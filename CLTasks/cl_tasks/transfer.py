@@ -0,0 +1,233 @@
+# cl_tasks/transfer.py
+"""
+Streaming import and export of tasks as CSV or NDJSON.
+
+Importing is a pipeline of generators: :func:`read_rows` yields one parsed
+row at a time, :func:`parse_ops` checks each row and turns it into an
+``add`` operation carrying the task's state, and :func:`import_ops` hands
+those to the store in chunks through ``apply_batch``. Each chunk is one
+load and one save of the task list, and only one chunk is held in memory,
+so the input can be any size.
+
+Exporting streams the store's tasks straight to the output in the same
+columns, so an export can be imported again. Imported tasks get new ids
+and are appended in the order they are read.
+
+Nothing here imports Rich.
+"""
+
+import csv
+import json
+import math
+from enum import Enum
+from itertools import islice
+from cl_tasks.storage.ops import new_op, normalize_tags
+
+# Tasks written per apply_batch call
+CHUNK_SIZE = 5000
+
+# How many invalid rows an import remembers to report when skipping them
+MAX_REPORTED_ERRORS = 10
+
+CSV_COLUMNS = (
+    "id", "title", "completed", "start_time", "end_time", "paused_duration", "duration", "project", "tags",
+)
+
+_TRUE = {"true", "yes", "y", "1"}
+_FALSE = {"false", "no", "n", "0", ""}
+
+
+class TransferFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class RowError(ValueError):
+    """A row of an import that isn't a valid task."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+class SkippedRows:
+    """Invalid rows left out of an import: how many, and the first few errors."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = []
+
+    def add(self, error: RowError) -> None:
+        self.count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+
+def guess_format(path: str):
+    """The format a file name's extension suggests, or None."""
+    extension = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if extension == "csv":
+        return TransferFormat.csv
+    if extension in ("ndjson", "jsonl"):
+        return TransferFormat.ndjson
+    return None
+
+
+def read_rows(stream, fmt: TransferFormat, skipped: SkippedRows = None):
+    """Yield ``(line number, row dict)`` for each row of ``stream``.
+
+    Args:
+        stream: Text file to read
+        fmt: Format of the file
+        skipped: If given, NDJSON lines that aren't JSON objects are
+            recorded here and left out instead of stopping the import
+
+    Raises:
+        RowError: If an NDJSON line isn't a JSON object
+    """
+    if fmt == TransferFormat.csv:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+            error = None if isinstance(row, dict) else "expected a JSON object"
+        except ValueError as e:
+            error = f"not valid JSON ({e})"
+        if error is None:
+            yield line_number, row
+        elif skipped is None:
+            raise RowError(line_number, error)
+        else:
+            skipped.add(RowError(line_number, error))
+
+
+def _flag(value, name: str) -> bool:
+    if isinstance(value, bool) or value is None:
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE or text in _FALSE:
+        return text in _TRUE
+    raise ValueError(f"'{name}' must be true or false, not {value!r}")
+
+
+def _seconds(value, name: str):
+    """A timestamp or duration in seconds, or None when the field is empty."""
+    if value is None or value == "":
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be a number of seconds, not {value!r}")
+    if not math.isfinite(seconds) or seconds < 0:
+        raise ValueError(f"'{name}' must be a number of seconds, not {value!r}")
+    return seconds
+
+
+def row_to_op(row: dict) -> dict:
+    """Check one imported row and build the ``add`` operation for it.
+
+    Columns other than :data:`CSV_COLUMNS` are ignored, as are ``id`` and
+    ``duration``: ids are assigned by the store and durations recomputed.
+    Tags may be a list or a string of words separated by spaces or commas.
+
+    Raises:
+        ValueError: If the row doesn't describe a valid task
+    """
+    title = row.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("'title' is missing")
+    fields = {}
+    completed = _flag(row.get("completed"), "completed")
+    if completed:
+        fields["completed"] = True
+    for name in ("start_time", "end_time", "paused_duration"):
+        value = _seconds(row.get(name), name)
+        if value is not None:
+            fields[name] = value
+    if "end_time" in fields and not completed:
+        raise ValueError("'end_time' is only allowed on completed tasks")
+    if completed and "start_time" in fields and "end_time" not in fields:
+        raise ValueError("a completed task that was started needs an 'end_time'")
+
+    tags = row.get("tags")
+    if isinstance(tags, str):
+        tags = tags.replace(",", " ").split()
+    if tags:
+        fields["tags"] = normalize_tags(tags)
+    project = row.get("project")
+    if project not in (None, ""):
+        if not isinstance(project, str):
+            raise ValueError(f"'project' must be text, not {project!r}")
+        fields["project"] = project
+    return new_op("add", title=title, **fields)
+
+
+def parse_ops(rows, skipped: SkippedRows = None):
+    """Yield the ``add`` operation for each of ``rows``.
+
+    Args:
+        rows: ``(line number, row)`` pairs, e.g. from :func:`read_rows`
+        skipped: If given, invalid rows are recorded here and left out
+            instead of stopping the import
+
+    Raises:
+        RowError: If a row is invalid and ``skipped`` isn't given
+    """
+    for line_number, row in rows:
+        try:
+            yield row_to_op(row)
+        except ValueError as e:
+            error = RowError(line_number, str(e))
+            if skipped is None:
+                raise error
+            skipped.add(error)
+
+
+def chunks(iterable, size: int):
+    """Yield lists of up to ``size`` items from ``iterable``, lazily."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_ops(store, ops, chunk_size: int = CHUNK_SIZE):
+    """Apply ``ops`` to ``store`` one chunk at a time.
+
+    Yields:
+        int: Number of tasks added by each chunk, after it is saved
+    """
+    for chunk in chunks(ops, chunk_size):
+        results = store.apply_batch(chunk)
+        yield sum(1 for result in results if result)
+
+
+def _csv_value(task: dict, column: str):
+    if column == "tags":
+        return " ".join(task.get("tags", ()))
+    if column == "completed":
+        return "true" if task.get("completed") else "false"
+    value = task.get(column)
+    return "" if value is None else value
+
+
+def write_csv(tasks, out) -> int:
+    """Stream ``tasks`` to ``out`` as CSV with a header row.
+
+    Returns:
+        int: Number of tasks written
+    """
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    for count, task in enumerate(tasks, start=1):
+        writer.writerow([_csv_value(task, column) for column in CSV_COLUMNS])
+    return count
@@ -11,9 +11,25 @@ from typing import Dict, Any, Optional
 
 # Import theme elements
 from cl_tasks.theme import ICONS, CL_THEME
+from cl_tasks import trace
 
-# Create a shared console instance with our theme
-console = Console(theme=CL_THEME)
+_console = None
+
+
+def get_console() -> Console:
+    """Return the shared themed console, creating it on first use."""
+    global _console
+    if _console is None:
+        _console = Console(theme=CL_THEME)
+    return _console
+
+
+def __getattr__(name):
+    # Keep `from cl_tasks.utils import console` working without building
+    # the console at import time
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def format_task_id(task_id: int) -> Text:
     """Format a task ID consistently with # prefix and cyan color."""
@@ -45,8 +61,8 @@ def create_task_panel(
     task_title = task["title"]
     completed = task["completed"]
     
-    # Format the task ID and status
-    id_text = Text(f"#{task_id}", style="cyan")
+    # Format the task position and status
+    position_text = Text(f"#{task['position']}", style="cyan")
     
     if completed:
         status_text = Text(f"{ICONS['complete']} Completed", style="green")
@@ -57,12 +73,20 @@ def create_task_panel(
     
     # Assemble the text content
     content = Text()
-    content.append("ID: ", style="dim")
-    content.append(id_text)
+    content.append("Position: ", style="dim")
+    content.append(position_text)
+    content.append("\nID: ", style="dim")
+    content.append(str(task_id), style="dim")
     content.append("\nTitle: ", style="dim")
     content.append(task_title, style=title_style)
     content.append("\nStatus: ", style="dim")
     content.append(status_text)
+    if task.get("project"):
+        content.append("\nProject: ", style="dim")
+        content.append(task["project"], style="cyan")
+    if task.get("tags"):
+        content.append("\nTags: ", style="dim")
+        content.append(" ".join(f"#{tag}" for tag in task["tags"]), style="cyan")
     
     # Add creation timestamp if available
     if "created_at" in task:
@@ -83,7 +107,8 @@ def show_success(message: str, title: Optional[str] = None) -> None:
         title: Optional title for the panel
     """
     panel_title = title or f"[bold success]{ICONS['success']} Success![/bold success]"
-    console.print(Panel(message, title=panel_title, border_style="success"))
+    with trace.phase("render"):
+        get_console().print(Panel(message, title=panel_title, border_style="success"))
 
 def show_error(message: str, title: Optional[str] = None) -> None:
     """Display an error message in a red panel.
@@ -93,7 +118,8 @@ def show_error(message: str, title: Optional[str] = None) -> None:
         title: Optional title for the panel
     """
     panel_title = title or f"[bold danger]{ICONS['error']} Error[/bold danger]"
-    console.print(Panel(message, title=panel_title, border_style="danger"))
+    with trace.phase("render"):
+        get_console().print(Panel(message, title=panel_title, border_style="danger"))
 
 def show_warning(message: str, title: Optional[str] = None) -> None:
     """Display a warning message in a yellow panel.
@@ -103,7 +129,8 @@ def show_warning(message: str, title: Optional[str] = None) -> None:
         title: Optional title for the panel
     """
     panel_title = title or f"[bold warning]{ICONS['warning']} Warning[/bold warning]"
-    console.print(Panel(message, title=panel_title, border_style="warning"))
+    with trace.phase("render"):
+        get_console().print(Panel(message, title=panel_title, border_style="warning"))
 
 def show_info(message: str, title: Optional[str] = None) -> None:
     """Display an info message in a blue panel.
@@ -113,36 +140,54 @@ def show_info(message: str, title: Optional[str] = None) -> None:
         title: Optional title for the panel
     """
     panel_title = title or f"[bold info]{ICONS['info']} Info[/bold info]"
-    console.print(Panel(message, title=panel_title, border_style="info"))
+    with trace.phase("render"):
+        get_console().print(Panel(message, title=panel_title, border_style="info"))
     
     
-def display_task_stats(tasks: list) -> None:
+def format_seconds(seconds: float) -> str:
+    """Format a number of seconds as H:MM:SS, letting hours grow past a day."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{secs:02}"
+
+
+def display_task_stats(stats: dict) -> None:
     """Display pretty statistics about tasks.
     
     Args:
-        tasks: List of tasks to analyze
+        stats: Counters from the store's ``get_stats()``
     """
-    total = len(tasks)
-    completed = sum(1 for task in tasks if task["completed"])
-    pending = total - completed
+    from cl_tasks.storage.stats import summarize, THROUGHPUT_DAYS
+
+    summary = summarize(stats)
+    total = summary["total"]
     
     if total == 0:
-        console.print("[dim]No tasks found. Add some tasks with the 'add' command![/dim]")
+        get_console().print("[dim]No tasks found. Add some tasks with the 'add' command![/dim]")
         return
     
-    # Calculate completion percentage
-    percent = int((completed / total) * 100) if total > 0 else 0
+    percent = summary["percent"]
     
-    console.print(f"\n[bold]Task Statistics[/bold]")
-    console.print(f"Total Tasks: {total}")
-    console.print(f"Completed: [green]{completed}[/green] | Pending: [yellow]{pending}[/yellow]")
-    console.print(f"Progress: [bold]{percent}%[/bold] complete")
+    get_console().print(f"\n[bold]Task Statistics[/bold]")
+    get_console().print(f"Total Tasks: {total}")
+    get_console().print(f"Completed: [green]{summary['completed']}[/green] | Pending: [yellow]{summary['pending']}[/yellow]")
+    get_console().print(f"Progress: [bold]{percent}%[/bold] complete")
     
     # Optional: Add a simple ASCII progress bar
     bar_width = 30
     filled = int(bar_width * percent / 100)
     bar = "[" + "█" * filled + "·" * (bar_width - filled) + "]"
-    console.print(bar, style="bold green")
+    get_console().print(bar, style="bold green")
+
+    average = summary["average_seconds"]
+    get_console().print(
+        f"Tracked time: [cyan]{format_seconds(summary['tracked_seconds'])}[/cyan] | "
+        f"Average per task: [cyan]{format_seconds(average) if average is not None else 'N/A'}[/cyan]"
+    )
+    get_console().print(
+        f"Completed today: {summary['completed_today']} | "
+        f"Throughput: {summary['throughput']:.1f}/day over the last {THROUGHPUT_DAYS} days"
+    )
 
 
 def format_task_row(task: Dict[str, Any]) -> list:
@@ -154,7 +199,8 @@ def format_task_row(task: Dict[str, Any]) -> list:
     Returns:
         List of formatted strings for table row
     """
-    task_id = str(task["id"])
+    # Archived tasks have no position in the list
+    task_id = str(task.get("position", "—"))
     title = task["title"]
     duration = task["duration"] if "duration" in task else "N/A"
 
@@ -169,4 +215,10 @@ def format_task_row(task: Dict[str, Any]) -> list:
         status_icon = ICONS["pending"]
         row_style = ""
 
+    labels = [f"#{tag}" for tag in task.get("tags", ())]
+    if task.get("project"):
+        labels.insert(0, f"@{task['project']}")
+    if labels:
+        title = f"{title} [dim]{' '.join(labels)}[/dim]"
+
     return [task_id, title, status_icon, duration, row_style]
\ No newline at end of file
@@ -1,43 +1,57 @@
 from cl_tasks.cli import app
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-import time
+import os
 import sys
 
+def _splash_marker():
+    """Path of the file recording that this terminal session saw the splash."""
+    import tempfile
+
+    session = os.getsid(0) if hasattr(os, "getsid") else os.getppid()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"cltasks-splash-{uid}-{session}")
+
+def should_show_splash():
+    """Show the splash only on an interactive terminal, once per session."""
+    if not sys.stdout.isatty():
+        return False
+    return not os.path.exists(_splash_marker())
+
 def show_splash_screen():
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.text import Text
+
     console = Console()
-    
+
     # Clear screen for better presentation
     console.clear()
-    
+
     logo = """
-    ╔═══╗╔╗   ╔════╗        ╔╗    
-    ║╔══╝║║   ║╔╗╔╗║        ║║    
+    ╔═══╗╔╗   ╔════╗        ╔╗
+    ║╔══╝║║   ║╔╗╔╗║        ║║
     ║╚══╗║║   ╚╝║║╚╝╔══╗╔══╗║║╔╗╔═══╗
     ║╔══╝║║     ║║  ║╔╗║║══╣║╚╝╝║╔═╗║
     ║║   ║╚═╗  ╔╝╚╗ ║╚╝║╠══║║╔╗╗║╚═╝║
     ╚╝   ╚══╝  ╚══╝ ╚══╝╚══╝╚╝╚╝╚═══╝
     """
-    
+
     # Create a nice panel with the logo
     panel = Panel(
         Text(logo, style="bold blue"),
         subtitle="[dim]v0.1.0[/dim]",
         subtitle_align="right"
     )
-    
+
     console.print(panel)
-    console.print("[bold]✨ Your friendly task manager[/bold]")
-    console.print("[dim]Loading...[/dim]")
-    
-    # Simple loading animation
-    for i in range(5):
-        console.print(".", end="", style="bold blue")
-        time.sleep(0.1)
-    console.print("\n")
+    console.print("[bold]✨ Your friendly task manager[/bold]\n")
+
+    # Remember that this session has seen the banner
+    try:
+        open(_splash_marker(), "a").close()
+    except OSError:
+        pass
 
 if __name__ == "__main__":
-    if len(sys.argv) <= 1:
+    if len(sys.argv) <= 1 and should_show_splash():
         show_splash_screen()
     app()
@@ -8,9 +8,17 @@ setup(
         "typer[all]",
         "rich"
     ],
+    extras_require={
+        # Transactional batches and patch operations need azure-cosmos 4.5
+        "cosmos": ["azure-cosmos>=4.5"],
+        # Vectorized 'cltasks report'; it falls back to plain Python without
+        "report": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "cltasks=cl_tasks.cli:app",
+            # For shell prompts: no Typer or Rich, reads one small file
+            "cltasks-current=cl_tasks.current:main",
         ],
     },
 )